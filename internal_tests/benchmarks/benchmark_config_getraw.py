@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Program Name: benchmark_config_getraw.py
+Contact(s): George McCabe
+Abstract: Micro-benchmark for METplusConfig.getraw. Reads the default METplus
+ config files and a use case config file, then resolves every option in
+ every section, clearing the saved values before each pass (uncached) or
+ keeping them (cached).
+Usage: python benchmark_config_getraw.py [num_iterations] [config_file ...]
+"""
+
+import os
+import sys
+import timeit
+
+METPLUS_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                            os.pardir,
+                                            os.pardir))
+sys.path.insert(0, METPLUS_BASE)
+
+from metplus.util.config.config_launcher import METplusConfig
+from metplus.util.met_util import baseinputconfs
+
+DEFAULT_USE_CASE_CONF = os.path.join(
+    METPLUS_BASE, 'parm', 'use_cases', 'model_applications', 'medium_range',
+    'TCStat_SeriesAnalysis_fcstGFS_obsGFS_FeatureRelative_SeriesByLead.conf'
+)
+
+def read_config(config_files):
+    config = METplusConfig()
+    for config_file in baseinputconfs:
+        config.read(os.path.join(METPLUS_BASE, 'parm', config_file))
+    for config_file in config_files:
+        config.read(config_file)
+    return config
+
+def resolve_all(config, options, clear_cache):
+    for sec, opt in options:
+        if clear_cache:
+            config.clear_raw_cache()
+        config.getraw(sec, opt)
+
+def main(num_iterations, config_files):
+    config = read_config(config_files)
+    options = [(sec, opt) for sec in config.sections()
+               for opt in config.keys(sec)]
+
+    # make sure both methods produce the same output
+    for sec, opt in options:
+        config.clear_raw_cache()
+        expected = config.getraw(sec, opt)
+        if config.getraw(sec, opt) != expected:
+            print(f"ERROR: Output differs for [{sec}] {opt}")
+            return False
+
+    results = {}
+    for name, clear_cache in (('uncached', True), ('cached', False)):
+        seconds = min(timeit.repeat(lambda: resolve_all(config, options,
+                                                        clear_cache),
+                                    number=num_iterations,
+                                    repeat=3))
+        per_call = seconds / (num_iterations * len(options)) * 1e6
+        results[name] = seconds
+        print(f"{name:>8}: {seconds:.3f}s for {num_iterations} iterations "
+              f"of {len(options)} options ({per_call:.2f} us per call)")
+
+    speedup = results['uncached'] / results['cached']
+    print(f"Speedup: {speedup:.2f}x")
+    return True
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    iterations = 100
+    if args and args[0].isdigit():
+        iterations = int(args.pop(0))
+
+    if not main(iterations, args or [DEFAULT_USE_CASE_CONF]):
+        sys.exit(1)
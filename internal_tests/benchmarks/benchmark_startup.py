@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Program Name: benchmark_startup.py
+Contact(s): George McCabe
+Abstract: Benchmark for the cold start cost of master_metplus. Each run starts
+ a new Python process with -X importtime and reports the time to import
+ metplus.util, import the modules for the wrappers in the process list, and
+ (if config files are provided) read the configuration with pre_run_setup.
+ The modules that took the longest to import are listed to help track
+ packages that are pulled in unnecessarily.
+Usage: python benchmark_startup.py [num_runs] [config_file ...]
+ If the config files set PROCESS_LIST, the wrappers in the list are imported
+ and initialized, otherwise PB2NC is imported.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+METPLUS_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                            os.pardir,
+                                            os.pardir))
+
+NUM_SLOWEST_MODULES = 10
+
+# code run in a new process for each run. Timings are written to stdout
+# as JSON and the import times from -X importtime are written to stderr
+CHILD_CODE = '''
+import os
+import sys
+import json
+import time
+sys.path.insert(0, {metplus_base!r})
+sys.argv = ['master_metplus.py'] + {config_args!r}
+
+timings = {{}}
+start = time.perf_counter()
+from metplus.util import pre_run_setup, get_process_list
+from metplus.util import get_wrapper_instance, camel_to_underscore
+timings['import metplus.util'] = time.perf_counter() - start
+
+config = None
+process_list = ['PB2NC']
+if {config_args!r}:
+    start = time.perf_counter()
+    config = pre_run_setup(os.path.join({metplus_base!r}, 'ush',
+                                        'master_metplus.py'), 'METplus')
+    process_list = get_process_list(config)
+    timings['pre_run_setup'] = time.perf_counter() - start
+
+start = time.perf_counter()
+for process in process_list:
+    __import__('metplus.wrappers.' + camel_to_underscore(process) +
+               '_wrapper')
+timings['import wrappers'] = time.perf_counter() - start
+
+if config is not None:
+    start = time.perf_counter()
+    for process in process_list:
+        get_wrapper_instance(config, process)
+    timings['initialize wrappers'] = time.perf_counter() - start
+
+print(json.dumps(timings))
+'''
+
+def parse_import_times(importtime_output):
+    """!Read the cumulative import time of each module from the
+        output of python -X importtime
+        Args:
+            @param importtime_output text written to stderr by -X importtime
+            @returns dictionary of module names and cumulative times in seconds
+    """
+    import_times = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        _, cumulative, module = line.split('|')
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            continue
+
+        name = module.strip()
+        import_times[name] = (max(import_times.get(name, 0),
+                                  int(cumulative) / 1e6))
+    return import_times
+
+def run_once(config_files):
+    """!Run the startup steps in a new Python process
+        Args:
+            @param config_files list of config files to pass to pre_run_setup
+            @returns tuple of dictionary of step timings and dictionary of
+             import times or (None, None) if the process failed
+    """
+    config_args = []
+    for config_file in config_files:
+        config_args.extend(['-c', os.path.abspath(config_file)])
+
+    code = CHILD_CODE.format(metplus_base=METPLUS_BASE,
+                             config_args=config_args)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    if result.returncode:
+        print(f"ERROR: Startup process failed:\n{result.stderr}")
+        return None, None
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_import_times(result.stderr)
+
+def main(num_runs, config_files):
+    all_timings = {}
+    all_import_times = {}
+    for _ in range(num_runs):
+        timings, import_times = run_once(config_files)
+        if timings is None:
+            return False
+
+        for name, seconds in timings.items():
+            all_timings.setdefault(name, []).append(seconds)
+        for name, seconds in import_times.items():
+            all_import_times.setdefault(name, []).append(seconds)
+
+    print(f"Startup times (best of {num_runs} runs):")
+    for name, seconds in all_timings.items():
+        print(f"{name:>20}: {min(seconds) * 1000:.1f} ms")
+
+    print(f"\n{NUM_SLOWEST_MODULES} slowest imports (cumulative):")
+    slowest = sorted(all_import_times.items(), key=lambda item: min(item[1]),
+                     reverse=True)
+    for name, seconds in slowest[:NUM_SLOWEST_MODULES]:
+        print(f"{min(seconds) * 1000:10.1f} ms  {name}")
+
+    return True
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    runs = 5
+    if args and args[0].isdigit():
+        runs = int(args.pop(0))
+
+    if not main(runs, args):
+        sys.exit(1)
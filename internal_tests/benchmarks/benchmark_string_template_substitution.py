@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Program Name: benchmark_string_template_substitution.py
+Contact(s): George McCabe
+Abstract: Micro-benchmark for do_string_sub. Compares filling in templates
+ that are parsed on every call against templates that are compiled once and
+ reused, using the template patterns from the StringTemplateSubstitution
+ pytests.
+Usage: python benchmark_string_template_substitution.py [num_iterations]
+"""
+
+import os
+import sys
+import datetime
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir,
+                                                os.pardir)))
+
+from metplus.util.config import string_template_substitution as sts
+
+TEMPLATES = [
+    "prefix.{valid?fmt=%Y%m%d}.tm{cycle?fmt=%2H}",
+    "prepbufr.gdas.{valid?fmt=%Y%m%d%H}.nc",
+    "{init?fmt=%Y%m%d%H}_A{lead?fmt=%HHH}h",
+    "{init?fmt=%Y%m%d%H}_A{lead?fmt=%.3H}h",
+    "pgbf{lead?fmt=%1H}.gfs.{valid?fmt=%Y%m%d%H}",
+    "{valid?fmt=%Y%m%d%H}/gfs.t{init?fmt=%H}z.pgrb2.0p25.f{lead?fmt=%.2H}",
+    "ncar.ral.CoSPA.HRRR.{init?fmt=%Y-%m-%dT%H:%M:%S}.PT{lead?fmt=%.2H}:00.nc",
+    "{init?fmt=%Y%m%d%H?shift=-86400}",
+    "dwd_{init?fmt=%Y%m%d%H}_{lead?fmt=%.3H?shift=-86400}_{lead?fmt=%.3H}",
+    "/d1/METplus_TC/bdeck/{date?fmt=%s}/b{region?fmt=%s}{cyclone?fmt=%s}"
+    "{misc?fmt=%s}.dat",
+    "{valid?fmt=%Y%m%d%H?truncate=3H}/{lead?fmt=%H%M%S}",
+]
+
+def get_kwargs():
+    init = datetime.datetime(2019, 2, 1, 12)
+    lead = 3 * 86400 + 6 * 3600
+    return {'init': init,
+            'valid': init + datetime.timedelta(seconds=lead),
+            'lead': lead,
+            'cycle': 6 * 3600,
+            'date': '201902',
+            'region': 'al',
+            'cyclone': '1',
+            'misc': 'gfso',
+            }
+
+def fill_uncompiled(kwargs):
+    for template in TEMPLATES:
+        sts.CompiledTemplate(template).substitute(kwargs)
+
+def fill_compiled(kwargs):
+    for template in TEMPLATES:
+        sts.do_string_sub(template, **kwargs)
+
+def main(num_iterations):
+    kwargs = get_kwargs()
+
+    # make sure both methods produce the same output
+    for template in TEMPLATES:
+        expected = sts.CompiledTemplate(template).substitute(kwargs)
+        if sts.do_string_sub(template, **kwargs) != expected:
+            print(f"ERROR: Output differs for {template}")
+            return False
+
+    results = {}
+    for name, func in (('parse every call', fill_uncompiled),
+                       ('compiled/cached', fill_compiled)):
+        seconds = min(timeit.repeat(lambda: func(kwargs),
+                                    number=num_iterations,
+                                    repeat=3))
+        per_call = seconds / (num_iterations * len(TEMPLATES)) * 1e6
+        results[name] = seconds
+        print(f"{name:>17}: {seconds:.3f}s for {num_iterations} iterations "
+              f"({per_call:.2f} us per template)")
+
+    speedup = results['parse every call'] / results['compiled/cached']
+    print(f"Speedup: {speedup:.2f}x")
+    return True
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    if not main(iterations):
+        sys.exit(1)
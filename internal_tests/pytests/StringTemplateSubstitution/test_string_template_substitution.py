@@ -7,6 +7,7 @@ import datetime
 from metplus.util import do_string_sub, parse_template
 from metplus.util import get_tags,format_one_time_item, format_hms
 from metplus.util import add_to_dict, populate_match_dict, get_fmt_info
+from metplus.util import compile_template, compile_template_regex, parse_many
 
 def test_cycle_hour():
     cycle_string = 0
@@ -583,4 +584,81 @@ def test_do_string_sub_skip_missing_tags():
     templ = "{init?fmt=%Y%m%d%H}_{missing_tag?fmt=%H}_f{lead?fmt=%2H}"
     expected_filename = "2017060400_{missing_tag?fmt=%H}_f06"
     filename = do_string_sub(templ, init=init_string, lead=lead_string, skip_missing_tags=True)
-    assert(filename == expected_filename)
\ No newline at end of file
+    assert(filename == expected_filename)
+def test_do_string_sub_skip_missing_tags_all_missing():
+    templ = "{missing_tag?fmt=%H}_f{other_tag}"
+    filename = do_string_sub(templ, skip_missing_tags=True)
+    assert(filename == templ)
+
+@pytest.mark.parametrize(
+    'templ, expected_filename', [
+        ('{valid?shift=-1d?fmt=%Y%m%d}', '20190131'),
+        ('{valid?truncate=6H?fmt=%Y%m%d%H}', '2019020112'),
+        ('{valid?fmt=%Y%m?shift=1m}', '201903'),
+        ('{lead?fmt=%S?fmt=%H}', '06'),
+    ]
+)
+def test_do_string_sub_format_item_order(templ, expected_filename):
+    valid = datetime.datetime(2019, 2, 1, 13, 47)
+    filename = do_string_sub(templ, valid=valid, lead=21600)
+    assert(filename == expected_filename)
+
+def test_compile_template_cached():
+    templ = "{init?fmt=%Y%m%d%H}_f{lead?fmt=%3H}.nc"
+    compiled = compile_template(templ)
+    assert(compile_template(templ) is compiled)
+    init = datetime.datetime(2019, 2, 1, 12)
+    assert(compiled.substitute({'init': init, 'lead': 3600}) ==
+           '2019020112_f001.nc')
+    assert(compiled.substitute({'init': init, 'lead': 7200}) ==
+           '2019020112_f002.nc')
+
+@pytest.mark.parametrize(
+    'template, filepath', [
+        ('file.{valid?fmt=%Y%m%d%H}.out', 'file.2019020112.out'),
+        ('file.{init?fmt=%Y%m%d%H}.f{lead?fmt=%H}.out',
+         'file.2019020112.f03.out'),
+        ('file.{init?fmt=%Y%m%d%H}.f{lead?fmt=%H}.out',
+         'file.2019020112.f0003.out'),
+        ('file.{init?fmt=%Y%m%d%H}.f{lead?fmt=%3H}.out',
+         'file.2019020112.f03.out'),
+        ('file.{valid?fmt=%Y%m%d%H?shift=-30}.out', 'file.2019020112.out'),
+        ('{valid?fmt=%Y%m%d}/{valid?fmt=%H}_{lead?fmt=%H}12.nc',
+         '20190201/12_0612.nc'),
+        ('{valid?fmt=%Y%m%d}/{valid?fmt=%H}_{lead?fmt=%H}',
+         '20190201/13_06'),
+        ('{valid?fmt=%Y%m%d%H}{valid?fmt=%H}', '201902011213'),
+        ('{init?fmt=%Y%m%d%H}_dog_A{lead?fmt=%HH}h', '1987020103_cat_A03h'),
+        ('{valid?fmt=%Y%j%H}', '201903212'),
+    ]
+)
+def test_compile_template_regex(template, filepath):
+    template_regex = compile_template_regex(template)
+    assert(template_regex is not None)
+    assert(template_regex.match(filepath) ==
+           populate_match_dict(template, filepath))
+
+@pytest.mark.parametrize(
+    'template', [
+        'file.{init?fmt=%Y%m%d%H?shift=-30}.f{lead?fmt=%H}.out',
+        'file.{valid?fmt=%Y%m%d%H?shift=-30}.{valid?fmt=%Y?shift=60}.out',
+        'file.{valid?fmt=%Y%m%d%H?bad}.out',
+        'file.no_tags.out',
+    ]
+)
+def test_compile_template_regex_not_supported(template):
+    assert(compile_template_regex(template) is None)
+
+def test_parse_many():
+    template = '{init?fmt=%Y%m%d%H}/f{lead?fmt=%3H}.grb2'
+    filepaths = ['2019020112/f006.grb2',
+                 '2019020112/f006.grib2',
+                 '2019020200/f012.grb2',
+                 ]
+    time_info_list = parse_many(template, filepaths)
+    assert(len(time_info_list) == 3)
+    assert(time_info_list[1] is None)
+    assert(time_info_list[0]['valid'] == datetime.datetime(2019, 2, 1, 18))
+    assert(time_info_list[2]['valid'] == datetime.datetime(2019, 2, 2, 12))
+    for filepath, time_info in zip(filepaths, time_info_list):
+        assert(time_info == parse_template(template, filepath))
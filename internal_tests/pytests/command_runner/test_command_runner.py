@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import datetime
+import pytest
+
+from metplus.util import met_util as util
+from metplus.util.config import config_metplus
+from metplus.wrappers.command_runner import CommandRunner
+from metplus.wrappers.command_builder import CommandBuilder
+
+#@pytest.fixture
+def metplus_config():
+    """! Create a METplus configuration object that can be
+    manipulated/modified to
+         reflect different paths, directories, values, etc. for individual
+         tests.
+    """
+    # Read in the configuration object CONFIG
+    config = config_metplus.setup(util.baseinputconfs)
+    util.get_logger(config)
+    return config
+
+@pytest.mark.parametrize(
+    'max_concurrent', [
+        1, 3,
+    ]
+)
+def test_submit_cmd(tmp_path, max_concurrent):
+    config = metplus_config()
+    log_file = os.path.join(str(tmp_path), 'metplus.log')
+    config.set('config', 'LOG_METPLUS', log_file)
+    cmdrunner = CommandRunner(config, logger=config.logger,
+                              max_concurrent=max_concurrent)
+    for index in range(5):
+        cmd = f'echo start {index}; sleep 0.1; echo end {index}'
+        cmdrunner.submit_cmd(cmd, ismetcmd=False, run_inshell=True,
+                             log_theoutput=True)
+
+    results = cmdrunner.wait_all()
+    assert([ret for ret, _ in results] == [0] * 5)
+    assert(cmdrunner.wait_all() == [])
+
+    # output of each command is not interleaved with other commands
+    with open(log_file, 'r') as file_handle:
+        lines = file_handle.read().splitlines()
+    assert(len(lines) == 10)
+    for start, end in zip(lines[0::2], lines[1::2]):
+        assert(start.replace('start', 'end') == end)
+
+    # isolated log files are removed
+    assert(os.listdir(str(tmp_path)) == ['metplus.log'])
+
+def test_run_cmd_telemetry(tmp_path):
+    config = metplus_config()
+    telemetry_file = os.path.join(str(tmp_path), 'telemetry.jsonl')
+    config.set('config', 'LOG_COMMAND_TELEMETRY', telemetry_file)
+    cmdrunner = CommandRunner(config, logger=config.logger)
+    ret, _ = cmdrunner.run_cmd('python3 -c "sum(range(10**6))"',
+                               app_name='python3',
+                               telemetry_tags={'wrapper': 'TestWrapper',
+                                               'run_time': '20200201000000',
+                                               'field': 'TMP P500'})
+    assert(ret == 0)
+
+    with open(telemetry_file, 'r') as file_handle:
+        records = [json.loads(line) for line in file_handle]
+    assert(len(records) == 1)
+    assert(records[0]['app_name'] == 'python3')
+    assert(records[0]['wrapper'] == 'TestWrapper')
+    assert(records[0]['field'] == 'TMP P500')
+    assert(records[0]['return_code'] == 0)
+    assert(records[0]['user_cpu_seconds'] + records[0]['system_cpu_seconds'] > 0)
+    assert(records[0]['max_rss_kb'] > 0)
+
+@pytest.mark.parametrize(
+    'once_per_field, field', [
+        (True, 'TMP P500'),
+        (False, None),
+    ]
+)
+def test_get_telemetry_tags(once_per_field, field):
+    config = metplus_config()
+    wrapper = CommandBuilder(config, config.logger)
+    wrapper.c_dict['ONCE_PER_FIELD'] = once_per_field
+    wrapper.c_dict['CURRENT_VAR_INFO'] = {'fcst_name': 'TMP',
+                                          'fcst_level': 'P500'}
+    wrapper.current_input_dict = {'init': datetime.datetime(2020, 2, 1)}
+    tags = wrapper.get_telemetry_tags()
+    assert(tags == {'wrapper': 'CommandBuilder',
+                    'run_time': '20200201000000',
+                    'field': field})
@@ -6,6 +6,8 @@ import datetime
 import os
 from configparser import NoOptionError
 from shutil import which
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import produtil
 
@@ -54,6 +56,89 @@ def test_getseconds(input_value, result):
         if result is None:
             assert(True)
 
+def test_getraw_cache():
+    conf = metplus_config()
+    conf.set('config', 'TEST_EXTRA', 'extra')
+    conf.set('config', 'TEST_GETRAW', '{TEST_EXTRA}_value')
+    assert(conf.getraw('config', 'TEST_GETRAW') == 'extra_value')
+    assert(('config', 'TEST_GETRAW', '') in conf._raw_cache)
+
+    # changing an option that is not used does not clear the cache
+    conf.set('config', 'TEST_UNUSED', 'unused')
+    assert(('config', 'TEST_GETRAW', '') in conf._raw_cache)
+
+    # changing a referenced value clears the cache
+    conf.set('config', 'TEST_EXTRA', 'new')
+    assert(('config', 'TEST_GETRAW', '') not in conf._raw_cache)
+    assert(conf.getraw('config', 'TEST_GETRAW') == 'new_value')
+
+    conf.readstr('[config]\nTEST_EXTRA = read\n')
+    assert(conf.getraw('config', 'TEST_GETRAW') == 'read_value')
+
+    # values that reference environment variables are not saved
+    conf.set('config', 'TEST_GETRAW_ENV', '{ENV[METPLUS_TEST_GETRAW_ENV]}')
+    os.environ['METPLUS_TEST_GETRAW_ENV'] = 'one'
+    assert(conf.getraw('config', 'TEST_GETRAW_ENV') == 'one')
+    os.environ['METPLUS_TEST_GETRAW_ENV'] = 'two'
+    assert(conf.getraw('config', 'TEST_GETRAW_ENV') == 'two')
+    del os.environ['METPLUS_TEST_GETRAW_ENV']
+
+def test_getraw_cache_threads():
+    conf = metplus_config()
+    for index in range(100):
+        conf.set('config', f'TEST_THREAD_{index}', f'{{TEST_EXTRA}}_{index}')
+
+    def read_options():
+        for _ in range(20):
+            for index in range(100):
+                conf.getraw('config', f'TEST_THREAD_{index}')
+
+    def set_options():
+        for index in range(500):
+            conf.set('config', 'TEST_EXTRA', index)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(read_options) for _ in range(4)]
+        futures.append(executor.submit(set_options))
+        for future in futures:
+            future.result()
+
+    assert(conf.getraw('config', 'TEST_THREAD_1') == '499_1')
+
+def test_track_option_names_threads():
+    conf = metplus_config()
+    conf.set('config', 'TEST_ONE', 'one')
+    conf.set('config', 'TEST_TWO', 'two')
+    barrier = threading.Barrier(2)
+
+    def read_option(option_name):
+        with conf.track_option_names() as option_names:
+            barrier.wait()
+            conf.getraw('config', option_name)
+            barrier.wait()
+        return option_names
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        one = executor.submit(read_option, 'TEST_ONE')
+        two = executor.submit(read_option, 'TEST_TWO')
+        assert(one.result() == {'TEST_ONE'})
+        assert(two.result() == {'TEST_TWO'})
+
+def test_copy():
+    conf = metplus_config()
+    conf.set('config', 'CURRENT_FCST_NAME', 'TMP')
+    conf.set('config', 'TEST_COPY', '{CURRENT_FCST_NAME}_out')
+    assert(conf.getraw('config', 'TEST_COPY') == 'TMP_out')
+
+    conf_copy = conf.copy()
+    assert(conf_copy.getraw('config', 'TEST_COPY') == 'TMP_out')
+    assert(conf_copy.getdir('OUTPUT_BASE') == conf.getdir('OUTPUT_BASE'))
+
+    # changes to the copy are not seen by the original
+    conf_copy.set('config', 'CURRENT_FCST_NAME', 'APCP')
+    assert(conf_copy.getraw('config', 'TEST_COPY') == 'APCP_out')
+    assert(conf.getraw('config', 'TEST_COPY') == 'TMP_out')
+
 # value = None -- config variable not set
 @pytest.mark.parametrize(
     'input_value, default, result', [
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import os
+import datetime
+import pytest
+
+from metplus.util import met_util as util
+from metplus.util import time_util
+from metplus.util.config import config_metplus
+from metplus.wrappers.gen_vx_mask_wrapper import GenVxMaskWrapper
+
+#@pytest.fixture
+def metplus_config():
+    """! Create a METplus configuration object that can be
+    manipulated/modified to
+         reflect different paths, directories, values, etc. for individual
+         tests.
+    """
+    # Read in the configuration object CONFIG
+    config = config_metplus.setup(util.baseinputconfs)
+    util.get_logger(config)
+    return config
+
+def gen_vx_mask_wrapper():
+    config = metplus_config()
+    config.set('config', 'DO_NOT_RUN_EXE', True)
+    config.set('config', 'GEN_VX_MASK_MAX_CONCURRENT_COMMANDS', 2)
+    wrap = GenVxMaskWrapper(config, config.logger)
+    wrap.c_dict['INPUT_TEMPLATE'] = '{valid?fmt=%Y%m%d%H}_ZENITH'
+    wrap.c_dict['MASK_INPUT_TEMPLATES'] = ['LAT', 'LON']
+    wrap.c_dict['OUTPUT_DIR'] = os.path.join(config.getdir('OUTPUT_BASE'),
+                                             'GenVxMask_test')
+    wrap.c_dict['OUTPUT_TEMPLATE'] = '{valid?fmt=%Y%m%d%H}_ZENITH_LAT_LON_MASK.nc'
+    wrap.c_dict['COMMAND_OPTIONS'] = ["-type lat -thresh 'ge30&&le50'",
+                                      "-type lon -thresh 'le-70&&ge-130' -intersection"]
+    return wrap
+
+@pytest.mark.parametrize(
+    'step_succeeds, expected_num_commands', [
+        (True, 2),
+        (False, 1),
+    ]
+)
+def test_run_gen_vx_mask_chained_concurrent(step_succeeds,
+                                            expected_num_commands):
+    """ Verify that the command that reads the temporary file is not built
+        until the command that writes it has finished"""
+    input_dict = {'valid': datetime.datetime(2018, 2, 1),
+                  'lead': 0}
+    time_info = time_util.ti_calculate(input_dict)
+
+    wrap = gen_vx_mask_wrapper()
+    assert(wrap.c_dict['MAX_CONCURRENT_COMMANDS'] == 2)
+
+    num_commands_at_wait = []
+    def wait_for_commands():
+        num_commands_at_wait.append(len(wrap.all_commands))
+        wrap.cmdrunner.wait_all()
+        return step_succeeds
+
+    wrap.wait_for_commands = wait_for_commands
+    wrap.run_at_time_all(time_info)
+    wrap.cmdrunner.wait_all()
+
+    assert(num_commands_at_wait == [1])
+    assert(len(wrap.all_commands) == expected_num_commands)
+
+    temp_file = os.path.join(wrap.config.getdir('STAGING_DIR'), 'gen_vx_mask',
+                             'temp_20180201000000_20180201000000_0.nc')
+    assert(wrap.all_commands[0].split()[3] == temp_file)
+    if step_succeeds:
+        assert(wrap.all_commands[1].split()[1] == temp_file)
+
+@pytest.mark.parametrize(
+    'init, lead, custom, expected_name', [
+        (datetime.datetime(2018, 2, 1), 0, '',
+         'temp_20180201000000_20180201000000_0.nc'),
+        (datetime.datetime(2018, 2, 1, 6), 0, '',
+         'temp_20180201060000_20180201060000_0.nc'),
+        (datetime.datetime(2018, 2, 1), 3600, '',
+         'temp_20180201000000_20180201010000_0.nc'),
+        (datetime.datetime(2018, 2, 1), 0, 'mem1',
+         'temp_20180201000000_20180201000000_mem1_0.nc'),
+    ]
+)
+def test_get_temp_file(init, lead, custom, expected_name):
+    """ Verify that each run time gets its own temporary files"""
+    wrap = gen_vx_mask_wrapper()
+    time_info = time_util.ti_calculate({'init': init,
+                                        'lead': lead,
+                                        'custom': custom})
+    assert(wrap.get_temp_file(time_info, 0) ==
+           os.path.join(wrap.config.getdir('STAGING_DIR'), 'gen_vx_mask',
+                        expected_name))
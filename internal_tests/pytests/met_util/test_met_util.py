@@ -6,6 +6,10 @@ import datetime
 import os
 import subprocess
 import shutil
+import gzip
+import bz2
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dateutil.relativedelta import relativedelta
 from csv import reader
 
@@ -161,6 +165,116 @@ def test_preprocess_file_none():
     outpath = util.preprocess_file(None, None, conf)
     assert(outpath is None)
 
+def test_preprocess_file_staging_cache(tmp_path, monkeypatch):
+    conf = metplus_config()
+    stage_dir = os.path.join(str(tmp_path), 'stage')
+    conf.set('dir', 'STAGING_DIR', stage_dir)
+    data_dir = os.path.join(str(tmp_path), 'data')
+    os.makedirs(data_dir)
+    filepath = os.path.join(data_dir, 'testfile.txt')
+    with gzip.open(filepath + '.gz', 'wb') as file_handle:
+        file_handle.write(b'first')
+
+    decompressed = []
+    decompress_file = util.decompress_file
+    def count_decompress(source_path, outpath):
+        decompressed.append(source_path)
+        decompress_file(source_path, outpath)
+    monkeypatch.setattr(util, 'decompress_file', count_decompress)
+
+    # file is only decompressed once when staged by many threads at once
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outpaths = list(executor.map(
+            lambda _: util.preprocess_file(filepath, None, conf), range(8)
+        ))
+    assert(outpaths == [stage_dir + filepath] * 8)
+    assert(len(decompressed) == 1)
+    with open(outpaths[0], 'rb') as file_handle:
+        assert(file_handle.read() == b'first')
+
+    # staged file is replaced if the compressed file changes
+    with gzip.open(filepath + '.gz', 'wb') as file_handle:
+        file_handle.write(b'second version')
+    os.utime(filepath + '.gz', (0, 0))
+    outpath = util.preprocess_file(filepath, None, conf)
+    assert(len(decompressed) == 2)
+    with open(outpath, 'rb') as file_handle:
+        assert(file_handle.read() == b'second version')
+
+def test_preprocess_file_staging_cache_max_size(tmp_path):
+    conf = metplus_config()
+    stage_dir = os.path.join(str(tmp_path), 'stage')
+    conf.set('dir', 'STAGING_DIR', stage_dir)
+    conf.set('config', 'STAGING_CACHE_MAX_SIZE_MB', 2)
+    data_dir = os.path.join(str(tmp_path), 'data')
+    os.makedirs(data_dir)
+    outpaths = []
+    for index in range(3):
+        filepath = os.path.join(data_dir, f'testfile{index}.txt')
+        with bz2.open(filepath + '.bz2', 'wb') as file_handle:
+            file_handle.write(b'0' * 1024 * 1024)
+        outpaths.append(util.preprocess_file(filepath, None, conf))
+        util.release_staged_files()
+
+    # least recently used file was removed to stay under the size limit
+    assert([os.path.exists(outpath) for outpath in outpaths] ==
+           [False, True, True])
+    assert(not os.path.exists(outpaths[0] + util.STAGING_LOCK_EXT))
+
+    # files that are in use are not removed until they are released
+    first_path = os.path.join(data_dir, 'testfile0.txt')
+    outpaths[0] = util.preprocess_file(first_path, None, conf)
+    for index in (1, 2):
+        filepath = os.path.join(data_dir, f'testfile{index}.txt')
+        util.preprocess_file(filepath, None, conf)
+    assert(all(os.path.exists(outpath) for outpath in outpaths))
+
+    util.release_staged_files()
+    util.remove_least_recently_used_staged_files(stage_dir, 2 * 1024 * 1024)
+    assert([os.path.exists(outpath) for outpath in outpaths] ==
+           [False, True, True])
+
+    # file in use by another thread is not removed
+    in_use = threading.Event()
+    done = threading.Event()
+    def use_file():
+        util.preprocess_file(first_path, None, conf)
+        in_use.set()
+        done.wait()
+        util.release_staged_files()
+
+    thread = threading.Thread(target=use_file)
+    thread.start()
+    in_use.wait()
+    util.remove_least_recently_used_staged_files(stage_dir, 0)
+    assert(os.path.exists(outpaths[0]))
+    done.set()
+    thread.join()
+    util.remove_least_recently_used_staged_files(stage_dir, 0)
+    assert(not any(os.path.exists(outpath) for outpath in outpaths))
+    assert(not any(name.endswith(util.STAGING_LOCK_EXT)
+                   for _, _, files in os.walk(stage_dir) for name in files))
+
+def test_get_storm_rows(tmp_path):
+    filter_file = os.path.join(str(tmp_path), 'filter_20141214_00.tcst')
+    with open(filter_file, 'w') as file_handle:
+        file_handle.write('AMODEL STORM_ID INIT LEAD\n')
+        file_handle.write('GFSO ML1201072014 20141214_000000 000000\n')
+        file_handle.write('GFSO ML1200972014 20141214_000000 000000\n')
+        # storm id of the first storm is found in a different column
+        file_handle.write('ML1201072014 ML1200972014 20141214_000000 060000\n')
+        file_handle.write('\n')
+
+    header, storm_rows = util.get_storm_rows(filter_file)
+    assert(header == ['AMODEL', 'STORM_ID', 'INIT', 'LEAD'])
+    assert(sorted(storm_rows) == util.get_storm_ids(filter_file, None))
+    assert([row[3] for row in storm_rows['ML1200972014']] ==
+           ['000000', '060000'])
+    assert(len(storm_rows['ML1201072014']) == 1)
+
+    assert(util.get_storm_rows(os.path.join(str(tmp_path), 'fake.tcst')) ==
+           (None, {}))
+
 def test_getlist():
     l = 'gt2.7, >3.6, eq42'
     test_list = util.getlist(l)
@@ -221,6 +335,38 @@ def test_parse_var_list_fcst_only(data_type, list_created):
     else:
         assert(not var_list)
 
+def test_parse_var_list_field_info_index():
+    conf = metplus_config()
+    conf.set('config', 'LEVEL_TYPE', "P")
+    conf.set('config', 'BOTH_VAR1_NAME', "TMP")
+    conf.set('config', 'BOTH_VAR1_LEVELS', "{LEVEL_TYPE}500, {LEVEL_TYPE}850")
+    conf.set('config', 'BOTH_VAR1_OPTIONS', "init = {init?fmt=%Y%m%d%H}")
+    conf.set('config', 'CURRENT_FCST_NAME', '')
+
+    for init_hour in (0, 12):
+        time_info = {'init': datetime.datetime(2020, 2, 3, init_hour)}
+        var_list = util.parse_var_list(conf, time_info=time_info)
+        assert([var['fcst_level'] for var in var_list] == ['P500', 'P850'])
+        assert(var_list[0]['obs_extra'] ==
+               f"init = 20200203{init_hour:02d};")
+
+        # options that were not used to read the field info do not
+        # require it to be read again
+        field_info_index = util.get_field_info_index(conf)
+        conf.set('config', 'CURRENT_FCST_NAME', var_list[0]['fcst_name'])
+        assert(util.get_field_info_index(conf) is field_info_index)
+
+    # field info is read again if an option it used is changed
+    conf.set('config', 'LEVEL_TYPE', "Z")
+    var_list = util.parse_var_list(conf, time_info=time_info)
+    assert(util.get_field_info_index(conf) is not field_info_index)
+    assert([var['fcst_level'] for var in var_list] == ['Z500', 'Z850'])
+
+    # or if a field is added
+    conf.set('config', 'BOTH_VAR2_NAME', "RH")
+    var_list = util.parse_var_list(conf, time_info=time_info)
+    assert([var['fcst_name'] for var in var_list] == ['TMP', 'TMP', 'RH'])
+
 # field info only defined in the OBS_* variables
 @pytest.mark.parametrize(
     'data_type, list_created', [
@@ -437,6 +583,22 @@ def test_get_lead_sequence_lead():
     lead_seq = [ 3, 6, 9, 12 ]
     assert(hour_seq == lead_seq)
 
+def test_get_lead_sequence_saved():
+    input_dict = { 'valid' : datetime.datetime(2019, 2, 1, 13) }
+    conf = metplus_config()
+    conf.set('config', 'LEAD_SEQ', "3,6")
+    test_seq = util.get_lead_sequence(conf, input_dict)
+    assert(test_seq == [relativedelta(hours=3), relativedelta(hours=6)])
+
+    # modifying the list does not modify the saved list
+    test_seq.append(relativedelta(hours=9))
+    assert(len(util.get_lead_sequence(conf, input_dict)) == 2)
+
+    # the list is computed again if LEAD_SEQ changes
+    conf.set('config', 'LEAD_SEQ', "12")
+    assert(util.get_lead_sequence(conf, input_dict) ==
+           [relativedelta(hours=12)])
+
 
 @pytest.mark.parametrize(
     'key, value', [
@@ -954,3 +1116,225 @@ def test_get_skip_time_no_valid():
     input_dict ={'init': datetime.datetime(2019, 1, 29)}
     assert(util.skip_time(input_dict, {'%Y': ['2019']}) == False)
 
+
+def test_get_run_times():
+    conf = metplus_config()
+    conf.set('config', 'LOOP_BY', 'INIT')
+    conf.set('config', 'INIT_TIME_FMT', '%Y%m%d%H')
+    conf.set('config', 'INIT_BEG', '2019020100')
+    conf.set('config', 'INIT_END', '2019020112')
+    conf.set('config', 'INIT_INCREMENT', '6H')
+    expected_times = [datetime.datetime(2019, 2, 1, 0),
+                      datetime.datetime(2019, 2, 1, 6),
+                      datetime.datetime(2019, 2, 1, 12)]
+    assert(util.get_run_times(conf) == expected_times)
+
+@pytest.mark.parametrize(
+    'num_workers, worker_type, expected_result', [
+        ('1', 'thread', 0),
+        ('2', 'thread', 0),
+        ('2', 'process', 0),
+        ('2', 'invalid', 1),
+        ('0', 'thread', 1),
+    ]
+)
+def test_run_metplus_loop_order_times_workers(num_workers, worker_type,
+                                              expected_result):
+    conf = metplus_config()
+    conf.set('config', 'LOOP_ORDER', 'times')
+    conf.set('config', 'LOOP_ORDER_NUM_WORKERS', num_workers)
+    conf.set('config', 'LOOP_ORDER_WORKER_TYPE', worker_type)
+    conf.set('config', 'LOOP_BY', 'VALID')
+    conf.set('config', 'VALID_TIME_FMT', '%Y%m%d%H')
+    conf.set('config', 'VALID_BEG', '2019020100')
+    conf.set('config', 'VALID_END', '2019020118')
+    conf.set('config', 'VALID_INCREMENT', '6H')
+    conf.set('config', 'LEAD_SEQ', '0, 3')
+    conf.set('filename_templates', 'EXAMPLE_INPUT_TEMPLATE',
+             '{valid?fmt=%Y%m%d%H}.ext')
+    assert(util.run_metplus(conf, ['Example']) == expected_result)
+
+def test_get_task_config():
+    conf = metplus_config()
+    task_config = util._get_task_config(conf)
+    assert(task_config is not conf)
+
+    # values set by a wrapper running in a thread are not shared
+    task_config.set('config', 'CURRENT_FCST_NAME', 'TMP')
+    assert(task_config.getstr('config', 'CURRENT_FCST_NAME') == 'TMP')
+    assert(not conf.has_option('config', 'CURRENT_FCST_NAME'))
+
+class FakeWrapper:
+    def __init__(self, c_dict, app_name='example'):
+        self.c_dict = c_dict
+        self.app_name = app_name
+
+@pytest.mark.parametrize(
+    'c_dicts, depends_on, expected_dependencies', [
+        # GridStat reads PCPCombine output
+        ([{'FCST_OUTPUT_DIR': '/out/pcp',
+           'FCST_OUTPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}_A03.nc'},
+          {'FCST_INPUT_DIR': '/out/pcp/',
+           'FCST_INPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}_A03.nc',
+           'OBS_INPUT_DIR': '/in/obs',
+           'OBS_INPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}.nc'}],
+         {},
+         {0: [], 1: [0]}),
+        # no templates in common still run in order by default
+        ([{'OUTPUT_DIR': '/out/pb2nc',
+           'OUTPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}.nc'},
+          {'FCST_INPUT_DIR': '/in/fcst',
+           'FCST_INPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}.nc'}],
+         {},
+         {0: [], 1: [0]}),
+        # no templates in common and second wrapper is independent
+        ([{'OUTPUT_DIR': '/out/pb2nc',
+           'OUTPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}.nc'},
+          {'FCST_INPUT_DIR': '/in/fcst',
+           'FCST_INPUT_TEMPLATE': '{valid?fmt=%Y%m%d%H}.nc'}],
+         {'GRID_STAT': ''},
+         {0: [], 1: []}),
+        # matching templates are added to dependencies that are set
+        ([{'OUTPUT_DIR': '/out/a',
+           'OUTPUT_TEMPLATE': 'a.nc'},
+          {'OUTPUT_DIR': '/out/b',
+           'OUTPUT_TEMPLATE': 'b.nc'},
+          {'FCST_INPUT_DIR': '/out',
+           'FCST_INPUT_TEMPLATE': 'c.nc, a/a.nc'}],
+         {'PCP_COMBINE': '', 'GRID_STAT': ''},
+         {0: [], 1: [], 2: [0]}),
+        # list of templates and dependency on first of three wrappers
+        ([{'OUTPUT_DIR': '/out/a',
+           'OUTPUT_TEMPLATE': 'a.nc'},
+          {'OUTPUT_DIR': '/out/b',
+           'OUTPUT_TEMPLATE': 'b.nc'},
+          {'FCST_INPUT_DIR': '/out',
+           'FCST_INPUT_TEMPLATE': 'c.nc, a/a.nc'}],
+         {},
+         {0: [], 1: [0], 2: [0, 1]}),
+        # dependency set by name
+        ([{}, {}, {}],
+         {'PCP_COMBINE': '', 'GRID_STAT': 'pcp_combine'},
+         {0: [], 1: [], 2: [1]}),
+        # dependency that is not listed before the wrapper
+        ([{}, {}, {}],
+         {'PCP_COMBINE': 'GridStat'},
+         None),
+    ]
+)
+def test_get_pipeline_dependencies(c_dicts, depends_on, expected_dependencies):
+    conf = metplus_config()
+    for app_name, value in depends_on.items():
+        conf.set('config', f'{app_name}_PIPELINE_DEPENDS_ON', value)
+
+    process_list = ['PB2NC', 'PCPCombine', 'GridStat'][-len(c_dicts):]
+    app_names = ['pb2nc', 'pcp_combine', 'grid_stat'][-len(c_dicts):]
+    processes = [FakeWrapper(c_dict, app_name)
+                 for c_dict, app_name in zip(c_dicts, app_names)]
+    assert(util.get_pipeline_dependencies(conf, process_list, processes) ==
+           expected_dependencies)
+
+@pytest.mark.parametrize(
+    'num_workers, worker_type', [
+        ('1', 'thread'),
+        ('4', 'thread'),
+        ('4', 'process'),
+    ]
+)
+def test_run_metplus_loop_order_pipeline(num_workers, worker_type):
+    conf = metplus_config()
+    conf.set('config', 'LOOP_ORDER', 'pipeline')
+    conf.set('config', 'LOOP_ORDER_NUM_WORKERS', num_workers)
+    conf.set('config', 'LOOP_ORDER_WORKER_TYPE', worker_type)
+    conf.set('config', 'LOOP_BY', 'INIT')
+    conf.set('config', 'INIT_TIME_FMT', '%Y%m%d%H')
+    conf.set('config', 'INIT_BEG', '2019020100')
+    conf.set('config', 'INIT_END', '2019020118')
+    conf.set('config', 'INIT_INCREMENT', '6H')
+    conf.set('config', 'LEAD_SEQ', '0, 3')
+    conf.set('config', 'CUSTOM_LOOP_LIST', 'a, b')
+    conf.set('filename_templates', 'EXAMPLE_INPUT_TEMPLATE',
+             '{init?fmt=%Y%m%d%H}_{custom?fmt=%s}.ext')
+    assert(util.run_metplus(conf, ['Example', 'Example']) == 0)
+
+@pytest.mark.parametrize(
+    'num_workers', [
+        1, 3,
+    ]
+)
+def test_run_jobs(num_workers):
+    finished = []
+    def job(name):
+        finished.append(name)
+        if name == 'bad':
+            raise ValueError(name)
+        return name.upper()
+
+    # gif depends on both plots, so it must run after them
+    jobs = [('plot1', lambda: job('plot1'), []),
+            ('bad', lambda: job('bad'), []),
+            ('plot2', lambda: job('plot2'), []),
+            ('gif', lambda: job('gif'), [0, 2]),
+            ]
+    results = util.run_jobs(jobs, num_workers)
+    assert(results == ['PLOT1', None, 'PLOT2', 'GIF'])
+    assert(finished[-1] == 'gif')
+    if num_workers == 1:
+        assert(finished == ['plot1', 'bad', 'plot2', 'gif'])
+
+def test_get_files_in_time_window(tmp_path):
+    data_dir = str(tmp_path)
+    template = '{valid?fmt=%Y%m%d}/{valid?fmt=%Y%m%d_%H%M}.nc'
+    os.makedirs(os.path.join(data_dir, '20180201'))
+    for filename in ['20180201_0000.nc', '20180201_0045.nc',
+                     '20180201_0300.nc', 'not_a_match.txt']:
+        open(os.path.join(data_dir, '20180201', filename), 'w').close()
+
+    valid = util.get_file_valid_seconds(datetime.datetime(2018, 2, 1, 1))
+    files = util.get_files_in_time_window(data_dir, template,
+                                          valid - 3600, valid + 3600)
+    assert([os.path.basename(path) for _, path in files] ==
+           ['20180201_0000.nc', '20180201_0045.nc'])
+
+    # files added after the first search are found in the next search
+    os.makedirs(os.path.join(data_dir, '20180131'))
+    open(os.path.join(data_dir, '20180131', '20180131_2330.nc'), 'w').close()
+    open(os.path.join(data_dir, '20180201', '20180201_0130.nc'), 'w').close()
+    files = util.get_files_in_time_window(data_dir, template,
+                                          valid - 5400, valid + 3600)
+    assert([os.path.basename(path) for _, path in files] ==
+           ['20180131_2330.nc', '20180201_0000.nc',
+            '20180201_0045.nc', '20180201_0130.nc'])
+
+def test_command_telemetry(tmp_path):
+    telemetry_file = os.path.join(str(tmp_path), 'logs', 'telemetry.jsonl')
+    records = [
+        ('grid_stat', 'TMP P500', 10.0, 20000, '20200101000000'),
+        ('grid_stat', 'TMP P500', 5.0, 30000, '20200101000000'),
+        ('grid_stat', 'APCP A03', 1.0, 10000, '20200101000000'),
+        ('pcp_combine', None, 20.0, 5000, '20200101000000'),
+        ('pcp_combine', None, 50.0, 5000, '20191231000000'),
+    ]
+    for app_name, field, cpu, max_rss, clock_time in records:
+        util.write_command_telemetry(telemetry_file,
+                                     {'clock_time': clock_time,
+                                      'app_name': app_name,
+                                      'field': field,
+                                      'wall_seconds': cpu + 1,
+                                      'user_cpu_seconds': cpu - 0.5,
+                                      'system_cpu_seconds': 0.5,
+                                      'max_rss_kb': max_rss})
+
+    summary = util.summarize_command_telemetry(telemetry_file,
+                                               '20200101000000')
+    assert([(item['app_name'], item['field'], item['count'])
+            for item in summary] == [('pcp_combine', None, 1),
+                                     ('grid_stat', 'TMP P500', 2),
+                                     ('grid_stat', 'APCP A03', 1)])
+    assert(summary[1]['cpu_seconds'] == 15.0)
+    assert(summary[1]['wall_seconds'] == 17.0)
+    assert(summary[1]['max_rss_kb'] == 30000)
+
+    # records from all runs are included if clock time is not set
+    summary = util.summarize_command_telemetry(telemetry_file)
+    assert(summary[0]['cpu_seconds'] == 70.0)
@@ -13,6 +13,7 @@ import produtil
 from metplus.util.config import config_metplus
 from metplus.wrappers.mtd_wrapper import MTDWrapper
 from metplus.util import met_util as util
+from metplus.util import time_util
 
 # --------------------TEST CONFIGURATION and FIXTURE SUPPORT -------------
 #
@@ -93,8 +94,8 @@ def test_mtd_by_init_all_found():
     input_dict = {'init' : datetime.datetime.strptime("201705100300", '%Y%m%d%H%M') }
     
     mw.run_at_time(input_dict)
-    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP.txt')
-    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP.txt')
+    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP_idx1.txt')
+    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP_idx1.txt')
     with open(fcst_list_file) as f:
         fcst_list = f.readlines()
     fcst_list = [x.strip() for x in fcst_list]
@@ -125,8 +126,8 @@ def test_mtd_by_valid_all_found():
     input_dict = {'valid' : datetime.datetime.strptime("201705100300", '%Y%m%d%H%M') }
     
     mw.run_at_time(input_dict)
-    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP.txt')
-    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP.txt')
+    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP_idx1.txt')
+    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP_idx1.txt')
     with open(fcst_list_file) as f:
         fcst_list = f.readlines()
     fcst_list = [x.strip() for x in fcst_list]
@@ -157,8 +158,8 @@ def test_mtd_by_init_miss_fcst():
     input_dict = {'init' : datetime.datetime.strptime("201705100300", '%Y%m%d%H%M') }
     
     mw.run_at_time(input_dict)
-    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP.txt')
-    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP.txt')
+    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP_idx1.txt')
+    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP_idx1.txt')
     with open(fcst_list_file) as f:
         fcst_list = f.readlines()
     fcst_list = [x.strip() for x in fcst_list]
@@ -189,8 +190,8 @@ def test_mtd_by_init_miss_both():
     input_dict = {'init' : datetime.datetime.strptime("201705100300", '%Y%m%d%H%M') }
     
     mw.run_at_time(input_dict)
-    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP.txt')
-    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP.txt')
+    fcst_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_fcst_APCP_idx1.txt')
+    obs_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_obs_APCP_idx1.txt')
     with open(fcst_list_file) as f:
         fcst_list = f.readlines()
     fcst_list = [x.strip() for x in fcst_list]
@@ -219,7 +220,7 @@ def test_mtd_single():
     input_dict = {'init' : datetime.datetime.strptime("201705100300", '%Y%m%d%H%M') }
 
     mw.run_at_time(input_dict)
-    single_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_single_APCP.txt')
+    single_list_file = os.path.join(mw.config.getdir('STAGING_DIR'), 'file_lists', '20170510030000_mtd_single_APCP_idx1.txt')
     with open(single_list_file) as f:
         single_list = f.readlines()
     single_list = [x.strip() for x in single_list]
@@ -231,3 +232,18 @@ def test_mtd_single():
            single_list[1] == os.path.join(fcst_dir,'20170510', '20170510_i03_f002_HRRRTLE_PHPT.grb2') and
            single_list[2] == os.path.join(fcst_dir,'20170510', '20170510_i03_f003_HRRRTLE_PHPT.grb2')
            )
+
+@pytest.mark.parametrize(
+    'index, custom, expected_name', [
+        (1, '', '20170510030000_mtd_fcst_APCP_idx1.txt'),
+        (2, '', '20170510030000_mtd_fcst_APCP_idx2.txt'),
+        (1, 'mem1', '20170510030000_mtd_fcst_APCP_idx1_mem1.txt'),
+    ]
+)
+def test_mtd_list_file_name(index, custom, expected_name):
+    mw = mtd_wrapper()
+    time_info = time_util.ti_calculate({'valid': datetime.datetime(2017, 5, 10, 3),
+                                        'lead': 0,
+                                        'custom': custom})
+    var_info = {'index': index}
+    assert(mw.get_list_file_name(time_info, 'fcst', 'APCP', var_info) == expected_name)
@@ -10,7 +10,7 @@ import datetime
 import produtil.setup
 
 from metplus.util.config import config_metplus
-from metplus.wrappers.make_plots_wrapper import MakePlotsWrapper
+from metplus.wrappers.make_plots_wrapper import MakePlotsWrapper, run_plot_script
 from metplus.util import met_util as util
 
 #
@@ -179,3 +179,31 @@ def test_create_c_dict():
                                     +'/logs/master_metplus.log.'
                                     +mp.config.getstr('config',
                                                       'LOG_TIMESTAMP'))
+
+def test_run_plot_script(tmp_path):
+    # Independently test that a plotting script is run in
+    # the current process with the environment variables
+    # for the run and that the environment is restored
+    # after the script finishes or fails
+    output_file = os.path.join(str(tmp_path), 'output.txt')
+    script = os.path.join(str(tmp_path), 'plot_fake_script_name.py')
+    with open(script, 'w') as script_file:
+        script_file.write(
+            "import os\n"
+            "with open(os.environ['OUTPUT_FILE'], 'a') as f:\n"
+            "    f.write(os.environ['FCST_VAR'] + '\\n')\n"
+            "if os.environ['FCST_VAR'] == 'TMP':\n"
+            "    exit(1)\n"
+        )
+    env = dict(os.environ, OUTPUT_FILE=output_file,
+               LOG_METPLUS=os.path.join(str(tmp_path), 'metplus.log'))
+    # Test 1
+    env['FCST_VAR'] = 'HGT'
+    assert(run_plot_script(script, env) == (0, None))
+    assert('OUTPUT_FILE' not in os.environ)
+    # Test 2
+    env['FCST_VAR'] = 'TMP'
+    assert(run_plot_script(script, env) == (1, None))
+    assert('FCST_VAR' not in os.environ)
+    with open(output_file, 'r') as output:
+        assert(output.read() == 'HGT\nTMP\n')
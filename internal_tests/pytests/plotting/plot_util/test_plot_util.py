@@ -714,6 +714,43 @@ def test_calculate_ci():
                                         stat, average_method, randx)
     assert(test_intvl == expected_intvl)
 
+def test_calculate_ci_monte_carlo_chunks():
+    # Test that the Monte Carlo confidence interval does not
+    # depend on the number of tests that are resampled at once
+    dates = ['20190101_000000', '20190102_000000', '20190103_000000']
+    columns = [ 'TOTAL', 'FBAR', 'OBAR', 'FOBAR', 'FFBAR', 'OOBAR', 'MAE' ]
+    model_dataA = pd.DataFrame(
+        np.array([[3600, 1.0, 1.5, 2.0, 1.5, 3.0, 0.5],
+                  [3600, 2.0, 1.0, 2.5, 4.5, 1.5, 1.0],
+                  [3600, 3.0, 3.5, 10.0, 9.5, 12.5, 0.5]]),
+        index=pd.MultiIndex.from_product([['MODEL_TESTA'], dates],
+                                         names=['model_plot_name', 'dates']),
+        columns=columns
+    )
+    model_dataB = pd.DataFrame(
+        np.array([[3600, 1.5, 1.5, 2.5, 2.5, 3.0, 0.5],
+                  [3600, 1.0, 1.0, 1.5, 1.5, 1.5, 1.0],
+                  [3600, 2.5, 3.5, 8.5, 7.0, 12.5, 0.5]]),
+        index=pd.MultiIndex.from_product([['MODEL_TESTB'], dates],
+                                         names=['model_plot_name', 'dates']),
+        columns=columns
+    )
+    randx = np.random.RandomState(0).rand(10000, len(dates))
+    for average_method in ['MEAN', 'MEDIAN', 'AGGREGATION']:
+        expected_intvl = plot_util.calculate_ci(logger, 'EMC_MONTE_CARLO',
+                                                model_dataB, model_dataA,
+                                                len(dates), 'bias',
+                                                average_method, randx,
+                                                chunk_size=10000)
+        assert(expected_intvl > 0)
+        for chunk_size in [7, 333, 1000]:
+            test_intvl = plot_util.calculate_ci(logger, 'EMC_MONTE_CARLO',
+                                                model_dataB, model_dataA,
+                                                len(dates), 'bias',
+                                                average_method, randx,
+                                                chunk_size=chunk_size)
+            assert(np.isclose(test_intvl, expected_intvl, rtol=1e-12))
+
 def test_get_stat_plot_name():
     # Independently test getting the
     # a more formalized statistic name
@@ -834,3 +871,84 @@ def test_calculate_stat():
         assert(test_stat_values_array[1,0,l] ==
                 expected_stat_values_array[1,0,l])
     assert(test_stat_plot_name == expected_stat_plot_name)
+
+def test_read_stat_file(tmp_path):
+    # Independently test reading a MET .stat file, that the
+    # parsed columns are written to a cache file, and that
+    # the cache file is used and matches the parsed data
+    met_version = '8.1'
+    stat_file = os.path.join(str(tmp_path), 'model1.stat')
+    with open(stat_file, 'w') as stat_file_handle:
+        stat_file_handle.write(
+            'VERSION MODEL DESC FCST_LEAD FCST_VALID_BEG FCST_VALID_END '
+            'OBS_LEAD OBS_VALID_BEG OBS_VALID_END FCST_VAR FCST_UNITS '
+            'FCST_LEV OBS_VAR OBS_UNITS OBS_LEV OBTYPE VX_MASK INTERP_MTHD '
+            'INTERP_PNTS FCST_THRESH OBS_THRESH COV_THRESH ALPHA LINE_TYPE\n'
+        )
+        for hour in ['00', '06']:
+            stat_file_handle.write(
+                'V8.1 MODEL_TEST NA 240000 20190101_'+hour+'0000 '
+                '20190101_'+hour+'0000 000000 20190101_'+hour+'0000 '
+                '20190101_'+hour+'0000 HGT NA P1000 HGT NA P1000 '
+                'MODEL_TEST_ANL G002 BILIN 4 NA NA NA NA SL1L2 '
+                '100 5525.7 5525.6 30533394.3 30534428.4 30532383.5 '
+                '1.5\n'
+            )
+    expected_stat_file_data = pd.read_csv(
+        stat_file, sep=" ", skiprows=1, skipinitialspace=True, header=None
+    )
+    test_stat_file_data, test_line_type_columns = (
+        plot_util.read_stat_file(logger, stat_file, met_version)
+    )
+    assert(test_line_type_columns == [ 'TOTAL', 'FBAR', 'OBAR', 'FOBAR',
+                                       'FFBAR', 'OOBAR', 'MAE' ])
+    assert(list(test_stat_file_data.columns) ==
+           plot_util.get_stat_file_base_columns(met_version)
+           + test_line_type_columns)
+    assert(test_stat_file_data['FCST_VALID_BEG'].tolist() ==
+           [ '20190101_000000', '20190101_060000' ])
+    assert(os.path.exists(stat_file+plot_util.STAT_FILE_CACHE_EXT))
+    # Read the cache file without the in-memory copy
+    plot_util._stat_file_data.clear()
+    cached_stat_file_data, _ = (
+        plot_util.read_stat_file(logger, stat_file, met_version)
+    )
+    expected_stat_file_data.columns = test_stat_file_data.columns
+    pd.testing.assert_frame_equal(cached_stat_file_data,
+                                  expected_stat_file_data)
+    pd.testing.assert_frame_equal(test_stat_file_data,
+                                  expected_stat_file_data)
+
+def test_read_stat_file_memory_limit(tmp_path, monkeypatch):
+    # Independently test that only the most recently used .stat
+    # files are kept in memory
+    monkeypatch.setattr(plot_util, 'STAT_FILE_DATA_MAX_FILES', 2)
+    plot_util._stat_file_data.clear()
+    met_version = '8.1'
+    stat_files = []
+    for model in ['model1', 'model2', 'model3']:
+        stat_file = os.path.join(str(tmp_path), model+'.stat')
+        with open(stat_file, 'w') as stat_file_handle:
+            stat_file_handle.write('VERSION MODEL LINE_TYPE\n')
+            stat_file_handle.write(
+                'V8.1 '+model+' NA 240000 20190101_000000 '
+                '20190101_000000 000000 20190101_000000 '
+                '20190101_000000 HGT NA P1000 HGT NA P1000 '
+                'MODEL_TEST_ANL G002 BILIN 4 NA NA NA NA SL1L2 '
+                '100 5525.7 5525.6 30533394.3 30534428.4 30532383.5 '
+                '1.5\n'
+            )
+        stat_files.append(stat_file)
+    plot_util.read_stat_file(logger, stat_files[0], met_version)
+    plot_util.read_stat_file(logger, stat_files[1], met_version)
+    # reading the first file again makes the second the least recently used
+    plot_util.read_stat_file(logger, stat_files[0], met_version)
+    plot_util.read_stat_file(logger, stat_files[2], met_version)
+    cached_stat_files = [ key[0] for key in plot_util._stat_file_data ]
+    assert(cached_stat_files == [ stat_files[0], stat_files[2] ])
+    # a file that was dropped is read again from its cache file
+    stat_file_data, _ = (
+        plot_util.read_stat_file(logger, stat_files[1], met_version)
+    )
+    assert(stat_file_data['MODEL'].tolist() == [ 'model2' ])
+    assert(len(plot_util._stat_file_data) == 2)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import os
+import pytest
+
+from metplus.wrappers.run_journal import RunJournal, get_command_input_files
+
+def test_run_journal(tmp_path):
+    input_file = os.path.join(str(tmp_path), 'input.txt')
+    output_file = os.path.join(str(tmp_path), 'output.txt')
+    for path, content in ((input_file, 'input'), (output_file, 'output')):
+        with open(path, 'w') as file_handle:
+            file_handle.write(content)
+
+    journal = RunJournal(os.path.join(str(tmp_path), 'journal.db'))
+    cmd = f'app -v 2 {input_file} {output_file}'
+    env_items = [('MODEL', 'GFS')]
+    input_files = get_command_input_files(cmd, output_file)
+    assert(input_files == [input_file])
+
+    fingerprint = journal.get_fingerprint(cmd, env_items, input_files)
+    assert(not journal.is_complete(cmd, fingerprint))
+    journal.record(cmd, fingerprint, output_file)
+    assert(journal.is_complete(cmd, fingerprint))
+
+    # same contents written again is still complete
+    with open(output_file, 'w') as file_handle:
+        file_handle.write('output')
+    assert(journal.is_complete(cmd, fingerprint))
+
+    # changed environment or input file changes the fingerprint
+    assert(journal.get_fingerprint(cmd, [('MODEL', 'NAM')], input_files) !=
+           fingerprint)
+    with open(input_file, 'w') as file_handle:
+        file_handle.write('changed')
+    assert(not journal.is_complete(cmd, journal.get_fingerprint(cmd,
+                                                                env_items,
+                                                                input_files)))
+
+    # modified or removed output is not complete
+    with open(output_file, 'w') as file_handle:
+        file_handle.write('modified')
+    assert(not journal.is_complete(cmd, fingerprint))
+    os.remove(output_file)
+    assert(not journal.is_complete(cmd, fingerprint))
+
+def test_get_command_input_files(tmp_path):
+    data_dir = os.path.join(str(tmp_path), 'data')
+    out_dir = os.path.join(str(tmp_path), 'out')
+    os.makedirs(data_dir)
+    os.makedirs(out_dir)
+    data_files = []
+    for index in range(3):
+        data_file = os.path.join(data_dir, f'data{index}.nc')
+        with open(data_file, 'w') as file_handle:
+            file_handle.write(f'data{index}')
+        data_files.append(data_file)
+
+    list_file = os.path.join(str(tmp_path), 'list.txt')
+    with open(list_file, 'w') as file_handle:
+        file_handle.write('file_list\n' + '\n'.join(data_files[:2]) + '\n')
+
+    # files in list files, infiles, and environment variables are inputs
+    cmd = f'app {list_file} -outdir {out_dir}'
+    env_items = [('CLIMO_MEAN_FILE', f'[ "{data_files[2]}" ]'),
+                 ('MET_TMP_DIR', str(tmp_path))]
+    assert(get_command_input_files(cmd, out_dir,
+                                   env_items=env_items) ==
+           sorted([list_file] + data_files))
+    assert(get_command_input_files(f'app -outdir {out_dir}', out_dir,
+                                   infiles=[data_files[0]]) ==
+           [data_files[0]])
+
+    # directories and python embedding cannot be identified
+    assert(get_command_input_files(f'app -lookin {data_dir} -out '
+                                   f'{out_dir}/out.stat',
+                                   f'{out_dir}/out.stat') is None)
+    assert(get_command_input_files(f'app -outdir {out_dir}', out_dir,
+                                   env_items=[('FCST_FILE_TYPE',
+                                               'file_type = PYTHON_NUMPY;')])
+           is None)
+
+    # missing file in list file cannot be identified
+    with open(list_file, 'a') as file_handle:
+        file_handle.write(os.path.join(data_dir, 'missing.nc') + '\n')
+    assert(get_command_input_files(cmd, out_dir) is None)
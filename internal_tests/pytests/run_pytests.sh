@@ -95,6 +95,11 @@ run_pytest_and_check point2grid
 run_pytest_and_check time_util
 run_pytest_and_check series_lead
 run_pytest_and_check pb2nc -c ./conf1
+run_pytest_and_check command_runner
+run_pytest_and_check run_journal
+run_pytest_and_check tc_pairs/deck_files -c ../tc_pairs_wrapper_test.conf
+run_pytest_and_check gen_vx_mask/chained
+run_pytest_and_check series_analysis
 
 #cd $script_dir/extract_tiles
 #python ./run_precondition.py >/dev/null 2>&1
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import os
+import datetime
+import pytest
+
+from metplus.util import met_util as util
+from metplus.util import time_util
+from metplus.util.config import config_metplus
+from metplus.wrappers.series_analysis_wrapper import SeriesAnalysisWrapper
+
+#@pytest.fixture
+def metplus_config():
+    """! Create a METplus configuration object that can be
+    manipulated/modified to
+         reflect different paths, directories, values, etc. for individual
+         tests.
+    """
+    # Read in the configuration object CONFIG
+    config = config_metplus.setup(util.baseinputconfs)
+    util.get_logger(config)
+    return config
+
+@pytest.mark.parametrize(
+    'index, custom, expected_name', [
+        (1, '', '20200201000000_SA_fcst_TMP_idx1.txt'),
+        (2, '', '20200201000000_SA_fcst_TMP_idx2.txt'),
+        (1, 'mem1', '20200201000000_SA_fcst_TMP_idx1_mem1.txt'),
+    ]
+)
+def test_get_files_and_create_list(index, custom, expected_name):
+    """ Verify that each field and custom string gets its own list file"""
+    config = metplus_config()
+    config.set('config', 'LOOP_BY', 'INIT')
+    config.set('config', 'INIT_TIME_FMT', '%Y%m%d%H')
+    config.set('config', 'INIT_BEG', '2020020100')
+    config.set('config', 'INIT_END', '2020020100')
+    config.set('config', 'INIT_INCREMENT', '6H')
+    config.set('config', 'SERIES_ANALYSIS_CONFIG_FILE',
+               '{PARM_BASE}/met_config/SeriesAnalysisConfig_wrapped')
+    wrapper = SeriesAnalysisWrapper(config, config.logger)
+    wrapper.find_data = lambda *args, **kwargs: ['/some/path/file1.nc',
+                                                 '/some/path/file2.nc']
+    time_info = time_util.ti_calculate({'init': datetime.datetime(2020, 2, 1),
+                                        'lead': 0,
+                                        'custom': custom})
+    var_info = {'index': index, 'fcst_name': 'TMP', 'fcst_level': 'P500'}
+    assert(wrapper.get_files_and_create_list(time_info, var_info, 'FCST'))
+
+    list_path = wrapper.c_dict['FCST_LIST_PATH']
+    assert(list_path == os.path.join(config.getdir('STAGING_DIR'),
+                                     'file_lists', expected_name))
+    with open(list_path, 'r') as file_handle:
+        assert(file_handle.read().splitlines() == ['file_list',
+                                                   '/some/path/file1.nc',
+                                                   '/some/path/file2.nc'])
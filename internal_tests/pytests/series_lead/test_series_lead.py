@@ -14,6 +14,7 @@ from metplus.util.config import config_metplus
 from metplus.wrappers.pb2nc_wrapper import PB2NCWrapper
 from metplus.util import met_util as util
 from metplus.util import feature_util
+from metplus.wrappers.command_runner import CommandRunner
 
 # --------------------TEST CONFIGURATION and FIXTURE SUPPORT -------------
 #
@@ -73,3 +74,94 @@ def test_retrieve_var_name_levels():
     print(f"ACTUAL: {actual_vars}")
     print(f"EXPECTED: {expected_vars}")
     assert(actual_vars == expected_vars)
+
+def test_get_netcdf_min_max_for_files(tmp_path):
+    netCDF4 = pytest.importorskip('netCDF4')
+    import numpy as np
+
+    nc_files = []
+    for idx, total in enumerate([[1, 5], [3, 12]]):
+        nc_file = str(tmp_path / f'series_F00{idx}_TMP_Z2.nc')
+        with netCDF4.Dataset(nc_file, 'w') as nc_data:
+            nc_data.createDimension('lat', 2)
+            nc_data.createDimension('lon', 3)
+            var = nc_data.createVariable('series_cnt_TOTAL', 'f4',
+                                         ('lat', 'lon'), fill_value=-9999.)
+            var[:] = np.ma.masked_values([[total[0], total[1], -9999.],
+                                          [total[1], total[0], total[1]]],
+                                         -9999.)
+            var = nc_data.createVariable('series_cnt_RMSE', 'f4',
+                                         ('lat', 'lon'), fill_value=-9999.)
+            var[:] = np.ma.masked_all((2, 3))
+        nc_files.append(nc_file)
+
+    var_names = ['series_cnt_TOTAL', 'series_cnt_RMSE', 'series_cnt_ME']
+    for num_workers in [1, 2]:
+        min_max = feature_util.get_netcdf_min_max_for_files(nc_files,
+                                                            var_names,
+                                                            num_workers)
+        assert(min_max[nc_files[0]]['series_cnt_TOTAL'] == (1, 5))
+        assert(min_max[nc_files[1]]['series_cnt_TOTAL'] == (3, 12))
+        assert(min_max[nc_files[0]]['series_cnt_RMSE'] == (None, None))
+        assert(min_max[nc_files[1]]['series_cnt_ME'] == (None, None))
+
+    assert(feature_util.format_netcdf_value(12.0) == '12')
+    assert(feature_util.format_netcdf_value(1.5) == '1.5')
+
+def test_get_tile_regrid_commands(tmp_path):
+    config = metplus_config()
+    input_dir = str(tmp_path / 'input')
+    out_dir = str(tmp_path / 'output')
+    config.set('dir', 'EXTRACT_TILES_GRID_INPUT_DIR', input_dir)
+    config.set('config', 'EXTRACT_TILES_OVERWRITE_TRACK', False)
+    config.set('config', 'EXTRACT_TILES_NLAT', 60)
+    config.set('config', 'EXTRACT_TILES_NLON', 60)
+    config.set('config', 'EXTRACT_TILES_DLAT', 0.5)
+    config.set('config', 'EXTRACT_TILES_DLON', 0.5)
+    config.set('config', 'EXTRACT_TILES_LAT_ADJ', 15)
+    config.set('config', 'EXTRACT_TILES_LON_ADJ', 15)
+    config.set('config', 'BOTH_VAR1_NAME', 'TMP')
+    config.set('config', 'BOTH_VAR1_LEVELS', 'Z2')
+    config.set('filename_templates', 'FCST_EXTRACT_TILES_INPUT_TEMPLATE',
+               'gfs_{init?fmt=%Y%m%d%H}_{lead?fmt=%HHH}.grb2')
+    config.set('filename_templates', 'OBS_EXTRACT_TILES_INPUT_TEMPLATE',
+               'gfs_{valid?fmt=%Y%m%d%H}_000.grb2')
+    config.set('filename_templates', 'FCST_EXTRACT_TILES_OUTPUT_TEMPLATE',
+               'FCST_TILE_F{lead?fmt=%3H}.nc')
+    config.set('filename_templates', 'OBS_EXTRACT_TILES_OUTPUT_TEMPLATE',
+               'OBS_TILE_F{lead?fmt=%3H}.nc')
+    for filename in ['20141214/gfs_2014121400_000.grb2',
+                     '20141214/gfs_2014121400_006.grb2',
+                     '20141214/gfs_2014121406_000.grb2']:
+        os.makedirs(os.path.join(input_dir, os.path.dirname(filename)),
+                    exist_ok=True)
+        open(os.path.join(input_dir, filename), 'w').close()
+
+    # analysis tile for lead 6 already exists, so it is skipped
+    tile_dir = os.path.join(out_dir, '20141214_00', 'ML1')
+    os.makedirs(tile_dir)
+    open(os.path.join(tile_dir, 'OBS_TILE_F006.nc'), 'w').close()
+
+    header = 'AMODEL STORM_ID INIT LEAD VALID ALAT ALON BLAT BLON'.split()
+    rows = [
+        'GFSO ML1 20141214_000000 000000 20141214_000000 30.2 -70.0 31.0 -71.0',
+        'GFSO ML1 20141214_000000 060000 20141214_060000 32.0 -72.0 33.0 -73.0',
+        # same track point listed twice is only regridded once
+        'GFSO ML1 20141214_000000 060000 20141214_060000 32.0 -72.0 33.0 -73.0',
+    ]
+    rows = [row.split() for row in rows]
+    cmdrunner = CommandRunner(config, logger=config.logger)
+    commands = feature_util.get_tile_regrid_commands(header, rows,
+                                                     '20141214_00', 'ML1',
+                                                     out_dir, config,
+                                                     cmdrunner)
+    assert(list(commands) == [os.path.join(tile_dir, 'FCST_TILE_F000.nc'),
+                              os.path.join(tile_dir, 'OBS_TILE_F000.nc'),
+                              os.path.join(tile_dir, 'FCST_TILE_F006.nc')])
+    expected_grid = util.create_grid_specification_string('32.0', '-72.0',
+                                                          config.logger,
+                                                          config)
+    assert(expected_grid in commands[os.path.join(tile_dir,
+                                                  'FCST_TILE_F006.nc')])
+    assert(all(" -field 'name=\"TMP\"; level=\"Z2\";'" in cmd
+               for cmd in commands.values()))
@@ -632,6 +632,41 @@ def test_get_lookin_dir():
                                         lists_to_group, config_dict)
     assert(expected_lookin_dir == test_lookin_dir)
 
+def test_get_lookin_dir_cache(tmp_path):
+    # Test that filled lookin directories are reused for runs that
+    # have the same values for the settings used in the template
+    st = stat_analysis_wrapper()
+    st.c_dict['DATE_BEG'] = '20180201'
+    st.c_dict['DATE_END'] = '20180201'
+    st.c_dict['DATE_TYPE'] = 'VALID'
+    for model in ('MODEL_A', 'MODEL_B'):
+        os.makedirs(os.path.join(tmp_path, model, 'stat'))
+
+    lists_to_loop = ['MODEL_LIST', 'FCST_VAR_LIST']
+    lists_to_group = ['FCST_VALID_HOUR_LIST']
+    dir_path = os.path.join(tmp_path, '{model?fmt=%s}', '*')
+    for model, fcst_var in (('MODEL_A', 'TMP'), ('MODEL_A', 'RH'),
+                            ('MODEL_B', 'TMP')):
+        config_dict = {'MODEL': f'"{model}"',
+                       'OBTYPE': '"ANL"',
+                       'FCST_VAR': f'"{fcst_var}"',
+                       'OBS_VAR': f'"{fcst_var}"',
+                       'FCST_VALID_HOUR': '"000000"',
+                       'OBS_VALID_HOUR': '',
+                       }
+        test_lookin_dir = st.get_lookin_dir(dir_path, lists_to_loop,
+                                            lists_to_group, config_dict)
+        assert(test_lookin_dir == os.path.join(tmp_path, model, 'stat'))
+
+    assert(len(st.lookin_dir_cache) == 2)
+    assert(len(st.lookin_glob_cache) == 2)
+
+    # directories are searched again for the next run time
+    st.get_runtime_settings_dict_list = lambda: []
+    st.run_stat_analysis()
+    assert(not st.lookin_dir_cache)
+    assert(not st.lookin_glob_cache)
+
 def test_format_valid_init():
     # Independently test the formatting 
     # of the valid and initialization date and hours
@@ -785,6 +820,56 @@ def test_run_stat_analysis():
     assert(os.path.getsize(expected_filename)
            == os.path.getsize(comparison_filename))
 
+def test_get_stat_analysis_jobs(tmp_path):
+    # Independently test that each job gets its own command,
+    # environment, and output files
+    st = stat_analysis_wrapper()
+    st.c_dict['OUTPUT_BASE_DIR'] = str(tmp_path)
+    runtime_settings_dict_list = []
+    for model in ['MODEL_A', 'MODEL_B']:
+        runtime_settings_dict_list.append({
+            'MODEL': f'"{model}"',
+            'LOOKIN_DIR': f'/path/to/{model}',
+            'DUMP_ROW_FILENAME': f'/path/to/output/{model}.stat',
+        })
+    jobs = st.get_stat_analysis_jobs(runtime_settings_dict_list)
+    assert(len(jobs) == 2)
+    for job, model in zip(jobs, ['MODEL_A', 'MODEL_B']):
+        assert(f' -lookin /path/to/{model} ' in job.cmd)
+        assert(job.env['MODEL'] == f'"{model}"')
+        assert(job.output_files == (f'/path/to/output/{model}.stat',))
+
+def test_get_batched_stat_analysis_jobs(tmp_path):
+    # Independently test that jobs that read the same lookin
+    # directory are combined into one job with the common
+    # filters on the job command line
+    st = stat_analysis_wrapper()
+    st.c_dict['OUTPUT_BASE_DIR'] = str(tmp_path)
+    runtime_settings_dict_list = []
+    for lookin_dir, fcst_lead in [('/path/to/A', '240000'),
+                                  ('/path/to/B', '240000'),
+                                  ('/path/to/A', '480000')]:
+        runtime_settings_dict_list.append({
+            'MODEL': '"MODEL_TEST"',
+            'FCST_LEAD': f'"{fcst_lead}"',
+            'LOOKIN_DIR': lookin_dir,
+            'JOB': f'-job filter -dump_row {fcst_lead}.stat',
+            'DUMP_ROW_FILENAME': f'{lookin_dir}/{fcst_lead}.stat',
+        })
+    jobs = st.get_batched_stat_analysis_jobs(runtime_settings_dict_list)
+    assert(len(jobs) == 2)
+    assert(' -lookin /path/to/A ' in jobs[0].cmd)
+    assert(jobs[0].env['JOB'] ==
+           '-job filter -dump_row 240000.stat -model MODEL_TEST '
+           '-fcst_lead 240000", "'
+           '-job filter -dump_row 480000.stat -model MODEL_TEST '
+           '-fcst_lead 480000')
+    assert(jobs[0].env['MODEL'] == '')
+    assert(jobs[0].env['FCST_LEAD'] == '')
+    assert(jobs[0].output_files == ('/path/to/A/240000.stat',
+                                    '/path/to/A/480000.stat'))
+    assert(' -lookin /path/to/B ' in jobs[1].cmd)
+
 @pytest.mark.parametrize(
     'data_type, config_list, expected_list', [
       ('FCST', '\"0,*,*\"', ["0,*,*"]),
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from metplus.util import met_util as util
+from metplus.util.config import config_metplus
+from metplus.wrappers.tc_pairs_wrapper import TCPairsWrapper
+from metplus.wrappers.tc_pairs_wrapper import REFORMAT_MANIFEST
+from metplus.wrappers.tc_pairs_wrapper import reformat_deck_file
+from metplus.wrappers.tc_pairs_wrapper import deck_glob_to_regex
+from metplus.wrappers.tc_pairs_wrapper import match_deck_files
+
+#@pytest.fixture
+def metplus_config():
+    """! Create a METplus configuration object that can be
+    manipulated/modified to
+         reflect different paths, directories, values, etc. for individual
+         tests.
+    """
+    # Read in the configuration object CONFIG
+    config = config_metplus.setup(util.baseinputconfs)
+    util.get_logger(config)
+    return config
+
+
+def test_reformat_deck_file(tmp_path):
+    """ Verify that the storm month is added to the storm number, the third
+        column is removed, missing values are replaced, and the output file is
+        not rewritten if the input file has not changed."""
+    in_file = tmp_path / 'input' / 'amlq2014123118.gfso.0104'
+    out_file = tmp_path / 'output' / 'amlq2014123118.gfso.0104'
+    in_file.parent.mkdir()
+    in_file.write_text('ML, 0104, 0, 2014123118, 03, GFSO, 000, 541N, 1652W, -99\n'
+                       '\n'
+                       'ML, 0104, -99, 2014123118, 03, GFSO, 006, -99, 1624W, 10\n')
+
+    input_hash, changed = reformat_deck_file(str(in_file), '12',
+                                             ('-99', '-9999'), str(out_file))
+    assert changed
+    assert out_file.read_text() == (
+        'ML, 120104, 2014123118, 03, GFSO, 000, 541N, 1652W, -9999\n'
+        '\n'
+        'ML, 120104, 2014123118, 03, GFSO, 006, -9999, 1624W, 10\n'
+    )
+
+    _, changed = reformat_deck_file(str(in_file), '12', ('-99', '-9999'),
+                                    str(out_file), {'hash': input_hash})
+    assert not changed
+
+
+@pytest.mark.parametrize(
+    'expression, path, is_match', [
+        ('2014/aal14GFSO.dat', '2014/aal14GFSO.dat', True),
+        ('2014/a??14GFSO.dat', '2014/aml14GFSO.dat', True),
+        ('2014/a*GFSO.dat', '2014/aml14GFSO.dat', True),
+        ('*/GFSO/a*.dat', '2014/GFSO/aHWRF.dat', True),
+        ('a*GFSO.dat', '2014/aml14GFSO.dat', False),
+        ('2014/a.l14GFSO.dat', '2014/aml14GFSO.dat', False),
+        ('2014/a??14GFSO.dat', '2014/a/l14GFSO.dat', False),
+        ('2014/a[al]l14GFSO.dat', '2014/aml14GFSO.dat', False),
+        ('2014/a[a-m]l14GFSO.dat', '2014/aml14GFSO.dat', True),
+        ('2014/a[!a]l14GFSO.dat', '2014/aml14GFSO.dat', True),
+        ('2014/a[!m]l14GFSO.dat', '2014/aml14GFSO.dat', False),
+        ('2014[!x]aml14GFSO.dat', '2014/aml14GFSO.dat', False),
+        ('2014/a[]]l.dat', '2014/a]l.dat', True),
+        ('2014/a[!]]l.dat', '2014/aml.dat', True),
+        ('2014/a[^m]l.dat', '2014/a^l.dat', True),
+        ('2014/a[ml.dat', '2014/a[ml.dat', True),
+    ]
+)
+def test_deck_glob_to_regex(expression, path, is_match):
+    """ Verify that wildcards in deck templates match the same files as glob"""
+    match = deck_glob_to_regex(expression).fullmatch(path)
+    assert bool(match) == is_match
+
+
+@pytest.mark.parametrize(
+    'expression, expected_paths', [
+        ('bal142014.dat', ['bal142014.dat']),
+        ('2014/aal14*.dat', ['2014/aal14GFSO.dat', '2014/aal14HWRF.dat']),
+        ('2014/a[a-z]l14GFSO.dat', ['2014/aal14GFSO.dat']),
+        ('*/aal14GFSO.dat', ['2014/aal14GFSO.dat', '2015/aal14GFSO.dat']),
+        ('*/bal*', ['2014/bal14.dat']),
+        ('201[!4]/a*', ['2015/aal14GFSO.dat']),
+        ('2016/aal14GFSO.dat', []),
+        ('2014/GFSO', []),
+    ]
+)
+def test_match_deck_files(expression, expected_paths):
+    """ Verify that only the files in directories that match the directory
+        part of the expression are returned"""
+    dir_files = {
+        '': ['bal142014.dat'],
+        '2014': ['aal14GFSO.dat', 'aal14HWRF.dat', 'bal14.dat'],
+        '2014/GFSO': ['aal14.dat'],
+        '2015': ['aal14GFSO.dat'],
+    }
+    assert match_deck_files(dir_files, expression) == expected_paths
+
+
+def test_write_reformat_manifest_concurrent(tmp_path):
+    """ Verify that entries written by run times that are processed at the
+        same time are all kept in the reformat manifest file"""
+    config = metplus_config()
+    wrapper = TCPairsWrapper(config, config.logger)
+    wrapper.c_dict['REFORMAT_DIR'] = str(tmp_path)
+    wrapper.write_reformat_manifest({'existing': {'hash': 'old'}})
+
+    def write_entries(index):
+        for count in range(10):
+            wrapper.write_reformat_manifest({f'{index}_{count}': {'hash': index}})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_entries, range(4)))
+
+    with open(os.path.join(str(tmp_path), REFORMAT_MANIFEST), 'r') as file_handle:
+        manifest = json.load(file_handle)
+    assert len(manifest) == 41
+    assert manifest['existing'] == {'hash': 'old'}
+    assert manifest['3_9'] == {'hash': 3}
@@ -89,3 +89,28 @@ def test_time_string_to_met_time(time_string, default_unit, met_time):
   assert(time_util.time_string_to_met_time(time_string, default_unit) == met_time)
 
 # write tests for ti_calculate
+
+@pytest.mark.parametrize(
+    'input_dict, valid, lead_string', [
+        ({'init': datetime.datetime(2019, 1, 31, 12), 'lead': 10800},
+         datetime.datetime(2019, 1, 31, 15), '3 hours'),
+        ({'init': datetime.datetime(2019, 1, 31, 12),
+          'lead': relativedelta(months=1)},
+         datetime.datetime(2019, 2, 28, 12), '1 month'),
+        ({'valid': datetime.datetime(2019, 3, 1), 'lead_hours': 6},
+         datetime.datetime(2019, 3, 1), '6 hours'),
+        ({'init': datetime.datetime(2019, 1, 31, 12),
+          'valid': datetime.datetime(2019, 2, 1),
+          'loop_by': 'init', 'lead_minutes': 90},
+         datetime.datetime(2019, 1, 31, 13, 30), '1 hour 30 minutes'),
+    ]
+)
+def test_ti_calculate(input_dict, valid, lead_string):
+    time_info = time_util.ti_calculate(dict(input_dict))
+    assert(time_info['valid'] == valid)
+    assert(time_info['valid_fmt'] == valid.strftime('%Y%m%d%H%M%S'))
+    assert(time_info['lead_string'] == lead_string)
+
+    # a new dictionary is returned each time so it can be modified
+    time_info['custom'] = 'modified'
+    assert('custom' not in time_util.ti_calculate(dict(input_dict)))
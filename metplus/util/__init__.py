@@ -1,7 +1,35 @@
+from importlib import import_module
+
 from .metplus_check import *
 from .time_util import *
 from .met_util import *
 from .config.config_launcher import *
 from .config.config_metplus import *
 from .config.string_template_substitution import *
-from .feature_util import *
+
+# modules that import large packages (feature_util imports netCDF4 and numpy)
+# are only imported when one of their attributes is accessed
+lazy_modules = [
+    'feature_util',
+]
+
+def __getattr__(attribute_name):
+    """!Import the modules in lazy_modules the first time an attribute that
+        they provide is accessed.
+        Args:
+            @param attribute_name name of the module or attribute to get
+            @returns module or attribute that was imported
+    """
+    if not attribute_name.startswith('_'):
+        for module_name in lazy_modules:
+            module = import_module(f"{__name__}.{module_name}")
+            if attribute_name == module_name:
+                return module
+
+            if hasattr(module, attribute_name):
+                attribute = getattr(module, attribute_name)
+                globals()[attribute_name] = attribute
+                return attribute
+
+    raise AttributeError(f"module {__name__!r} has no attribute "
+                         f"{attribute_name!r}")
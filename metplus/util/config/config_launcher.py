@@ -18,6 +18,8 @@ import datetime
 import shutil
 from os.path import dirname, realpath
 import inspect
+import threading
+from contextlib import contextmanager
 from configparser import ConfigParser, NoOptionError
 from pathlib import Path
 
@@ -416,6 +418,26 @@ class METplusConfig(ProdConfig):
         # set interpolation to None so you can supply filename template
         # that contain % to config.set
         conf = ConfigParser(strict=False, inline_comment_prefixes=(';',), interpolation=None) if (conf is None) else conf
+
+        # values returned by getraw keyed by section, option, and default
+        # with the names of the options that were used to resolve them
+        self._raw_cache = {}
+
+        # incremented each time the config is modified. The generation is
+        # saved when each option is changed and when the config is read, so
+        # values read from the config can be checked to see if they are stale
+        self._generation = 0
+        self._option_generations = {}
+        self._reload_generation = 0
+
+        # names of options that are read while track_option_names is used.
+        # Stored per thread so threads that read the config at the same time
+        # do not record the options read by each other
+        self._tracking = threading.local()
+
+        # values saved by get_cached with the options used to read them
+        self._cached_values = {}
+
         super().__init__(conf)
         self._cycle = None
         self._logger = logging.getLogger('metplus')
@@ -439,6 +461,27 @@ class METplusConfig(ProdConfig):
                 return logging.getLogger('metplus.'+sublog)
         return self._logger
 
+    def copy(self):
+        """!Create a new METplusConfig that contains the same sections and
+            options. Changes made to the copy, i.e. the current field info
+            that wrappers set while they run, do not affect this object.
+            @returns new METplusConfig object
+        """
+        config_copy = METplusConfig()
+        with self:
+            for section in self._conf.sections():
+                if not config_copy._conf.has_section(section):
+                    config_copy._conf.add_section(section)
+                for key, value in self._conf.items(section, raw=True):
+                    config_copy._conf.set(section, key, value)
+
+        config_copy._cycle = self._cycle
+        config_copy._logger = self._logger
+        config_copy.logger = self.logger
+        config_copy.env = self.env.copy()
+        config_copy.clear_raw_cache()
+        return config_copy
+
     def sanity_check(self):
         """!Runs nearly all sanity checks.
 
@@ -447,12 +490,159 @@ class METplusConfig(ProdConfig):
         throw a wide variety of exceptions if sanity checks fail."""
         logger = self.log('sanity.checker')
 
+    @property
+    def generation(self):
+        """!Number of times the config has been modified. Can be passed to
+            is_modified_since to check if values read from the config are
+            out of date.
+        """
+        return self._generation
+
+    def is_modified_since(self, generation, option_names):
+        """!Check if any of the options have changed since the config had
+            the given generation
+            Args:
+                @param generation value of generation when the options were read
+                @param option_names names of the options to check
+                @returns True if any of the options were changed or the config
+                 was read again since generation, False otherwise
+        """
+        if self._reload_generation > generation:
+            return True
+
+        return any(self._option_generations.get(option_name, 0) > generation
+                   for option_name in option_names)
+
+    @contextmanager
+    def track_option_names(self):
+        """!Collect the names of the options that are read from the config
+            while the context is active. Values that are read through getraw
+            include the names of the options that they reference.
+            @returns set of option names that is filled in as options are read
+        """
+        option_names = set()
+        previous_names = getattr(self._tracking, 'names', None)
+        self._tracking.names = option_names
+        try:
+            yield option_names
+        finally:
+            self._tracking.names = previous_names
+            if previous_names is not None:
+                previous_names.update(option_names)
+
+    def get_cached(self, key, read_function, check_section=None):
+        """!Get a value that is computed from config variables. The value is
+            saved and returned on later calls until any of the options that
+            were read to compute it are modified.
+            Args:
+                @param key hashable object used to identify the value
+                @param read_function function with no arguments that reads
+                 the config and returns the value
+                @param check_section optional section name. If set, the value
+                 is also computed again if an option is added to the section.
+                 Use if read_function searches the option names of a section
+                @returns value returned by read_function
+        """
+        num_options = len(self.keys(check_section)) if check_section else 0
+        cached_value = self._cached_values.get(key)
+        if cached_value is not None:
+            generation, option_names, saved_num_options, value = cached_value
+            if (num_options == saved_num_options and
+                    not self.is_modified_since(generation, option_names)):
+                self._track_option_names(*option_names)
+                return value
+
+        generation = self.generation
+        with self.track_option_names() as option_names:
+            value = read_function()
+
+        if check_section:
+            num_options = len(self.keys(check_section))
+        with self:
+            self._cached_values[key] = (generation, frozenset(option_names),
+                                        num_options, value)
+        return value
+
+    def _track_option_names(self, *option_names):
+        tracked_names = getattr(self._tracking, 'names', None)
+        if tracked_names is not None:
+            tracked_names.update(self._conf.optionxform(str(name))
+                                 for name in option_names)
+
+    def clear_raw_cache(self):
+        """!Remove all values that were saved by getraw. Called when the
+            config is modified in a way that may change any option.
+        """
+        with self:
+            self._raw_cache = {}
+            self._generation += 1
+            self._reload_generation = self._generation
+
+    def _option_modified(self, key):
+        """!Remove values saved by getraw that used an option that changed
+            Args:
+                @param key name of the option that changed
+        """
+        option_name = self._conf.optionxform(str(key))
+        with self:
+            self._generation += 1
+            self._option_generations[option_name] = self._generation
+            self._raw_cache = {cache_key: cache_value
+                               for cache_key, cache_value in self._raw_cache.items()
+                               if option_name not in cache_value[1]}
+
+    # override methods that modify the config to clear the getraw cache
+    def set(self, section, key, value):
+        # values read from the config are still valid if value is the same
+        if (self._conf.has_option(str(section), str(key)) and
+                self._conf.get(str(section), str(key), raw=True) == str(value)):
+            return
+
+        super().set(section, key, value)
+        self._option_modified(key)
+
+    def set_options(self, section, **kwargs):
+        super().set_options(section, **kwargs)
+        for key in kwargs:
+            self._option_modified(key)
+
+    def set_time_vars(self):
+        super().set_time_vars()
+        self.clear_raw_cache()
+
+    def add_section(self, sec):
+        super().add_section(sec)
+        self.clear_raw_cache()
+        return self
+
+    def read(self, source):
+        super().read(source)
+        self.clear_raw_cache()
+        return self
+
+    def readfp(self, source):
+        super().readfp(source)
+        self.clear_raw_cache()
+        return self
+
+    def readstr(self, string):
+        super().readstr(string)
+        self.clear_raw_cache()
+        return self
+
+    def has_option(self, sec, opt):
+        self._track_option_names(opt)
+        return super().has_option(sec, opt)
+
     # override get methods to perform additional error checking
     def getraw(self, sec, opt, default='', count=0):
         """ parse parameter and replace any existing parameters
             referenced with the value (looking in same section, then
             config, dir, and os environment)
             returns raw string, preserving {valid?fmt=%Y} blocks
+            The value is saved and returned on later calls until one of the
+            options used to resolve it is modified unless it references an
+            environment variable
             Args:
                 @param sec: Section in the conf file to look for variable
                 @param opt: Variable to interpret
@@ -461,13 +651,53 @@ class METplusConfig(ProdConfig):
             Returns:
                 Raw string or empty string if function calls itself too many times
         """
+        if count or not isinstance(default, (str, type(None))):
+            value, _, option_names = self._resolve_raw(sec, opt, default,
+                                                       count)
+            self._track_option_names(*option_names)
+            return value
+
+        cache_key = (sec, opt, default)
+        cache_value = self._raw_cache.get(cache_key)
+        if cache_value is not None:
+            self._track_option_names(*cache_value[1])
+            return cache_value[0]
+
+        generation = self._generation
+        value, uses_env, option_names = self._resolve_raw(sec, opt, default,
+                                                          count)
+        self._track_option_names(*option_names)
+
+        # do not save value if config was modified while resolving it
+        if not uses_env:
+            with self:
+                if generation == self._generation:
+                    self._raw_cache[cache_key] = (value, option_names)
+
+        return value
+
+    def _resolve_raw(self, sec, opt, default, count):
+        """!Replace parameters referenced in a config value. Called by getraw.
+            Args:
+                @param sec: Section in the conf file to look for variable
+                @param opt: Variable to interpret
+                @param default: Default value to use if config is not set
+                @param count: Counter used to stop recursion to prevent infinite
+            Returns:
+                Tuple of raw string (or empty string if function calls itself
+                too many times), True if an environment variable was
+                referenced (False if not), and a frozenset of the names of
+                the options that were used
+        """
         count = count + 1
+        option_names = {self._conf.optionxform(str(opt))}
         if count >= 10:
-            return ''
+            return '', False, frozenset(option_names)
 
         in_template = super().getraw(sec, opt, default)
         out_template = ""
         in_brackets = False
+        uses_env = False
         for index, character in enumerate(in_template):
             if character == "{":
                 in_brackets = True
@@ -475,17 +705,22 @@ class METplusConfig(ProdConfig):
             elif character == "}":
                 var_name = in_template[start_idx+1:index]
                 var = None
-                if self.has_option(sec, var_name):
-                    var = self.getraw(sec, var_name, default, count)
-                elif self.has_option('config', var_name):
-                    var = self.getraw('config', var_name, default, count)
-                elif self.has_option('dir', var_name):
-                    var = self.getraw('dir', var_name, default, count)
-                elif self.has_option('filename_templates', var_name):
-                    var = self.getraw('filename_templates', var_name, default, count)
+                var_uses_env = False
+                var_option_names = {self._conf.optionxform(var_name)}
+                if self._conf.has_option(sec, var_name):
+                    var, var_uses_env, var_option_names = self._resolve_raw(sec, var_name, default, count)
+                elif self._conf.has_option('config', var_name):
+                    var, var_uses_env, var_option_names = self._resolve_raw('config', var_name, default, count)
+                elif self._conf.has_option('dir', var_name):
+                    var, var_uses_env, var_option_names = self._resolve_raw('dir', var_name, default, count)
+                elif self._conf.has_option('filename_templates', var_name):
+                    var, var_uses_env, var_option_names = self._resolve_raw('filename_templates', var_name, default, count)
                 elif var_name[0:3] == "ENV":
                     var = os.environ.get(var_name[4:-1])
+                    var_uses_env = True
 
+                uses_env = uses_env or var_uses_env
+                option_names.update(var_option_names)
                 if var is None:
                     out_template += in_template[start_idx:index+1]
                 else:
@@ -495,7 +730,7 @@ class METplusConfig(ProdConfig):
                 out_template += character
 
         # replace double slash in path to single slash
-        return out_template.replace('//', '/')
+        return out_template.replace('//', '/'), uses_env, frozenset(option_names)
 
     def check_default(self, sec, name, default):
         """!helper function for get methods, report error and raise NoOptionError if
@@ -582,6 +817,7 @@ class METplusConfig(ProdConfig):
             Replace double forward slash with single to prevent error that occurs if that
             is found inside a MET config file (because it considers // the start of a comment
         """
+        self._track_option_names(name)
         try:
             return super().getstr(sec, name, default=None, badtypeok=badtypeok, morevars=morevars,
                                   taskvars=taskvars).replace('//', '/')
@@ -598,6 +834,7 @@ class METplusConfig(ProdConfig):
              If no default was specified in the call, the NoOptionError is raised again.
              @returns None if value is not a boolean (or yes/no), value if set, default if not set
          """
+        self._track_option_names(name)
         try:
             return super().getbool(sec, name, default=None, badtypeok=badtypeok, morevars=morevars, taskvars=taskvars)
         except NoOptionError:
@@ -620,6 +857,7 @@ class METplusConfig(ProdConfig):
         """!Wraps produtil getint to gracefully report if variable is not set
             and no default value is specified
             @returns Value if set, default of missing value if not set, None if value is an incorrect type"""
+        self._track_option_names(name)
         try:
             # call ProdConfig function with no default set so we can log and set the default
             return super().getint(sec, name, default=None, badtypeok=badtypeok, morevars=morevars, taskvars=taskvars)
@@ -646,6 +884,7 @@ class METplusConfig(ProdConfig):
         """!Wraps produtil getint to gracefully report if variable is not set
             and no default value is specified
             @returns Value if set, default of missing value if not set, None if value is an incorrect type"""
+        self._track_option_names(name)
         try:
             # call ProdConfig function with no default set so we can log and set the default
             return super().getfloat(sec, name, default=None, badtypeok=badtypeok, morevars=morevars, taskvars=taskvars)
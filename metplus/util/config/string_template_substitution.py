@@ -14,6 +14,7 @@ Condition codes: Varies
 
 import re
 import datetime
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
 
 from .. import time_util
@@ -45,16 +46,13 @@ LENGTH_DICT = {'Y': 4,
                'b': 3,
                }
 
+# maximum number of compiled templates to keep in memory
+TEMPLATE_CACHE_SIZE = 1024
 
-def multiple_replace(replace_dict, text):
-    """Helper function for do_string_sub. Replace in 'text' all occurrences of any key in the
-    given dictionary by its corresponding value.  Returns the new string. """
+TEMPLATE_TAG_REGEX = re.compile(r'\{(.+?)\}')
 
-    # Create a regular expression  from the dictionary keys
-    regex = re.compile("(%s)" % "|".join(map(re.escape, replace_dict.keys())))
+TIME_ITEM_UNITS = ('H', 'M', 'S', 's', 'd')
 
-    # For each match, look-up corresponding value in dictionary
-    return regex.sub(lambda mo: replace_dict[mo.string[mo.start():mo.end()]], text)
 
 def get_tags(template):
     """!Parse template and pull out all wildcard characters (* or ?) and all
@@ -79,6 +77,35 @@ def get_tags(template):
         i += 1
     return tags
 
+def get_time_item_format(item, unit):
+    """!Helper function for format_one_time_item. Determine precision of
+        time offset value and the text that follows the unit
+        Args:
+         @param item format to substitute, i.e. 3M or H
+         @param unit currently being processed, i.e. M or H or S
+        @returns tuple of padding and trailing text or None if unit is not
+         found in item
+    """
+    count = item.count(unit)
+    if count == 0:
+        return None
+
+    rest = ''
+    # get precision from number (%3H)
+    res = re.match(r"^\.*(\d+)"+unit+"(.*)", item)
+    if res:
+        padding = int(res.group(1))
+        rest = res.group(2)
+    else:
+        padding = count
+        res = re.match("^"+unit+"+(.*)", item)
+        if res:
+            rest = res.group(1)
+            if unit != 's':
+                padding = max(2, count)
+
+    return padding, rest
+
 def format_one_time_item(item, time_str, unit):
     """!Helper function for do_string_sub. Determine precision of time offset value and format
         Args:
@@ -87,27 +114,36 @@ def format_one_time_item(item, time_str, unit):
          @param unit currently being processed, i.e. M or H or S
         Returns: Padded value or empty string if unit is not found in item
     """
-    count = item.count(unit)
-    if count > 0:
-        rest = ''
-        # get precision from number (%3H)
-        res = re.match(r"^\.*(\d+)"+unit+"(.*)", item)
-        if res:
-            padding = int(res.group(1))
-            rest = res.group(2)
-        else:
-            padding = count
-            res = re.match("^"+unit+"+(.*)", item)
-            if res:
-                rest = res.group(1)
-                if unit != 's':
-                    padding = max(2, count)
+    item_format = get_time_item_format(item, unit)
+    if item_format is None:
+        # return empty string if no match
+        return ''
+
+    # add formatted time
+    padding, rest = item_format
+    return str(time_str).zfill(padding)+rest
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_hms_format_items(fmt):
+    """!Parse time offset format once so it can be applied to many values.
+        Args:
+            @param fmt format to substitute, i.e. %3H or %2M or %S
+        @returns tuple containing a tuple of the units that are specified
+         (any of d, H, or M) and a tuple of (unit, padding, rest) items in
+         the order they should be written
+    """
+    fmt_split = fmt.split('%')[1:]
+    units = tuple(unit for unit in ('d', 'H', 'M')
+                  if True in [unit in x for x in fmt_split])
 
-        # add formatted time
-        return str(time_str).zfill(padding)+rest
+    items = []
+    for item in fmt_split:
+        for unit in TIME_ITEM_UNITS:
+            item_format = get_time_item_format(item, unit)
+            if item_format is not None:
+                items.append((unit, *item_format))
 
-    # return empty string if no match
-    return ''
+    return units, tuple(items)
 
 def format_hms(fmt, obj):
     """!Helper function for do_string_sub. For time offset values, get hour, minute, and
@@ -117,40 +153,36 @@ def format_hms(fmt, obj):
             @param obj time value in seconds to format, i.e. 3600
         Returns: Formatted time value
     """
-    out_str = ''
-    fmt_split = fmt.split('%')[1:]
+    units, items = get_hms_format_items(fmt)
+
     # split time into days, hours, mins, and secs
     # time should be relative to the next highest unit if higher units are specified
     # i.e. 90 minutes %M => 90, but %H%M => 0130
-    days = obj // 86400
-    hours = obj // 3600
-    minutes = obj  // 60
-    seconds = obj
+    values = {'d': obj // 86400,
+              'H': obj // 3600,
+              'M': obj // 60,
+              'S': obj,
+              's': obj,
+              }
 
     # if days are specified, change hours, minutes, and seconds to relative
-    if True in ['d' in x for x in fmt_split]:
-        hours = (obj % 86400) // 3600
-        minutes = (obj % 3600) // 60
-        seconds = (obj % 3600) % 60
+    if 'd' in units:
+        values['H'] = (obj % 86400) // 3600
+        values['M'] = (obj % 3600) // 60
+        values['S'] = (obj % 3600) % 60
 
     # if hours are specified, change minutes and seconds to relative
-    if True in ['H' in x for x in fmt_split]:
-        minutes = (obj % 3600) // 60
-        seconds = (obj % 3600) % 60
+    if 'H' in units:
+        values['M'] = (obj % 3600) // 60
+        values['S'] = (obj % 3600) % 60
 
     # if minutes are specified, change seconds to relative
-    if True in ['M' in x for x in fmt_split]:
-        seconds = (obj % 3600) % 60
+    if 'M' in units:
+        values['S'] = (obj % 3600) % 60
 
     # parse format
-    for item in fmt_split:
-        out_str += format_one_time_item(item, hours, 'H')
-        out_str += format_one_time_item(item, minutes, 'M')
-        out_str += format_one_time_item(item, seconds, 'S')
-        out_str += format_one_time_item(item, obj, 's')
-        out_str += format_one_time_item(item, days, 'd')
-
-    return out_str
+    return ''.join([str(values[unit]).zfill(padding)+rest
+                    for unit, padding, rest in items])
 
 def set_output_dict_from_time_info(time_dict, output_dict, key):
     """!Create datetime object from time data,
@@ -244,34 +276,118 @@ def round_time_down(obj, truncate_seconds):
                                        -obj.microsecond)
     return new_obj
 
-def handle_format_delimiter(split_string, idx, shift_seconds, truncate_seconds, kwargs):
-    """!Check for formatting/length request by splitting on
-        FORMATTING_VALUE_DELIMITER
-        split_string[1]
-        Args:
-            @param split_string holds the formatting/length
-              information (e.g. "fmt=%Y%m%d", "len=3")
-            @param idx index in split_string of the format item
-        Returns: Formatted string
+def get_static_seconds_from_template(split_string, element_name):
+    """!Get seconds value from tag that contains a shift or truncate item if
+        the value does not depend on the time being substituted. Intervals
+        of months or years require a time to compute the number of seconds.
+         Args:
+             @param split_string list of key/value from string sub tag to
+              evalute, i.e. shift=-1H
+             @param element_name information to extract, i.e. shift or
+              truncate
+             @returns tuple of a boolean that is True if the value could be
+              computed and the integer number of seconds (or None if the
+              item could not be parsed)
+    """
+    for split_item in split_string:
+        if not split_item.startswith(element_name):
+            continue
+
+        shift_split_string = split_item.split(FORMATTING_VALUE_DELIMITER)
+        if len(shift_split_string) != 2:
+            return True, None
+
+        rd_obj = time_util.get_relativedelta(shift_split_string[1],
+                                             default_unit='S')
+        seconds = time_util.ti_get_seconds_from_relativedelta(rd_obj)
+        if seconds is None:
+            return False, None
+
+        return True, seconds
+
+    # if not found, return 0
+    return True, 0
+
+class TemplateTag:
+    """!Tag from a filename template, i.e. {init?fmt=%Y%m%d?shift=-1H}, that
+        has been split into its key and formatting items so that it can be
+        filled in many times without parsing the tag again
     """
-    format_split_string = \
-        split_string[idx].split(FORMATTING_VALUE_DELIMITER)
+    def __init__(self, tag):
+        self.text = TEMPLATE_IDENTIFIER_BEGIN + tag + TEMPLATE_IDENTIFIER_END
+        self.split_string = tag.split(FORMATTING_DELIMITER)
+
+        # split_string[0] holds the key (e.g. "init", "valid", etc)
+        self.key = self.split_string[0]
+
+        self.shift_is_static, self.shift_seconds = (
+            get_static_seconds_from_template(self.split_string, SHIFT_STRING)
+        )
+        self.truncate_is_static, self.truncate_seconds = (
+            get_static_seconds_from_template(self.split_string,
+                                             TRUNCATE_STRING)
+        )
+
+        # format items are applied in order, so the last one is used
+        # fmt is None if the item starts with fmt but is not a format item
+        self.formatted = False
+        self.fmt = None
+        for split_item in self.split_string:
+            if not split_item.startswith(FORMAT_STRING):
+                continue
+
+            self.formatted = True
+            format_split_string = split_item.split(FORMATTING_VALUE_DELIMITER)
+            if format_split_string[0] == FORMAT_STRING:
+                self.fmt = format_split_string[1]
+            else:
+                self.fmt = None
+
+    def get_shift_seconds(self, kwargs):
+        if self.shift_is_static:
+            return self.shift_seconds
+
+        return get_seconds_from_template(self.split_string,
+                                         SHIFT_STRING,
+                                         kwargs)
+
+    def get_truncate_seconds(self, kwargs):
+        if self.truncate_is_static:
+            return self.truncate_seconds
+
+        return get_seconds_from_template(self.split_string,
+                                         TRUNCATE_STRING,
+                                         kwargs)
+
+    def substitute(self, kwargs):
+        """!Get the value to replace the tag with
+            Args:
+                @param kwargs dictionary containing values for each key
+                @returns formatted string
+        """
+        obj = kwargs.get(self.key, None)
+
+        # No formatting or length is requested
+        if not self.formatted:
+            if isinstance(obj, int):
+                return f"{obj}S"
+            if obj is None:
+                return ''
+            return obj
 
-    # Check for requested FORMAT_STRING
-    # format_split_string[0] holds the formatting/length
-    # value delimiter (e.g. "fmt", "len")
-    if format_split_string[0] == FORMAT_STRING:
-        obj = kwargs.get(split_string[0], None)
+        if self.fmt is None:
+            return ''
 
-        fmt = format_split_string[idx]
         # if input is datetime object, format appropriately
         if isinstance(obj, datetime.datetime):
             # shift date time if set
-            obj = obj + datetime.timedelta(seconds=shift_seconds)
+            obj = obj + datetime.timedelta(
+                seconds=self.get_shift_seconds(kwargs)
+            )
 
             # truncate date time if set
-            obj = round_time_down(obj, truncate_seconds)
-            return obj.strftime(fmt)
+            obj = round_time_down(obj, self.get_truncate_seconds(kwargs))
+            return obj.strftime(self.fmt)
 
         # if input is relativedelta
         if isinstance(obj, relativedelta):
@@ -279,21 +395,78 @@ def handle_format_delimiter(split_string, idx, shift_seconds, truncate_seconds,
             if seconds is None:
                 raise TypeError('Year and month intervals not yet supported in string substitution')
 
-            return format_hms(fmt, seconds)
+            return format_hms(self.fmt, seconds)
 
         # if input is integer, format with H, M, and S
         if isinstance(obj, int):
-            obj += shift_seconds
-            return format_hms(fmt, obj)
+            obj += self.get_shift_seconds(kwargs)
+            return format_hms(self.fmt, obj)
 
         # if string, format if possible
         if isinstance(obj, str):
-            return '{}'.format(obj)
+            return obj
 
         raise TypeError('Could not format item {} with format {} in {}'
-                        .format(obj, fmt, split_string))
+                        .format(obj, self.fmt, self.split_string))
 
-    return None
+class CompiledTemplate:
+    """!Filename template that has been split into literal text and tags
+        once so that it can be filled in many times. Use compile_template
+        to get an instance so that compiled templates are reused.
+    """
+    def __init__(self, tmpl):
+        self.template = tmpl
+
+        # list of literal strings and TemplateTag objects in template order
+        self.items = []
+        start = 0
+        for match in TEMPLATE_TAG_REGEX.finditer(tmpl):
+            if match.start() > start:
+                self.items.append(tmpl[start:match.start()])
+            self.items.append(TemplateTag(match.group(1)))
+            start = match.end()
+
+        if start < len(tmpl):
+            self.items.append(tmpl[start:])
+
+    def substitute(self, kwargs, skip_missing_tags=False):
+        """!Replace tags in template with formatted values
+            Args:
+                @param kwargs dictionary containing values for each key
+                @param skip_missing_tags if True, leave tag in the output if
+                 its key was not found in kwargs. If False, raise TypeError
+                @returns filled in template
+        """
+        out_list = []
+        for item in self.items:
+            if isinstance(item, str):
+                out_list.append(item)
+                continue
+
+            if item.key not in kwargs:
+                # if skip_missing_tags is True, leave template tag if key was not found
+                if skip_missing_tags:
+                    out_list.append(item.text)
+                    continue
+
+                # otherwise log and exit
+                raise TypeError("The key " + item.key +
+                                " was not passed to do_string_sub " +
+                                " for template: " + self.template)
+
+            out_list.append(item.substitute(kwargs))
+
+        return ''.join(out_list)
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(tmpl):
+    """!Parse filename template into a CompiledTemplate. Results are cached
+        so a template that is filled in for many times is only parsed once.
+        Args:
+            @param tmpl filename template, i.e. {init?fmt=%Y%m%d}/file.nc
+            @returns CompiledTemplate object
+    """
+    return CompiledTemplate(tmpl)
 
 def do_string_sub(tmpl, skip_missing_tags=False, **kwargs):
     """
@@ -368,98 +541,11 @@ def do_string_sub(tmpl, skip_missing_tags=False, **kwargs):
                      of the track data, such as experiment name or some other descriptor
     """
 
-    # The . matches any single character except newline, and the
-    # following + matches 1 or more occurrence of preceding expression.
-    # The ? after the .+ makes it a lazy match so that it stops
-    # after the first "}" instead of continuing to match as many
-    # characters as possible
-
-    # findall searches through the string and finds all non-overlapping
-    # matches and returns the group
-    # match_list is a list with the contents being the data between the
-    # curly braces
-    match_list = re.findall(r'\{(.+?)\}', tmpl)
-
-    # finditer gets the start and end indices
-    # Iterate over each match to get the starting and ending indices
-    matches = re.finditer(r'\{(.+?)\}', tmpl)
-    match_start_end_list = []
-    for match in matches:
-        match_start_end_list.append((match.start(), match.end()))
-
-    if len(match_list) == 0:
+    # templates without tags do not need to be parsed
+    if TEMPLATE_IDENTIFIER_BEGIN not in tmpl:
         return tmpl
 
-    if len(match_list) != len(match_start_end_list):
-        # Log and exit
-        raise TypeError("match_list and match_start_end_list should " +
-                        "have the same length for template: " +
-                        tmpl)
-
-    return find_and_replace_tags_in_template(match_list, tmpl, kwargs, skip_missing_tags)
-
-def find_and_replace_tags_in_template(match_list, tmpl, kwargs, skip_missing_tags=False):
-    """! Loop through tags from template and replace them with the correct time values
-         @param match_list list of tags to process
-         @param template filename template to substitute values into
-         @param kwargs all
-
-    """
-    # A dictionary that will contain the string to replace (key)
-    # and the string to replace it with (value)
-    replacement_dict = {}
-    # Search for the FORMATTING_DELIMITER within the first string
-    for match in match_list:
-
-        string_to_replace = TEMPLATE_IDENTIFIER_BEGIN + match + \
-                            TEMPLATE_IDENTIFIER_END
-        split_string = match.split(FORMATTING_DELIMITER)
-
-        # valid, init, lead, etc.
-        # print split_string[0]
-        # value e.g. 2016012606, 3
-
-        # split_string[0] holds the key (e.g. "init", "valid", etc)
-        if split_string[0] not in kwargs.keys():
-            # if skip_missing_tags is True, leave template tag if key was not found
-            if skip_missing_tags:
-                continue
-
-            # otherwise log and exit
-            raise TypeError("The key " + split_string[0] +
-                            " was not passed to do_string_sub " +
-                            " for template: " + tmpl)
-
-        # if shift is set, get that value before handling formatting
-        shift_seconds = get_seconds_from_template(split_string, SHIFT_STRING, kwargs)
-
-        # if truncate is set, get that value before handling formatting
-        truncate_seconds = get_seconds_from_template(split_string, TRUNCATE_STRING, kwargs)
-
-        # format times appropriately and add to replacement_dict
-        formatted = False
-        for idx, split_item in enumerate(split_string):
-            if split_item.startswith(FORMAT_STRING):
-                replacement_dict[string_to_replace] = \
-                    handle_format_delimiter(split_string,
-                                            idx,
-                                            shift_seconds,
-                                            truncate_seconds,
-                                            kwargs)
-                formatted = True
-
-        # No formatting or length is requested
-        if not formatted:
-            # Add back the template identifiers to the matched
-            # string to replace and add the key, value pair to the
-            # dictionary
-            value = kwargs.get(split_string[0], None)
-            if isinstance(value, int):
-                value = f"{value}S"
-            replacement_dict[string_to_replace] = value
-
-    # Replace regex with properly formatted information
-    return multiple_replace(replacement_dict, tmpl)
+    return compile_template(tmpl).substitute(kwargs, skip_missing_tags)
 
 def parse_template(template, filepath, logger=None):
     """!Extract time information from path using the filename template
@@ -467,11 +553,63 @@ def parse_template(template, filepath, logger=None):
              @param template filename template to use to extract time information
              @param filepath path to examine
              @returns time_info dictionary with time information if successful, None if not"""
+    template_regex = compile_template_regex(template)
+
+    # use character by character parsing if template could not be compiled
+    if template_regex is None:
+        match_dict, valid_shift = populate_match_dict(template,
+                                                      filepath,
+                                                      logger)
+    else:
+        match_dict, valid_shift = template_regex.match(filepath)
 
-    match_dict, valid_shift = populate_match_dict(template, filepath, logger)
     if match_dict is None:
         return None
 
+    return get_time_info_from_match_dict(match_dict, valid_shift, filepath,
+                                         logger)
+
+def parse_many(template, filepaths, logger=None):
+    """!Extract time information from many paths using the same filename
+        template. The template is compiled into a regular expression once.
+         Args:
+             @param template filename template to use to extract time information
+             @param filepaths list of paths to examine
+             @param logger optional logger to output debug information
+             @returns list of time_info dictionaries in the same order as
+              filepaths. Items are None if time info could not be extracted
+    """
+    template_regex = compile_template_regex(template)
+    if template_regex is None:
+        return [parse_template(template, filepath, logger)
+                for filepath in filepaths]
+
+    time_info_list = []
+    for filepath in filepaths:
+        match_dict, valid_shift = template_regex.match(filepath)
+        if match_dict is None:
+            time_info_list.append(None)
+            continue
+
+        time_info_list.append(
+            get_time_info_from_match_dict(match_dict, valid_shift, filepath,
+                                          logger)
+        )
+
+    return time_info_list
+
+def get_time_info_from_match_dict(match_dict, valid_shift, filepath,
+                                  logger=None):
+    """!Combine time values extracted from a file path into a time_info
+        dictionary
+         Args:
+             @param match_dict dictionary of values extracted from filepath,
+              i.e. {'init+Y': '2019'}
+             @param valid_shift number of seconds to shift the valid time
+             @param filepath path that the values were extracted from. Used
+              for logging
+             @param logger optional logger to output debug information
+             @returns time_info dictionary with time information if successful, None if not"""
     # combine common items and get datetime
     output_dict = populate_output_dict(match_dict, valid_shift)
 
@@ -488,6 +626,169 @@ def parse_template(template, filepath, logger=None):
 
     return time_info
 
+class TemplateRegex:
+    """!Filename template converted to a regular expression that extracts
+        the same information as populate_match_dict. Each time value in the
+        template is a named group in the expression. Use
+        compile_template_regex to get an instance so that compiled templates
+        are reused.
+    """
+    def __init__(self, pattern, group_keys, valid_shift):
+        self.regex = re.compile(pattern, re.DOTALL)
+
+        # list of tuples containing group name and match dictionary key,
+        # i.e. ('g0', 'init+Y'), in the order they appear in the template
+        self.group_keys = group_keys
+        self.valid_shift = valid_shift
+
+    def match(self, filepath):
+        """!Extract time information from a file path
+             Args:
+                 @param filepath path to examine
+                 @returns tuple of match dictionary and valid shift value if
+                  success or (None, None) if path does not match template
+        """
+        match = self.regex.match(filepath)
+        if not match:
+            return None, None
+
+        # items that are found more than once must have the same value
+        match_dict = {}
+        for group_name, key in self.group_keys:
+            value = match.group(group_name)
+            if not add_to_dict(key, match_dict, value, len(value)):
+                return None, None
+
+        return match_dict, self.valid_shift
+
+def get_fmt_regex(fmt, identifier, group_keys, end_pattern):
+    """!Helper function for compile_template_regex. Convert format
+        information from tag to a regular expression that matches the same
+        text as get_fmt_info.
+        Args:
+            @param fmt formatting values from template tag, i.e. %Y%m%d
+            @param identifier tag name, i.e. 'init' or 'lead'
+            @param group_keys list to append tuples of group name and match
+             dictionary key for each time value
+            @param end_pattern regular expression that matches the end of
+             the text that can be parsed. Used to stop reading lead or level
+             hours that do not have a fixed width
+            @returns regular expression string or None if format cannot be
+             parsed
+    """
+    pattern = ''
+    for match in re.findall(r'%\.?(\d*)([^%]+)', fmt):
+        time_letter = match[1][0]
+        time_number = match[0]
+
+        if time_letter not in LENGTH_DICT.keys():
+            return None
+
+        new_len = LENGTH_DICT.get(time_letter)
+
+        match_len = re.match(r'([' + time_letter + ']+)(.*)', match[1])
+        if not match_len:
+            return None
+
+        time_letter_count = len(match_len.group(1))
+        extra_len = len(match_len.group(2))
+        if time_letter_count > 1:
+            if time_number:
+                return None
+
+            new_len = time_letter_count
+
+        elif time_number and int(time_number) != new_len:
+            new_len = int(time_number)
+
+        group_name = f'g{len(group_keys)}'
+        group_keys.append((group_name, identifier + '+' + time_letter))
+
+        # lead or level hours are read until a non-digit is found
+        if match[1] == 'H' and identifier in ('lead', 'level'):
+            digits = f'[0-9]+(?=[^0-9]|{end_pattern})'
+        else:
+            digits = f'[0-9]{{{new_len}}}'
+
+        pattern += f'(?P<{group_name}>{digits})'
+
+        # extra characters after the format letters are skipped
+        if extra_len:
+            pattern += f'.{{{extra_len}}}'
+
+    return pattern
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template_regex(template):
+    """!Convert a filename template into a TemplateRegex so many file paths
+        can be parsed with a single regular expression match each. Results
+        are cached.
+         Args:
+             @param template filename template, i.e.
+              {init?fmt=%Y%m%d%H}/f{lead?fmt=%3H}.grb2
+             @returns TemplateRegex object or None if the template cannot be
+              converted. Templates that cannot be converted, i.e. templates
+              that raise errors when they are parsed, should be handled by
+              populate_match_dict
+    """
+    match = re.match(r'([^{]*)({.*})([^}]*)', template)
+    if not match:
+        return None
+
+    pre_text, all_tags, post_text = match.groups()
+    match_tags = re.findall(r'{(.*?)}([^{]*)', all_tags)
+    if not match_tags:
+        return None
+
+    # tags that could not be split cleanly are handled by populate_match_dict
+    if ''.join([f'{{{tag}}}{extra}'
+                for tag, extra in match_tags]) != all_tags:
+        return None
+
+    # text after the last tag does not need to match the template exactly
+    end_pattern = re.escape(post_text) + r'\Z'
+
+    pattern = re.escape(pre_text)
+    group_keys = []
+    valid_shift = 0
+    for tag_content, extra_text in match_tags:
+        identifier, *sections = tag_content.split('?')
+
+        # multiple formats in one tag are parsed from the same text
+        if [section.split('=')[0]
+                for section in sections].count(FORMAT_STRING) > 1:
+            return None
+
+        for section in sections:
+            element = section.split('=')
+            if len(element) != 2:
+                return None
+
+            element_name, element_value = element
+            if element_name == FORMAT_STRING:
+                fmt_pattern = get_fmt_regex(element_value, identifier,
+                                            group_keys, end_pattern)
+                if fmt_pattern is None:
+                    return None
+                pattern += fmt_pattern
+
+            elif element_name == SHIFT_STRING:
+                # errors for invalid shifts are raised by populate_match_dict
+                if identifier != VALID_STRING:
+                    return None
+
+                shift = time_util.get_seconds_from_string(element_value,
+                                                          default_unit='S')
+                if shift is None or valid_shift not in (0, int(shift)):
+                    return None
+
+                valid_shift = int(shift)
+
+        pattern += re.escape(extra_text)
+
+    pattern += '.*' + end_pattern
+    return TemplateRegex(pattern, group_keys, valid_shift)
+
 def populate_match_dict(template, filepath, logger=None):
     """! Use template to extract time information from filepath, add each value to a dictionary.
          Populates a dictionary with keys that contain tag name + time type, i.e. init+Y,
@@ -2,6 +2,15 @@ import os
 import sys
 import re
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# netCDF4 is used to read series_analysis output without calling NCO tools
+try:
+    import netCDF4
+    import numpy
+except ImportError:
+    netCDF4 = None
 
 from . import met_util as util
 from .config.string_template_substitution import do_string_sub
@@ -39,13 +48,32 @@ def retrieve_and_regrid(tmp_filename, cur_init, cur_storm, out_dir, config):
         Returns:
            None
     """
+    with open(tmp_filename, "r") as tf:
+        # read header
+        header = tf.readline().split()
+        rows = [line.split() for line in tf if line.strip()]
 
-    # pylint: disable=protected-access
-    # Need to call sys._getframe() to get current function and file for
-    # logging information.
-    # pylint: disable=too-many-arguments
-    # all input is needed to perform task
+    retrieve_and_regrid_rows(header, rows, cur_init, cur_storm, out_dir,
+                             config)
 
+def retrieve_and_regrid_rows(header, rows, cur_init, cur_storm, out_dir,
+                             config):
+    """! Same as retrieve_and_regrid but reads the track information from
+         rows that have already been read from the filter file instead of
+         reading a temporary file that contains the rows for a single storm.
+        Args:
+        @param header:   list of column names from the header of the filter
+                         file
+        @param rows:     list of rows corresponding to a storm id of varying
+                         times. Each row is a list of the column values
+        @param cur_init:       The current init time
+        @param cur_storm:      The current storm
+        @param out_dir:  The directory where regridded netCDF or grib2 output
+                         is saved.
+        @param config:  config instance
+        Returns:
+           None
+    """
     # rdp=, was added when logging capability was added to capture
     # all MET output to log files. It is a temporary work around
     # to get logging up and running as needed.
@@ -53,12 +81,92 @@ def retrieve_and_regrid(tmp_filename, cur_init, cur_storm, out_dir, config):
     # and redirects logging based on the conf settings.
     # Instantiate a RegridDataPlaneWrapper
     from ..wrappers.regrid_data_plane_wrapper import RegridDataPlaneWrapper
-    logger = config.logger
-    rdp = RegridDataPlaneWrapper(config, logger)
+    rdp = RegridDataPlaneWrapper(config, config.logger)
 
-    # For logging
-    cur_filename = sys._getframe().f_code.co_filename
-    cur_function = sys._getframe().f_code.co_name
+    commands = get_tile_regrid_commands(header, rows, cur_init, cur_storm,
+                                        out_dir, config, rdp.cmdrunner)
+    run_tile_regrid_commands(commands, rdp.cmdrunner, config.logger)
+
+def run_tile_regrid_commands(commands, cmdrunner, logger,
+                             telemetry_tags=None):
+    """! Run regrid_data_plane commands that create tiles. The commands are
+         submitted to the command runner so up to the maximum number of
+         concurrent commands allowed by the runner are run at once.
+        Args:
+        @param commands:  dictionary with the tile output path as keys and
+                          the regrid_data_plane command as values
+        @param cmdrunner: CommandRunner object used to run the commands
+        @param logger:    logger to output errors
+        @param telemetry_tags: optional dictionary of items that describe the
+                          commands to add to the command telemetry records
+        Returns:
+           True if all commands succeeded, False otherwise
+    """
+    for regrid_cmd in commands.values():
+        cmdrunner.submit_cmd(regrid_cmd, env=None,
+                             app_name='regrid_data_plane',
+                             telemetry_tags=telemetry_tags)
+
+    success = True
+    for ret, regrid_cmd in cmdrunner.wait_all():
+        if ret != 0:
+            logger.error("MET command returned a non-zero return code: "
+                         f"{regrid_cmd}")
+            success = False
+
+    return success
+
+def get_tile_grid_settings(config):
+    """! Read the config values used to create the grid specification
+         string of each tile so they are only read once.
+        Args:
+        @param config:  config instance
+        Returns:
+           dictionary of values passed to
+           util.create_grid_specification_string
+    """
+    return {
+        'nlat': config.getstr('config', 'EXTRACT_TILES_NLAT'),
+        'nlon': config.getstr('config', 'EXTRACT_TILES_NLON'),
+        'dlat': config.getstr('config', 'EXTRACT_TILES_DLAT'),
+        'dlon': config.getstr('config', 'EXTRACT_TILES_DLON'),
+        'lon_subtr': config.getfloat('config', 'EXTRACT_TILES_LON_ADJ'),
+        'lat_subtr': config.getfloat('config', 'EXTRACT_TILES_LAT_ADJ'),
+    }
+
+def get_tile_regrid_commands(header, rows, cur_init, cur_storm, out_dir,
+                             config, cmdrunner, commands=None,
+                             tile_settings=None):
+    """! Build the regrid_data_plane commands that create the forecast and
+         analysis tiles for the track points of a storm. Each command
+         regrids all of the fields for a single input file and tile. Tiles
+         that already exist are skipped unless EXTRACT_TILES_OVERWRITE_TRACK
+         is True and tiles that are already in commands are not added again.
+        Args:
+        @param header:   list of column names from the header of the filter
+                         file
+        @param rows:     list of rows corresponding to a storm id of varying
+                         times. Each row is a list of the column values
+        @param cur_init:       The current init time
+        @param cur_storm:      The current storm
+        @param out_dir:  The directory where regridded netCDF or grib2 output
+                         is saved.
+        @param config:  config instance
+        @param cmdrunner: CommandRunner object used to add the MET verbosity
+                          to the commands
+        @param commands: optional dictionary of commands to add to. Used to
+                         skip tiles that are created for another storm
+        @param tile_settings: optional dictionary returned by
+                              get_tile_grid_settings
+        Returns:
+           dictionary with the tile output path as keys and the
+           regrid_data_plane command as values
+    """
+    logger = config.logger
+    if commands is None:
+        commands = {}
+    if tile_settings is None:
+        tile_settings = get_tile_grid_settings(config)
 
     # Get variables, etc. from param/config file.
     model_data_dir = config.getdir('EXTRACT_TILES_GRID_INPUT_DIR')
@@ -68,225 +176,207 @@ def retrieve_and_regrid(tmp_filename, cur_init, cur_storm, out_dir, config):
 
     overwrite_flag = config.getbool('config', 'EXTRACT_TILES_OVERWRITE_TRACK')
 
+    fcst_input_template = config.getraw('filename_templates',
+                                        'FCST_EXTRACT_TILES_INPUT_TEMPLATE')
+    anly_input_template = config.getraw('filename_templates',
+                                        'OBS_EXTRACT_TILES_INPUT_TEMPLATE')
+    fcst_output_template = config.getraw('filename_templates',
+                                         'FCST_EXTRACT_TILES_OUTPUT_TEMPLATE')
+    obs_output_template = config.getraw('filename_templates',
+                                        'OBS_EXTRACT_TILES_OUTPUT_TEMPLATE')
+    # prefixes are only used if the output templates are not set
+    if not fcst_output_template:
+        fcst_prefix = config.getstr('regex_pattern',
+                                    'FCST_EXTRACT_TILES_PREFIX')
+    if not obs_output_template:
+        obs_prefix = config.getstr('regex_pattern',
+                                   'OBS_EXTRACT_TILES_PREFIX')
+
+    # fields to regrid are the same for every tile
+    var_level_string = retrieve_var_info(config)
+    name_list = [item[0] for item in retrieve_var_name_levels(config)]
+    names = ','.join(name_list)
+
     # Extract the columns of interest: init time, lead time,
     # valid time lat and lon of both tropical cyclone tracks, etc.
     # Then calculate the forecast hour and other things.
-    with open(tmp_filename, "r") as tf:
-        # read header
-        header = tf.readline().split()
-        # get column number for columns on interest
-        # print('header{}:'.format(header))
-        header_colnum_init, header_colnum_lead, header_colnum_valid = \
-            header.index('INIT'), header.index('LEAD'), header.index(
-                'VALID')
-        header_colnum_alat, header_colnum_alon = \
-            header.index('ALAT'), header.index('ALON')
-        header_colnum_blat, header_colnum_blon = \
-            header.index('BLAT'), header.index('BLON')
-        header_colnum_amodel = header.index('AMODEL')
-        for line in tf:
-            col = line.split()
-            init, lead, valid, alat, alon, blat, blon = \
-                col[header_colnum_init], col[header_colnum_lead], \
-                col[header_colnum_valid], col[header_colnum_alat], \
-                col[header_colnum_alon], col[header_colnum_blat], \
-                col[header_colnum_blon]
-            amodel = col[header_colnum_amodel]
-
-            # integer division for both Python 2 and 3
-            lead_time = int(lead)
-            fcst_hr = lead_time // 10000
-
-            init_ymd_match = re.match(r'[0-9]{8}', init)
-            if init_ymd_match:
-                init_ymd = init_ymd_match.group(0)
-            else:
-                logger.WARN("RuntimeError raised")
-                raise RuntimeError(
-                    'init time has unexpected format for YMD')
-
-            init_ymdh_match = re.match(r'[0-9|_]{11}', init)
-            if init_ymdh_match:
-                init_ymdh = init_ymdh_match.group(0)
-            else:
-                logger.WARN("RuntimeError raised")
-
-            valid_ymd_match = re.match(r'[0-9]{8}', valid)
-            if valid_ymd_match:
-                valid_ymd = valid_ymd_match.group(0)
-            else:
-                logger.WARN("RuntimeError raised")
-
-            valid_ymdh_match = re.match(r'[0-9|_]{11}', valid)
-            if valid_ymdh_match:
-                valid_ymdh = valid_ymdh_match.group(0)
-            else:
-                logger.WARN("RuntimeError raised")
-
-            lead_str = str(fcst_hr).zfill(3)
-            fcst_dir = os.path.join(model_data_dir, init_ymd)
-            init_ymdh_split = init_ymdh.split("_")
-            init_yyyymmddhh = "".join(init_ymdh_split)
-            anly_dir = os.path.join(model_data_dir, valid_ymd)
-            valid_ymdh_split = valid_ymdh.split("_")
-            valid_yyyymmddhh = "".join(valid_ymdh_split)
-
-            init_dt = datetime.datetime.strptime(init_yyyymmddhh, '%Y%m%d%H')
-            valid_dt = datetime.datetime.strptime(valid_yyyymmddhh, '%Y%m%d%H')
-            lead_seconds = int(fcst_hr * 3600)
-            # Create output filenames for regridding
-            # wgrib2 used to regrid.
-            # Create the filename for the regridded file, which is a
-            # grib2 file.
-            fcst_file = \
-                do_string_sub(config.getraw('filename_templates',
-                                            'FCST_EXTRACT_TILES_INPUT_TEMPLATE'),
-                              init=init_dt, lead=lead_seconds)
-
-            anly_file = \
-                do_string_sub(config.getraw('filename_templates',
-                                            'OBS_EXTRACT_TILES_INPUT_TEMPLATE'),
-                              valid=valid_dt, lead=lead_seconds)
-
-            fcst_filename = os.path.join(fcst_dir, fcst_file)
-            anly_filename = os.path.join(anly_dir, anly_file)
-
-            # Check if the forecast input file exists. If it doesn't
-            # exist, just log it
-            if util.file_exists(fcst_filename):
-                logger.debug("Forecast file: {}".format(fcst_filename))
-            else:
-                logger.warning("Can't find forecast file {}, continuing"\
-                               .format(fcst_filename))
+    # get column number for columns on interest
+    header_colnum_init, header_colnum_lead, header_colnum_valid = \
+        header.index('INIT'), header.index('LEAD'), header.index(
+            'VALID')
+    header_colnum_alat, header_colnum_alon = \
+        header.index('ALAT'), header.index('ALON')
+    header_colnum_blat, header_colnum_blon = \
+        header.index('BLAT'), header.index('BLON')
+    header_colnum_amodel = header.index('AMODEL')
+    for col in rows:
+        init, lead, valid, alat, alon, blat, blon = \
+            col[header_colnum_init], col[header_colnum_lead], \
+            col[header_colnum_valid], col[header_colnum_alat], \
+            col[header_colnum_alon], col[header_colnum_blat], \
+            col[header_colnum_blon]
+        amodel = col[header_colnum_amodel]
+
+        # integer division for both Python 2 and 3
+        lead_time = int(lead)
+        fcst_hr = lead_time // 10000
+
+        init_ymd_match = re.match(r'[0-9]{8}', init)
+        if init_ymd_match:
+            init_ymd = init_ymd_match.group(0)
+        else:
+            logger.WARN("RuntimeError raised")
+            raise RuntimeError(
+                'init time has unexpected format for YMD')
+
+        init_ymdh_match = re.match(r'[0-9|_]{11}', init)
+        if init_ymdh_match:
+            init_ymdh = init_ymdh_match.group(0)
+        else:
+            logger.WARN("RuntimeError raised")
+
+        valid_ymd_match = re.match(r'[0-9]{8}', valid)
+        if valid_ymd_match:
+            valid_ymd = valid_ymd_match.group(0)
+        else:
+            logger.WARN("RuntimeError raised")
+
+        valid_ymdh_match = re.match(r'[0-9|_]{11}', valid)
+        if valid_ymdh_match:
+            valid_ymdh = valid_ymdh_match.group(0)
+        else:
+            logger.WARN("RuntimeError raised")
+
+        lead_str = str(fcst_hr).zfill(3)
+        fcst_dir = os.path.join(model_data_dir, init_ymd)
+        init_ymdh_split = init_ymdh.split("_")
+        init_yyyymmddhh = "".join(init_ymdh_split)
+        anly_dir = os.path.join(model_data_dir, valid_ymd)
+        valid_ymdh_split = valid_ymdh.split("_")
+        valid_yyyymmddhh = "".join(valid_ymdh_split)
+
+        init_dt = datetime.datetime.strptime(init_yyyymmddhh, '%Y%m%d%H')
+        valid_dt = datetime.datetime.strptime(valid_yyyymmddhh, '%Y%m%d%H')
+        lead_seconds = int(fcst_hr * 3600)
+        # Create output filenames for regridding
+        # wgrib2 used to regrid.
+        # Create the filename for the regridded file, which is a
+        # grib2 file.
+        fcst_file = \
+            do_string_sub(fcst_input_template,
+                          init=init_dt, lead=lead_seconds)
+
+        anly_file = \
+            do_string_sub(anly_input_template,
+                          valid=valid_dt, lead=lead_seconds)
+
+        fcst_filename = os.path.join(fcst_dir, fcst_file)
+        anly_filename = os.path.join(anly_dir, anly_file)
+
+        # Check if the forecast input file exists. If it doesn't
+        # exist, just log it
+        if util.file_exists(fcst_filename):
+            logger.debug("Forecast file: {}".format(fcst_filename))
+        else:
+            logger.warning("Can't find forecast file {}, continuing"\
+                           .format(fcst_filename))
+            continue
+
+        # Check if the analysis input file exists. If it doesn't
+        # exist, just log it.
+        if util.file_exists(anly_filename):
+            logger.debug("Analysis file: {}".format(anly_filename))
+
+        else:
+            logger.warning("Can't find analysis file {}, continuing"\
+                   .format(anly_filename))
+            continue
+
+        # Create the arguments used to perform regridding.
+        # NOTE: the base name
+        # is the same for both the fcst and anly filenames,
+        # so use either one to derive the base name that will
+        # be used to create the fcst_regridded_filename and
+        # anly_regridded_filename.
+        fcst_anly_base = os.path.basename(fcst_filename)
+
+        fcst_grid_spec = \
+            util.create_grid_specification_string(alat, alon,
+                                                  logger,
+                                                  config,
+                                                  tile_settings)
+        anly_grid_spec = \
+            util.create_grid_specification_string(blat, blon,
+                                                  logger,
+                                                  config,
+                                                  tile_settings)
+
+        nc_fcst_anly_base = re.sub("grb2", "nc", fcst_anly_base)
+        fcst_anly_base = nc_fcst_anly_base
+
+        tile_dir = os.path.join(out_dir, cur_init, cur_storm)
+        fcst_hr_str = str(fcst_hr).zfill(3)
+
+        if fcst_output_template:
+            fcst_regridded_filename = \
+                do_string_sub(fcst_output_template,
+                              init=init_dt, lead=lead_seconds, amodel=amodel)
+        else:
+            fcst_regridded_filename = (
+                fcst_prefix +
+                fcst_hr_str + "_" + fcst_anly_base)
+
+        if obs_output_template:
+            anly_regridded_filename = \
+                do_string_sub(obs_output_template,
+                              valid=valid_dt, lead=lead_seconds, amodel=amodel)
+        else:
+            anly_regridded_filename = (
+                obs_prefix +
+                fcst_hr_str + "_" + fcst_anly_base)
+
+
+        fcst_regridded_file = os.path.join(tile_dir,
+                                           fcst_regridded_filename)
+        anly_regridded_file = os.path.join(tile_dir,
+                                           anly_regridded_filename)
+
+        # Regrid the fcst and anly files only if a tile file does NOT
+        # already exist or if the overwrite flag is True. Skip tiles that
+        # were already added to the list of commands
+        for input_file, grid_spec, regridded_file, data_type in (
+                (fcst_filename, fcst_grid_spec, fcst_regridded_file,
+                 'Forecast'),
+                (anly_filename, anly_grid_spec, anly_regridded_file,
+                 'Analysis'),
+        ):
+            if regridded_file in commands:
                 continue
 
-            # Check if the analysis input file exists. If it doesn't
-            # exist, just log it.
-            if util.file_exists(anly_filename):
-                logger.debug("Analysis file: {}".format(anly_filename))
-
-            else:
-                logger.warning("Can't find analysis file {}, continuing"\
-                       .format(anly_filename))
+            if util.file_exists(regridded_file) and not overwrite_flag:
+                logger.debug(f"{data_type} tile file {regridded_file} "
+                             "exists, skip regridding")
                 continue
 
-            # Create the arguments used to perform regridding.
-            # NOTE: the base name
-            # is the same for both the fcst and anly filenames,
-            # so use either one to derive the base name that will
-            # be used to create the fcst_regridded_filename and
-            # anly_regridded_filename.
-            fcst_anly_base = os.path.basename(fcst_filename)
-
-            fcst_grid_spec = \
-                util.create_grid_specification_string(alat, alon,
-                                                      logger,
-                                                      config)
-            anly_grid_spec = \
-                util.create_grid_specification_string(blat, blon,
-                                                      logger,
-                                                      config)
-
-            nc_fcst_anly_base = re.sub("grb2", "nc", fcst_anly_base)
-            fcst_anly_base = nc_fcst_anly_base
-
-            tile_dir = os.path.join(out_dir, cur_init, cur_storm)
-            fcst_hr_str = str(fcst_hr).zfill(3)
-
-            fcst_output_template = config.getraw('filename_templates',
-                                                 'FCST_EXTRACT_TILES_OUTPUT_TEMPLATE')
-            if fcst_output_template:
-                fcst_regridded_filename = \
-                    do_string_sub(fcst_output_template,
-                                  init=init_dt, lead=lead_seconds, amodel=amodel)
-            else:
-                fcst_regridded_filename = (
-                    config.getstr('regex_pattern',
-                                  'FCST_EXTRACT_TILES_PREFIX') +
-                    fcst_hr_str + "_" + fcst_anly_base)
-
-            obs_output_template = config.getraw('filename_templates',
-                                                 'OBS_EXTRACT_TILES_OUTPUT_TEMPLATE')
-            if obs_output_template:
-                anly_regridded_filename = \
-                    do_string_sub(obs_output_template,
-                                  valid=valid_dt, lead=lead_seconds, amodel=amodel)
-            else:
-                anly_regridded_filename = (
-                    config.getstr('regex_pattern',
-                                  'OBS_EXTRACT_TILES_PREFIX') +
-                    fcst_hr_str + "_" + fcst_anly_base)
-
-
-            fcst_regridded_file = os.path.join(tile_dir,
-                                               fcst_regridded_filename)
-            anly_regridded_file = os.path.join(tile_dir,
-                                               anly_regridded_filename)
-
-            # Regrid the fcst file only if a fcst tile
-            # file does NOT already exist or if the overwrite flag is True.
-            # Create new gridded file for fcst tile
-            if util.file_exists(fcst_regridded_file) and not overwrite_flag:
-                msg = "Forecast tile file {} exists, skip regridding"\
-                  .format(fcst_regridded_file)
-                logger.debug(msg)
-            else:
-                # Perform fcst regridding on the records of interest
-                var_level_string = retrieve_var_info(config)
-
-
-                name_list = [item[0] for item in retrieve_var_name_levels(config)]
-                names = ','.join(name_list)
-
-                # Perform regridding using MET Tool regrid_data_plane
-                fcst_cmd_list = [regrid_data_plane_exe, ' ',
-                                 fcst_filename, ' ',
-                                 fcst_grid_spec, ' ',
-                                 fcst_regridded_file, ' ',
-                                 var_level_string,
-                                 ' -name ', names,
-                                 ' -method NEAREST ']
-                regrid_cmd_fcst = ''.join(fcst_cmd_list)
-
-                # Since not using the CommandBuilder to build the cmd,
-                # add the met verbosity level to the
-                # MET cmd created before we run the command.
-                regrid_cmd_fcst = rdp.cmdrunner.insert_metverbosity_opt(
-                    regrid_cmd_fcst)
-                (ret, regrid_cmd_fcst) = rdp.cmdrunner.run_cmd(
-                    regrid_cmd_fcst, env=None, app_name=rdp.app_name)
-
-            # Create new gridded file for anly tile
-            if util.file_exists(anly_regridded_file) and not overwrite_flag:
-                logger.debug("Analysis tile file: " + anly_regridded_file +
-                             " exists, skip regridding")
-            else:
-                # Perform anly regridding on the records of interest
-                var_level_string = retrieve_var_info(config)
-                name_list = [item[0] for item in retrieve_var_name_levels(config)]
-                names = ','.join(name_list)
-
-                anly_cmd_list = [regrid_data_plane_exe, ' ',
-                                 anly_filename, ' ',
-                                 anly_grid_spec, ' ',
-                                 anly_regridded_file, ' ',
-                                 var_level_string, ' ',
-                                 ' -name ', names,
-                                 ' -method NEAREST ']
-                regrid_cmd_anly = ''.join(anly_cmd_list)
-
-                # Since not using the CommandBuilder to build the cmd,
-                # add the met verbosity level to the MET cmd
-                # created before we run the command.
-                regrid_cmd_anly = rdp.cmdrunner.insert_metverbosity_opt(
-                    regrid_cmd_anly)
-                (ret, regrid_cmd_anly) = rdp.cmdrunner.run_cmd(
-                    regrid_cmd_anly, env=None, app_name=rdp.app_name)
-                msg = ("on anly file:" +
-                       anly_regridded_file)
-                logger.debug(msg)
-
-
+            # Perform regridding using MET Tool regrid_data_plane
+            # on all of the fields at once
+            cmd_list = [regrid_data_plane_exe, ' ',
+                        input_file, ' ',
+                        grid_spec, ' ',
+                        regridded_file, ' ',
+                        var_level_string,
+                        ' -name ', names,
+                        ' -method NEAREST ']
+            regrid_cmd = ''.join(cmd_list)
+
+            # Since not using the CommandBuilder to build the cmd,
+            # add the met verbosity level to the
+            # MET cmd created before we run the command.
+            commands[regridded_file] = (
+                cmdrunner.insert_metverbosity_opt(regrid_cmd)
+            )
+
+    return commands
 
 def retrieve_var_info(config):
     """! Retrieve the variable name and level from the
@@ -362,3 +452,115 @@ def retrieve_var_name_levels(config):
         name_level_tuple = name,level
         full_list.append(name_level_tuple)
     return full_list
+
+# maximum number of values to read from a NetCDF variable at once
+NETCDF_READ_BLOCK_SIZE = 1000000
+
+def can_read_netcdf():
+    """! Check if NetCDF files can be read in process
+         Returns:
+             True if the netCDF4 python package is available, False if not
+    """
+    return netCDF4 is not None
+
+def format_netcdf_value(value):
+    """! Format a value read from a NetCDF file the way ncdump writes it,
+         i.e. 12 instead of 12.0
+         Args:
+             @param value number to format or None
+         Returns:
+             formatted string or None if value is None
+    """
+    if value is None:
+        return None
+
+    if float(value).is_integer():
+        return str(int(value))
+
+    return str(value)
+
+def get_netcdf_var_min_max(nc_var):
+    """! Get the minimum and maximum value of a NetCDF variable. The
+         variable is read in blocks along the first dimension so large
+         variables are not read into memory all at once. Missing values are
+         ignored.
+         Args:
+             @param nc_var netCDF4 variable to read
+         Returns:
+             tuple of minimum and maximum value or (None, None) if all
+             values are missing
+    """
+    if not nc_var.shape:
+        blocks = [nc_var[...]]
+    else:
+        row_size = max(1, int(numpy.prod(nc_var.shape[1:])))
+        num_rows = max(1, NETCDF_READ_BLOCK_SIZE // row_size)
+        blocks = (nc_var[start:start+num_rows]
+                  for start in range(0, nc_var.shape[0], num_rows))
+
+    var_min = None
+    var_max = None
+    for block in blocks:
+        block = numpy.ma.masked_invalid(block)
+        if block.count() == 0:
+            continue
+
+        block_min = block.min()
+        block_max = block.max()
+        if var_min is None or block_min < var_min:
+            var_min = block_min
+        if var_max is None or block_max > var_max:
+            var_max = block_max
+
+    if var_min is None:
+        return None, None
+
+    return var_min.item(), var_max.item()
+
+def get_netcdf_min_max(nc_file, var_names):
+    """! Read the minimum and maximum values of variables in a NetCDF file.
+         The file is opened once to read all of the variables.
+         Args:
+             @param nc_file path to NetCDF file
+             @param var_names list of variable names to read,
+              i.e. series_cnt_TOTAL
+         Returns:
+             dictionary where the key is the variable name and the value is
+             a tuple of the minimum and maximum value. Variables that are not
+             in the file or only contain missing values are set to
+             (None, None)
+    """
+    min_max = {}
+    with netCDF4.Dataset(nc_file, 'r') as nc_data:
+        for var_name in var_names:
+            if var_name not in nc_data.variables:
+                min_max[var_name] = (None, None)
+                continue
+
+            min_max[var_name] = (
+                get_netcdf_var_min_max(nc_data.variables[var_name])
+            )
+
+    return min_max
+
+def get_netcdf_min_max_for_files(nc_files, var_names, num_workers=1):
+    """! Read the minimum and maximum values of variables in many NetCDF
+         files, optionally reading the files in parallel. Separate processes
+         are used because the NetCDF C library is not thread-safe.
+         Args:
+             @param nc_files list of paths to NetCDF files
+             @param var_names list of variable names to read from each file
+             @param num_workers number of processes to use to read files
+         Returns:
+             dictionary where the key is the NetCDF file path and the value
+             is the dictionary returned by get_netcdf_min_max
+    """
+    if num_workers <= 1 or len(nc_files) <= 1:
+        return {nc_file: get_netcdf_min_max(nc_file, var_names)
+                for nc_file in nc_files}
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        results = executor.map(get_netcdf_min_max,
+                               nc_files,
+                               repeat(var_names))
+        return dict(zip(nc_files, results))
@@ -12,6 +12,15 @@ import bz2
 import zipfile
 import struct
 import getpass
+import multiprocessing
+import heapq
+import json
+import threading
+import tempfile
+import fcntl
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import wait, FIRST_COMPLETED
 from os import stat
 from pwd import getpwuid
 from csv import reader
@@ -37,6 +46,17 @@ from . import metplus_check
 # list of compression extensions that are handled by METplus
 VALID_EXTENSIONS = ['.gz', '.bz2', '.zip']
 
+# number of bytes to read at a time when decompressing files
+STAGING_CHUNK_SIZE = 4 * 1024 * 1024
+
+# extensions of files written next to each decompressed file in the staging
+# directory. The key file contains the path, size, and modification time of
+# the compressed file that was decompressed and its modification time is
+# updated when the staged file is used. The lock file is used to prevent
+# more than one process from decompressing the same file at the same time
+STAGING_KEY_EXT = '.stagekey'
+STAGING_LOCK_EXT = '.stagelock'
+
 baseinputconfs = ['metplus_config/metplus_system.conf',
                   'metplus_config/metplus_data.conf',
                   'metplus_config/metplus_runtime.conf',
@@ -150,25 +170,38 @@ def pre_run_setup(filename, app_name):
 
     return config
 
+def get_wrapper_instance(config, process, logger=None):
+    """!Import the module for a wrapper and create an instance of it
+        Args:
+            @param config METplusConfig object passed to the wrapper
+            @param process name of wrapper without Wrapper, i.e. GridStat
+            @param logger log object to pass to the wrapper. If not set,
+             a logger named after the process is used
+            @returns instance of the wrapper class
+    """
+    if logger is None:
+        logger = config.log(process)
+
+    package_name = 'metplus.wrappers.' + camel_to_underscore(process) + '_wrapper'
+    try:
+        module = import_module(package_name)
+        return getattr(module, process + "Wrapper")(config, logger)
+    except AttributeError:
+        raise NameError("There was a problem loading %s wrapper." % process)
+
 def run_metplus(config, process_list):
     total_errors = 0
 
     try:
         processes = []
         for item in process_list:
-            try:
-                logger = config.log(item)
-                package_name = 'metplus.wrappers.' + camel_to_underscore(item) + '_wrapper'
-                module = import_module(package_name)
-                command_builder = getattr(module,
-                                          item + "Wrapper")(config, logger)
-
-                # if Usage specified in PROCESS_LIST, print usage and exit
-                if item == 'Usage':
-                    command_builder.run_all_times()
-                    return 0
-            except AttributeError:
-                raise NameError("There was a problem loading %s wrapper." % item)
+            logger = config.log(item)
+            command_builder = get_wrapper_instance(config, item, logger)
+
+            # if Usage specified in PROCESS_LIST, print usage and exit
+            if item == 'Usage':
+                command_builder.run_all_times()
+                return 0
 
             processes.append(command_builder)
 
@@ -190,13 +223,34 @@ def run_metplus(config, process_list):
         if loop_order == "processes":
             for process in processes:
                 process.run_all_times()
+                process.wait_for_commands()
 
         elif loop_order == "times":
-            loop_over_times_and_call(config, processes)
+            num_workers = config.getint('config', 'LOOP_ORDER_NUM_WORKERS', 1)
+            if num_workers is None or num_workers < 1:
+                logger.error("LOOP_ORDER_NUM_WORKERS must be an integer "
+                             "greater than or equal to 1")
+                return 1
+
+            if num_workers == 1:
+                loop_over_times_and_call(config, processes)
+            else:
+                loop_over_times_in_parallel(config, process_list,
+                                            processes, num_workers)
+
+        elif loop_order == "pipeline":
+            num_workers = config.getint('config', 'LOOP_ORDER_NUM_WORKERS', 1)
+            if num_workers is None or num_workers < 1:
+                logger.error("LOOP_ORDER_NUM_WORKERS must be an integer "
+                             "greater than or equal to 1")
+                return 1
+
+            loop_over_times_as_pipeline(config, process_list,
+                                        processes, num_workers)
 
         else:
             logger.error("Invalid LOOP_ORDER defined. " + \
-                         "Options are processes, times")
+                         "Options are processes, times, pipeline")
             return 1
 
        # compute total number of errors that occurred and output results
@@ -235,6 +289,9 @@ def post_run_cleanup(config, app_name, total_errors):
     total_run_time = end_clock_time - start_clock_time
     logger.debug(f"{app_name} took {total_run_time} to run.")
 
+    # summarize the resources used by the commands that were run
+    log_command_telemetry_summary(config, logger)
+
     if total_errors == 0:
         logger.info(f"Check the log file for more information: {config.getstr('config', 'LOG_METPLUS')}")
         logger.info(f'{app_name} has successfully finished running.')
@@ -247,6 +304,104 @@ def post_run_cleanup(config, app_name, total_errors):
         logger.info(f"Check the log file for more information: {config.getstr('config', 'LOG_METPLUS')}")
         sys.exit(1)
 
+def write_command_telemetry(telemetry_file, record):
+    """!Append the resources used by a command to a JSON Lines file. The
+        record is written with a single call to os.write on a file opened in
+        append mode so that records written by other threads or processes
+        are not interleaved.
+        Args:
+            @param telemetry_file path of the file to write
+            @param record dictionary of information about the command
+    """
+    parent_dir = os.path.dirname(telemetry_file)
+    if parent_dir and not os.path.exists(parent_dir):
+        os.makedirs(parent_dir, exist_ok=True)
+
+    line = (json.dumps(record) + '\n').encode('utf-8')
+    file_descriptor = os.open(telemetry_file,
+                              os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o664)
+    try:
+        os.write(file_descriptor, line)
+    finally:
+        os.close(file_descriptor)
+
+def summarize_command_telemetry(telemetry_file, clock_time=None):
+    """!Read a command telemetry file and sum the resources used by the
+        commands for each application and field
+        Args:
+            @param telemetry_file path of the file written by
+             write_command_telemetry
+            @param clock_time only include commands run by the METplus run
+             that started at this time (CLOCK_TIME). Include all if None
+            @returns list of dictionaries with the application name, field,
+             number of commands, total wall and CPU time in seconds, and
+             the largest max RSS in KB, sorted by CPU time from largest to
+             smallest
+    """
+    totals = {}
+    with open(telemetry_file, 'r') as file_handle:
+        for line in file_handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            if clock_time is not None and record.get('clock_time') != clock_time:
+                continue
+
+            key = (record.get('app_name'), record.get('field'))
+            if key not in totals:
+                totals[key] = {
+                    'app_name': key[0],
+                    'field': key[1],
+                    'count': 0,
+                    'wall_seconds': 0.0,
+                    'cpu_seconds': 0.0,
+                    'max_rss_kb': 0,
+                }
+            total = totals[key]
+            total['count'] += 1
+            total['wall_seconds'] += record.get('wall_seconds', 0.0)
+            total['cpu_seconds'] += (record.get('user_cpu_seconds', 0.0) +
+                                     record.get('system_cpu_seconds', 0.0))
+            total['max_rss_kb'] = max(total['max_rss_kb'],
+                                      record.get('max_rss_kb', 0))
+
+    return sorted(totals.values(), key=lambda item: item['cpu_seconds'],
+                  reverse=True)
+
+def log_command_telemetry_summary(config, logger):
+    """!Log a table of the application and field combinations that used the
+        most CPU time in this run if LOG_COMMAND_TELEMETRY is set
+        Args:
+            @param config METplusConfig object
+            @param logger log object to write the table
+    """
+    telemetry_file = config.getraw('config', 'LOG_COMMAND_TELEMETRY')
+    if not telemetry_file or not os.path.exists(telemetry_file):
+        return
+
+    num_rows = config.getint('config', 'LOG_COMMAND_TELEMETRY_SUMMARY_COUNT',
+                             10)
+    summary = summarize_command_telemetry(telemetry_file,
+                                          config.getstr('config', 'CLOCK_TIME',
+                                                        ''))
+    if not summary or not num_rows or num_rows < 1:
+        return
+
+    logger.info(f"Top {min(num_rows, len(summary))} of {len(summary)} "
+                "application/field combinations by CPU time "
+                f"(all commands are in {telemetry_file}):")
+    logger.info(f"{'APPLICATION':<20} {'FIELD':<30} {'COUNT':>6} "
+                f"{'WALL (s)':>12} {'CPU (s)':>12} {'MAX RSS (MB)':>12}")
+    for total in summary[:num_rows]:
+        logger.info(f"{str(total['app_name']):<20} "
+                    f"{str(total['field'] or ''):<30} "
+                    f"{total['count']:>6} "
+                    f"{total['wall_seconds']:>12.2f} "
+                    f"{total['cpu_seconds']:>12.2f} "
+                    f"{total['max_rss_kb'] / 1024:>12.1f}")
+
 def check_for_deprecated_config(conf):
     """!Checks user configuration files and reports errors or warnings if any deprecated variable
         is found. If an alternate variable name can be suggested, add it to the 'alt' section
@@ -904,42 +1059,481 @@ def get_start_end_interval_times(config):
 
     return start_time, end_time, time_interval
 
+def get_run_times(config):
+    """!Get list of run times to process using [INIT/VALID]_[BEG/END/INCREMENT]
+        Args:
+            @param config METplusConfig object to read time information
+            @returns list of datetime objects or None if the time information
+             in the configuration is invalid
+    """
+    # get start time, end time, and time interval from config
+    loop_time, end_time, time_interval = get_start_end_interval_times(config) or (None, None, None)
+    if not loop_time:
+        config.logger.error("Could not get [INIT/VALID] time information from configuration file")
+        return None
+
+    run_times = []
+    while loop_time <= end_time:
+        run_times.append(loop_time)
+        loop_time += time_interval
+
+    return run_times
+
+def log_run_time_header(config, run_time_obj, use_init):
+    """!Log banner to designate the start of processing for a run time"""
+    run_time = run_time_obj.strftime("%Y%m%d%H%M")
+    config.logger.info("****************************************")
+    config.logger.info("* Running METplus")
+    if use_init:
+        config.logger.info("*  at init time: " + run_time)
+    else:
+        config.logger.info("*  at valid time: " + run_time)
+    config.logger.info("****************************************")
+
+def get_input_dict(run_time_obj, use_init, clock_time_obj):
+    """!Create time dictionary that is passed to run_at_time for a run time"""
+    input_dict = {}
+    input_dict['now'] = clock_time_obj
+
+    if use_init:
+        input_dict['init'] = run_time_obj
+    else:
+        input_dict['valid'] = run_time_obj
+
+    return input_dict
+
 def loop_over_times_and_call(config, processes):
     """!Loop over all run times and call wrappers listed in config"""
     clock_time_obj = datetime.datetime.strptime(config.getstr('config', 'CLOCK_TIME'),
                                                 '%Y%m%d%H%M%S')
     use_init = is_loop_by_init(config)
 
-    # get start time, end time, and time interval from config
-    loop_time, end_time, time_interval = get_start_end_interval_times(config) or (None, None, None)
-    if not loop_time:
-        config.logger.error("Could not get [INIT/VALID] time information from configuration file")
+    run_times = get_run_times(config)
+    if not run_times:
         return None
 
-    while loop_time <= end_time:
-        run_time = loop_time.strftime("%Y%m%d%H%M")
-        config.logger.info("****************************************")
-        config.logger.info("* Running METplus")
-        if use_init:
-            config.logger.info("*  at init time: " + run_time)
-        else:
-            config.logger.info("*  at valid time: " + run_time)
-        config.logger.info("****************************************")
-        if not isinstance(processes, list):
-            processes = [processes]
+    if not isinstance(processes, list):
+        processes = [processes]
+
+    for run_time_obj in run_times:
+        log_run_time_header(config, run_time_obj, use_init)
         for process in processes:
-            input_dict = {}
-            input_dict['now'] = clock_time_obj
+            input_dict = get_input_dict(run_time_obj, use_init, clock_time_obj)
+            process.clear()
+            process.current_input_dict = input_dict
+            process.run_at_time(input_dict)
 
-            if use_init:
-                input_dict['init'] = loop_time
-            else:
-                input_dict['valid'] = loop_time
+            # wrappers that run after this one may read its output, so wait
+            # for any commands it submitted before running the next wrapper
+            if len(processes) > 1:
+                process.wait_for_commands()
+
+    # commands submitted by a single wrapper for different run times can
+    # run at the same time, so only wait after all run times are processed
+    if len(processes) == 1:
+        processes[0].wait_for_commands()
+
+# configuration object used by worker processes. It is set by the pool
+# initializer so that the object is inherited through fork instead of pickled
+_worker_config = None
+
+def _init_run_time_worker(config):
+    """!Store config object in the worker process so tasks can access it"""
+    global _worker_config
+    _worker_config = config
+
+def _get_task_config(config):
+    """!Get the config object that a task running in a worker should use.
+        Wrappers set the current field info and other values in the config
+        while they run, so tasks that run in threads get their own copy of
+        the config instead of sharing it with the other threads.
+        Args:
+            @param config METplusConfig object passed to the task or None if
+             the task runs in a worker process
+            @returns config stored in the worker process if config is None,
+             otherwise a copy of config
+    """
+    if config is None:
+        return _worker_config
+
+    return config.copy()
+
+def run_processes_at_time(process_list, run_time_obj, use_init,
+                          clock_time_obj, config=None):
+    """!Create a new instance of each wrapper in the process list and run them
+        for a single run time. New instances are created so that the c_dict
+        and environment of a wrapper are not shared with other run times that
+        are processed concurrently.
+        Args:
+            @param process_list list of wrapper names, i.e. GridStat
+            @param run_time_obj datetime object of the init or valid time to run
+            @param use_init True if run_time_obj is an init time, False if valid
+            @param clock_time_obj datetime object of the time METplus started
+            @param config METplusConfig object that is copied so it is not
+             modified by the wrappers. If not set, the config object stored
+             when the worker process was initialized is used
+            @returns list containing the number of errors for each wrapper
+    """
+    config = _get_task_config(config)
 
+    log_run_time_header(config, run_time_obj, use_init)
+
+    errors = []
+    for process_name in process_list:
+        process = get_wrapper_instance(config, process_name)
+        if process.isOK:
+            input_dict = get_input_dict(run_time_obj, use_init, clock_time_obj)
             process.clear()
+            process.current_input_dict = input_dict
             process.run_at_time(input_dict)
+            process.wait_for_commands()
+        errors.append(process.errors)
 
-        loop_time += time_interval
+    return errors
+
+def get_loop_order_executor(config, num_workers):
+    """!Create the executor used to run tasks concurrently for
+        LOOP_ORDER = times or pipeline. LOOP_ORDER_WORKER_TYPE controls if
+        tasks run in threads or in processes.
+        Args:
+            @param config METplusConfig object to read worker type
+            @param num_workers maximum number of tasks to run at once
+            @returns tuple of the worker type, the executor, and the config
+             object to pass to each task. The executor is None if the worker
+             type is invalid. The config object is None for process workers
+             because it is stored in each worker when it starts
+    """
+    worker_type = config.getstr('config', 'LOOP_ORDER_WORKER_TYPE', 'thread').lower()
+    if worker_type == 'process':
+        executor = ProcessPoolExecutor(max_workers=num_workers,
+                                       mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_init_run_time_worker,
+                                       initargs=(config,))
+        return worker_type, executor, None
+
+    if worker_type == 'thread':
+        return worker_type, ThreadPoolExecutor(max_workers=num_workers), config
+
+    config.logger.error(f"Invalid LOOP_ORDER_WORKER_TYPE: {worker_type}. "
+                        "Options are thread, process")
+    return worker_type, None, None
+
+def loop_over_times_in_parallel(config, process_list, processes, num_workers):
+    """!Loop over all run times and call wrappers listed in config, processing
+        up to num_workers run times at once. Each run time is processed with
+        its own wrapper instances. The number of errors that occurred is added
+        to the errors attribute of the corresponding item in processes.
+        LOOP_ORDER_WORKER_TYPE controls if run times are processed in threads
+        or in processes.
+        Args:
+            @param config METplusConfig object to read time information
+            @param process_list list of wrapper names, i.e. GridStat
+            @param processes list of wrapper instances that correspond to
+             process_list that are used to accumulate error counts
+            @param num_workers maximum number of run times to process at once
+    """
+    clock_time_obj = datetime.datetime.strptime(config.getstr('config', 'CLOCK_TIME'),
+                                                '%Y%m%d%H%M%S')
+    use_init = is_loop_by_init(config)
+
+    run_times = get_run_times(config)
+    if not run_times:
+        return None
+
+    worker_type, executor, task_config = get_loop_order_executor(config,
+                                                                 num_workers)
+    if executor is None:
+        processes[0].errors += 1
+        return None
+
+    config.logger.info(f"Processing {len(run_times)} run times using "
+                       f"{num_workers} {worker_type} workers")
+
+    with executor:
+        futures = [executor.submit(run_processes_at_time,
+                                   process_list,
+                                   run_time_obj,
+                                   use_init,
+                                   clock_time_obj,
+                                   task_config)
+                   for run_time_obj in run_times]
+
+        # collect results in order of run time so errors are reported
+        # consistently regardless of which run time finishes first
+        for run_time_obj, future in zip(run_times, futures):
+            try:
+                errors = future.result()
+            except Exception:
+                config.logger.exception("Fatal error occurred processing "
+                                        f"{run_time_obj.strftime('%Y%m%d%H%M')}")
+                processes[0].errors += 1
+                continue
+
+            for process, process_errors in zip(processes, errors):
+                process.errors += process_errors
+
+def get_wrapper_file_templates(process, file_type):
+    """!Get full path templates of the input or output files of a wrapper.
+        Templates are read from c_dict items that end with
+        <file_type>_TEMPLATE, i.e. FCST_INPUT_TEMPLATE, and are joined with
+        the corresponding <file_type>_DIR value if it is set.
+        Args:
+            @param process wrapper instance to read c_dict
+            @param file_type either INPUT or OUTPUT
+            @returns set of normalized path templates
+    """
+    templates = set()
+    suffix = f'{file_type}_TEMPLATE'
+    for key, value in process.c_dict.items():
+        if not key.endswith(suffix) or not value:
+            continue
+
+        prefix = key[:-len(suffix)]
+        data_dir = process.c_dict.get(f'{prefix}{file_type}_DIR', '')
+        template_list = value if isinstance(value, list) else getlist(value)
+        for template in template_list:
+            templates.add(os.path.normpath(os.path.join(data_dir, template)))
+
+    return templates
+
+def _normalize_process_name(process_name):
+    """!Get the wrapper name that corresponds to a PROCESS_LIST item
+        Args:
+            @param process_name name of the wrapper, i.e. pcp_combine
+            @returns wrapper name, i.e. PCPCombine
+    """
+    lower_process = process_name.replace('-', '').replace('_', '').replace(' ', '').lower()
+    return LOWER_TO_WRAPPER_NAME.get(lower_process, process_name)
+
+def get_pipeline_dependencies(config, process_list, processes):
+    """!Determine which wrappers in the process list must finish before each
+        wrapper can run. By default, a wrapper depends on the wrapper that is
+        listed before it so the wrappers run in PROCESS_LIST order for each
+        run time. The wrappers that must run first can be set for a wrapper
+        with <APP_NAME>_PIPELINE_DEPENDS_ON, i.e.
+        GRID_STAT_PIPELINE_DEPENDS_ON. Set it to an empty string if the
+        wrapper does not read the output of any of the other wrappers.
+        A wrapper also depends on an earlier wrapper if any of its input
+        templates matches one of the output templates of that wrapper.
+        Args:
+            @param config METplusConfig object to read dependencies
+            @param process_list list of wrapper names, i.e. GridStat
+            @param processes list of wrapper instances in PROCESS_LIST order
+            @returns dictionary where the key is the index of a wrapper in
+             processes and the value is a sorted list of indices of the
+             wrappers it depends on or None if a wrapper listed in
+             <APP_NAME>_PIPELINE_DEPENDS_ON is not found before it
+    """
+    output_templates = [get_wrapper_file_templates(process, 'OUTPUT')
+                        for process in processes]
+    dependencies = {}
+    for index, process in enumerate(processes):
+        option_name = f'{process.app_name.upper()}_PIPELINE_DEPENDS_ON'
+        if not config.has_option('config', option_name):
+            producers = {index - 1} if index else set()
+        else:
+            producers = set()
+            for producer_name in getlist(config.getstr('config', option_name)):
+                producer_name = _normalize_process_name(producer_name)
+                found = [producer for producer in range(index)
+                         if process_list[producer] == producer_name]
+                if not found:
+                    config.logger.error(f"{option_name} contains {producer_name}, "
+                                        "which is not listed before "
+                                        f"{process_list[index]} in PROCESS_LIST")
+                    return None
+                producers.update(found)
+
+        input_templates = get_wrapper_file_templates(process, 'INPUT')
+        producers.update(producer for producer in range(index)
+                         if input_templates & output_templates[producer])
+        dependencies[index] = sorted(producers)
+
+    return dependencies
+
+def run_process_at_time_once(process_name, input_dict, custom_string,
+                             config=None):
+    """!Create a new instance of a wrapper and run it for a single run time
+        and custom loop string
+        Args:
+            @param process_name name of wrapper, i.e. GridStat
+            @param input_dict time dictionary passed to run_at_time
+            @param custom_string custom loop string to process
+            @param config METplusConfig object that is copied and passed to
+             the wrapper. If not set, the config object stored when the
+             worker process was initialized is used
+            @returns number of errors that occurred
+    """
+    config = _get_task_config(config)
+    process = get_wrapper_instance(config, process_name)
+    if not process.isOK:
+        return process.errors
+
+    process.c_dict['CUSTOM_LOOP_LIST'] = [custom_string]
+    process.clear()
+    process.current_input_dict = input_dict
+    process.run_at_time(input_dict)
+    process.wait_for_commands()
+    return process.errors
+
+def loop_over_times_as_pipeline(config, process_list, processes, num_workers):
+    """!Run wrappers listed in config as a graph of tasks. Each task runs a
+        single wrapper for a single run time and custom loop string. A task
+        starts as soon as the tasks of the wrappers it depends on have
+        finished for the same run time, so a wrapper can process a run time
+        while the wrapper that runs before it moves on to the next run time.
+        See get_pipeline_dependencies for how dependencies are determined.
+        Up to num_workers tasks are run at once. Errors are added to the
+        corresponding wrapper instance in processes.
+        Args:
+            @param config METplusConfig object to read time information
+            @param process_list list of wrapper names, i.e. GridStat
+            @param processes list of wrapper instances that correspond to
+             process_list that are used to accumulate error counts
+            @param num_workers maximum number of tasks to run at once
+    """
+    clock_time_obj = datetime.datetime.strptime(config.getstr('config', 'CLOCK_TIME'),
+                                                '%Y%m%d%H%M%S')
+    use_init = is_loop_by_init(config)
+
+    run_times = get_run_times(config)
+    if not run_times:
+        return None
+
+    dependencies = get_pipeline_dependencies(config, process_list, processes)
+    if dependencies is None:
+        processes[0].errors += 1
+        return None
+
+    for index, producers in dependencies.items():
+        for producer in producers:
+            config.logger.info(f"{process_list[index]} depends on output "
+                               f"from {process_list[producer]}")
+
+    # build task graph. Each task is identified by a tuple of the run time
+    # index, process index, and custom string index so that tasks that are
+    # ready to run are started in the same order as LOOP_ORDER = times.
+    # A task depends on the tasks for every custom string of the wrappers it
+    # depends on because it may read any of their output
+    custom_lists = [process.c_dict['CUSTOM_LOOP_LIST'] for process in processes]
+    waiting_on = {}
+    dependents = {}
+    for time_index in range(len(run_times)):
+        for index, custom_list in enumerate(custom_lists):
+            for custom_index in range(len(custom_list)):
+                task = (time_index, index, custom_index)
+                dependents[task] = []
+                waiting_on[task] = set()
+                for producer in dependencies[index]:
+                    for producer_custom in range(len(custom_lists[producer])):
+                        producer_task = (time_index, producer, producer_custom)
+                        waiting_on[task].add(producer_task)
+                        dependents[producer_task].append(task)
+
+    worker_type, executor, task_config = get_loop_order_executor(config,
+                                                                 num_workers)
+    if executor is None:
+        processes[0].errors += 1
+        return None
+
+    config.logger.info(f"Processing {len(waiting_on)} tasks using "
+                       f"{num_workers} {worker_type} workers")
+
+    ready = [task for task, producers in waiting_on.items() if not producers]
+    heapq.heapify(ready)
+    running = {}
+    with executor:
+        while ready or running:
+            # start the earliest tasks that are ready until all workers are busy
+            while ready and len(running) < num_workers:
+                task = heapq.heappop(ready)
+                time_index, index, custom_index = task
+                run_time_obj = run_times[time_index]
+                log_run_time_header(config, run_time_obj, use_init)
+                future = executor.submit(run_process_at_time_once,
+                                         process_list[index],
+                                         get_input_dict(run_time_obj, use_init,
+                                                        clock_time_obj),
+                                         custom_lists[index][custom_index],
+                                         task_config)
+                running[future] = task
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                time_index, index, _ = task
+                try:
+                    processes[index].errors += future.result()
+                except Exception:
+                    config.logger.exception(f"Fatal error occurred running {process_list[index]} at "
+                                            f"{run_times[time_index].strftime('%Y%m%d%H%M')}")
+                    processes[index].errors += 1
+
+                # tasks that depend on this task are ready to run if all of
+                # the tasks they depend on have finished
+                for dependent in dependents[task]:
+                    waiting_on[dependent].discard(task)
+                    if not waiting_on[dependent]:
+                        heapq.heappush(ready, dependent)
+
+def run_jobs(jobs, num_workers=1, logger=None):
+    """!Run a list of jobs using up to num_workers threads. Each job is a
+        tuple of a name, a function that is called with no arguments, and a
+        list of indices of jobs in the list that must finish before it can
+        start. Jobs that are ready to run are started in the order they
+        appear in the list, so running with 1 worker is the same as running
+        the jobs in a loop. The time each job takes is logged.
+        Args:
+            @param jobs list of (name, function, dependencies) tuples
+            @param num_workers maximum number of jobs to run at once
+            @param logger optional logger to write timing and errors
+            @returns list of the values returned by each function in the same
+             order as jobs. The value is None if the function raised an
+             exception
+    """
+    results = [None] * len(jobs)
+    if not jobs:
+        return results
+
+    num_workers = max(1, num_workers)
+    waiting_on = {index: set(dependencies)
+                  for index, (_, _, dependencies) in enumerate(jobs)}
+    dependents = {index: [] for index in range(len(jobs))}
+    for index, producers in waiting_on.items():
+        for producer in producers:
+            dependents[producer].append(index)
+
+    def timed_job(func):
+        start_time = datetime.datetime.now()
+        return func(), datetime.datetime.now() - start_time
+
+    ready = [index for index, producers in waiting_on.items() if not producers]
+    heapq.heapify(ready)
+    running = {}
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        while ready or running:
+            while ready and len(running) < num_workers:
+                index = heapq.heappop(ready)
+                running[executor.submit(timed_job, jobs[index][1])] = index
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda item: running[item]):
+                index = running.pop(future)
+                name = jobs[index][0]
+                try:
+                    results[index], elapsed = future.result()
+                    if logger:
+                        logger.info(f"Finished job {name} in {elapsed}")
+                except Exception:
+                    if logger:
+                        logger.exception(f"Fatal error occurred running job {name}")
+
+                for dependent in dependents[index]:
+                    waiting_on[dependent].discard(index)
+                    if not waiting_on[dependent]:
+                        heapq.heappush(ready, dependent)
+
+    return results
 
 def get_lead_sequence(config, input_dict=None):
     """!Get forecast lead list from LEAD_SEQ or compute it from INIT_SEQ.
@@ -950,7 +1544,26 @@ def get_lead_sequence(config, input_dict=None):
                valid key if processing INIT_SEQ
             @returns list of relativedelta objects or a list containing 0 if none are found
     """
+    # the list only depends on the valid hour if using INIT_SEQ, so it is
+    # computed once for each hour (or once if using LEAD_SEQ) and saved
+    # until the config variables that were used to compute it are changed
+    if (config.has_option('config', 'LEAD_SEQ') or
+            input_dict is None or 'valid' not in input_dict):
+        valid_hour = None
+    else:
+        valid_hour = input_dict['valid'].hour
+
+    return list(config.get_cached(('lead_sequence', valid_hour),
+                                  lambda: _get_lead_sequence(config,
+                                                             input_dict)))
 
+def _get_lead_sequence(config, input_dict):
+    """!Compute the forecast lead list for get_lead_sequence
+        Args:
+            @param config METplusConfig object to query config variable values
+            @param input_dict time dictionary needed to handle using INIT_SEQ
+            @returns list of relativedelta objects or a list containing 0 if none are found
+    """
     out_leads = []
 
     if config.has_option('config', 'LEAD_SEQ'):
@@ -1431,26 +2044,40 @@ def get_storm_ids(filter_filename, logger):
         Returns:
             sorted_storms (List):  a list of unique, sorted storm ids
     """
-    # Initialize a set because we want unique storm ids.
-    storm_id_list = set()
-    empty_list = []
+    # sort the unique storm ids found in the STORM_ID column
+    _, storm_rows = get_storm_rows(filter_filename)
+    return sorted(storm_rows)
+
 
-    # Check if the filter_filename is empty, if it
-    # is, then return an empty list.
+def get_storm_rows(filter_filename):
+    """! Read a filter file once and group its rows by the value in the
+        STORM_ID column.
+        Args:
+            @param filter_filename:  The name of the filter file to read
+        Returns:
+            tuple of the list of column names from the header and a
+            dictionary where the keys are the storm ids and the values are
+            lists of rows for that storm in the order they appear in the
+            file. Each row is a list of column values. The header is None
+            and the dictionary is empty if the file does not exist or is
+            empty
+    """
+    storm_rows = {}
     if not os.path.isfile(filter_filename):
-        return empty_list
+        return None, storm_rows
     if os.stat(filter_filename).st_size == 0:
-        return empty_list
+        return None, storm_rows
+
     with open(filter_filename, "r") as fileobj:
         header = fileobj.readline().split()
         header_colnum = header.index('STORM_ID')
         for line in fileobj:
-            storm_id_list.add(str(line.split()[header_colnum]))
+            columns = line.split()
+            if len(columns) <= header_colnum:
+                continue
+            storm_rows.setdefault(columns[header_colnum], []).append(columns)
 
-    # sort the unique storm ids, copy the original
-    # set by using sorted rather than sort.
-    sorted_storms = sorted(storm_id_list)
-    return sorted_storms
+    return header, storm_rows
 
 
 def get_files(filedir, filename_regex, logger):
@@ -1549,7 +2176,8 @@ def extract_year_month(init_time, logger):
         raise Warning("Cannot extract YYYYMM from initialization time,"
                       " unexpected format")
 
-def create_grid_specification_string(lat, lon, logger, config):
+def create_grid_specification_string(lat, lon, logger, config,
+                                     tile_settings=None):
     """! Create the grid specification string with the format:
          latlon Nx Ny lat_ll lon_ll delta_lat delta_lon
          used by the MET tool, regrid_data_plane.
@@ -1558,6 +2186,10 @@ def create_grid_specification_string(lat, lon, logger, config):
             @param lon:   The longitude of the grid point
             @param logger: The name of the logger
             @param config: config instance
+            @param tile_settings: optional dictionary containing the values
+             of the EXTRACT_TILES_[NLAT/NLON/DLAT/DLON/LON_ADJ/LAT_ADJ]
+             config variables with keys nlat, nlon, dlat, dlon, lon_subtr,
+             and lat_subtr so they do not need to be read for each grid point
          Returns:
             tile_grid_str (string): the tile grid string for the
                                     input lon and lat
@@ -1569,12 +2201,20 @@ def create_grid_specification_string(lat, lon, logger, config):
 
     # Initialize the tile grid string
     # and get the other values from the parameter file
-    nlat = config.getstr('config', 'EXTRACT_TILES_NLAT')
-    nlon = config.getstr('config', 'EXTRACT_TILES_NLON')
-    dlat = config.getstr('config', 'EXTRACT_TILES_DLAT')
-    dlon = config.getstr('config', 'EXTRACT_TILES_DLON')
-    lon_subtr = config.getfloat('config', 'EXTRACT_TILES_LON_ADJ')
-    lat_subtr = config.getfloat('config', 'EXTRACT_TILES_LAT_ADJ')
+    if tile_settings:
+        nlat = tile_settings['nlat']
+        nlon = tile_settings['nlon']
+        dlat = tile_settings['dlat']
+        dlon = tile_settings['dlon']
+        lon_subtr = tile_settings['lon_subtr']
+        lat_subtr = tile_settings['lat_subtr']
+    else:
+        nlat = config.getstr('config', 'EXTRACT_TILES_NLAT')
+        nlon = config.getstr('config', 'EXTRACT_TILES_NLON')
+        dlat = config.getstr('config', 'EXTRACT_TILES_DLAT')
+        dlon = config.getstr('config', 'EXTRACT_TILES_DLON')
+        lon_subtr = config.getfloat('config', 'EXTRACT_TILES_LON_ADJ')
+        lat_subtr = config.getfloat('config', 'EXTRACT_TILES_LAT_ADJ')
 
     # Format for regrid_data_plane:
     # latlon Nx Ny lat_ll lon_ll delta_lat delta_lonadj_lon =
@@ -2347,6 +2987,23 @@ def get_var_items(config, data_type, index, time_info, met_tool=None):
             @returns tuple containing name, level, thresh, extra values if found. If not found
                4 empty strings are returned.
     """
+    var_item_templates = get_var_item_templates(config, data_type, index,
+                                                met_tool=met_tool)
+    return sub_var_item_templates(var_item_templates, time_info)
+
+def get_var_item_templates(config, data_type, index, met_tool=None):
+    """!Get configuration variables for given data type and index before
+        filling in the filename template tags
+        Args:
+            @param config: METplusConfig object
+            @param data_type: type of data to find, i.e. FCST, OBS, BOTH, or ENS
+            @param index: index of variable, i.e. _VAR<index>_NAME
+            @param met_tool: optional name of MET tool to look for wrapper specific items
+            @returns tuple containing name template, list of level templates,
+               list of thresholds, and extra template (or None if not set).
+               None is returned if the name is not found or the thresholds
+               are invalid
+    """
 
     # build string to search for BOTH items, using MET tool name if provided
     # do the same for data_type, i.e. FCST
@@ -2362,33 +3019,23 @@ def get_var_items(config, data_type, index, time_info, met_tool=None):
 
     # get field variable name from data type name
     # look for BOTH_VAR<n>_NAME if looking for FCST or OBS (not ENS)
-    # return empty strings if name cannot be found from either
+    # return None if name cannot be found from either
     if data_type in ['FCST', 'OBS'] and config.has_option('config', f"{both_var}{index}_NAME"):
         search_name = f"{both_var}{index}_NAME"
     elif config.has_option('config', f"{data_type_var}{index}_NAME"):
         search_name = f"{data_type_var}{index}_NAME"
     else:
-        return '', '', '', ''
+        return None
 
-    name = do_string_sub(config.getraw('config', search_name),
-                         **time_info)
+    name = config.getraw('config', search_name)
 
     # get levels if available
-    levels = []
     if data_type in ['FCST', 'OBS'] and config.has_option('config', f"{both_var}{index}_LEVELS"):
         search_levels = f"{both_var}{index}_LEVELS"
     else:
         search_levels = f"{data_type_var}{index}_LEVELS"
 
-    levels = []
-    for level in getlist(config.getraw('config', search_levels, '')):
-        subbed_level = do_string_sub(level,
-                                     **time_info)
-        levels.append(subbed_level)
-
-    # if no levels are found, add an empty string
-    if not levels:
-        levels.append('')
+    levels = getlist(config.getraw('config', search_levels, ''))
 
     # get thresholds if available
     thresh = []
@@ -2403,10 +3050,10 @@ def get_var_items(config, data_type, index, time_info, met_tool=None):
         thresh = getlist(config.getstr('config', search_thresh))
         if not validate_thresholds(thresh):
             config.logger.error(f"  Update {search_thresh} to match this format")
-            return '', '', '', ''
+            return None
 
     # get extra options if available
-    extra = ""
+    extra = None
     if data_type in ['FCST', 'OBS'] and config.has_option('config', f"{both_var}{index}_OPTIONS"):
         search_extra = f"{both_var}{index}_OPTIONS"
     elif config.has_option('config', f"{data_type_var}{index}_OPTIONS"):
@@ -2415,7 +3062,39 @@ def get_var_items(config, data_type, index, time_info, met_tool=None):
         search_extra = None
 
     if search_extra:
-        extra = do_string_sub(config.getraw('config', search_extra),
+        extra = config.getraw('config', search_extra)
+
+    return name, levels, thresh, extra
+
+def sub_var_item_templates(var_item_templates, time_info):
+    """!Fill in the filename template tags in the values returned from
+        get_var_item_templates
+        Args:
+            @param var_item_templates: tuple returned by get_var_item_templates
+            @param time_info: time dictionary used to fill in the templates
+            @returns tuple containing name, level, thresh, extra values. If
+               var_item_templates is None, 4 empty strings are returned.
+    """
+    if var_item_templates is None:
+        return '', '', '', ''
+
+    name_template, level_templates, thresh, extra_template = var_item_templates
+    name = do_string_sub(name_template,
+                         **time_info)
+
+    levels = []
+    for level in level_templates:
+        subbed_level = do_string_sub(level,
+                                     **time_info)
+        levels.append(subbed_level)
+
+    # if no levels are found, add an empty string
+    if not levels:
+        levels.append('')
+
+    extra = ""
+    if extra_template is not None:
+        extra = do_string_sub(extra_template,
                               **time_info)
 
         # split up each item by semicolon, then add a semicolon to the end of each item
@@ -2424,7 +3103,7 @@ def get_var_items(config, data_type, index, time_info, met_tool=None):
         extra_list = list(filter(None, extra.split(';')))
         extra = f"{'; '.join(extra_list)};"
 
-    return name, levels, thresh, extra
+    return name, levels, list(thresh), extra
 
 def find_var_name_indices(config, data_type, met_tool=None):
 
@@ -2447,36 +3126,45 @@ def find_var_name_indices(config, data_type, met_tool=None):
                                           config,
                                           'config')
 
-def parse_var_list(config, time_info=None, data_type=None, met_tool=None):
-    """ read conf items and populate list of dictionaries containing
-    information about each variable to be compared
+def get_field_info_index(config, data_type=None, met_tool=None):
+    """!Get the field information (_VAR<n>_ config variables) for each
+        index before filling in the filename template tags. The result is
+        saved in the config object and reused until any of the config
+        variables that were used to read it are modified, so the config
+        variables are only searched and validated once.
         Args:
             @param config: METplusConfig object
-            @param time_info: time object for string sub, optional
             @param data_type: data type to find. Can be FCST, OBS, or ENS. If not set, get FCST/OBS/BOTH
             @param met_tool: optional name of MET tool to look for wrapper specific var items
         Returns:
-            list of dictionaries with variable information
+            list of tuples containing the index and a dictionary of the
+            values from get_var_item_templates for each data type, or None
+            if the field information is not valid
+    """
+    # the index is read again if any of the options that were used to build
+    # it have changed or if an option was added, i.e. a new _VAR<n>_ item
+    return config.get_cached(('field_info_index', data_type, met_tool),
+                             lambda: _build_field_info_index(config,
+                                                             data_type,
+                                                             met_tool),
+                             check_section='config')
+
+def _build_field_info_index(config, data_type, met_tool):
+    """!Read the field information for get_field_info_index
+        Args:
+            @param config: METplusConfig object
+            @param data_type: data type to find. Can be FCST, OBS, or ENS. If not set, get FCST/OBS/BOTH
+            @param met_tool: optional name of MET tool to look for wrapper specific var items
+        Returns:
+            list of tuples containing the index and a dictionary of the
+            values from get_var_item_templates for each data type, or None
+            if the field information is not valid
     """
-
     # validate configs again in case wrapper is not running from master_metplus
     # this does not need to be done if parsing a specific data type, i.e. ENS or FCST
     if data_type is None:
         if not validate_field_info_configs(config)[0]:
-            return []
-    elif data_type == 'BOTH':
-        config.logger.error("Cannot request BOTH explicitly in parse_var_list")
-        return []
-
-    # if time_info is not passed in, set 'now' to CLOCK_TIME
-    # NOTE: any attempt to use string template substitution with an item other than
-    #  'now' will fail if time_info is not passed into parse_var_list
-    if time_info is None:
-        time_info = { 'now' : datetime.datetime.strptime(config.getstr('config', 'CLOCK_TIME'),
-                                                         '%Y%m%d%H%M%S') }
-
-    # var_list is a list containing an list of dictionaries
-    var_list = []
+            return None
 
     # check if *_<MET-tool>_VAR<n>_NAME exists, if so, use that instead of generic
     data_types_and_indices = {}
@@ -2488,18 +3176,63 @@ def parse_var_list(config, time_info=None, data_type=None, met_tool=None):
 
     if not data_types_and_indices:
         data_types_and_indices = find_var_name_indices(config, data_type)
-    # if found wrapper specific fields, pass the MET tool name to get_var_items
+    # if found wrapper specific fields, pass the MET tool name to get_var_item_templates
     else:
         use_met_tool = met_tool
 
+    search_data_types = [data_type] if data_type else ['FCST', 'OBS']
+    field_info_index = []
+    for index in data_types_and_indices:
+        var_item_templates = {}
+        for search_data_type in search_data_types:
+            var_item_templates[search_data_type] = (
+                get_var_item_templates(config, search_data_type, index,
+                                       met_tool=use_met_tool)
+            )
+        field_info_index.append((index, var_item_templates))
+
+    return field_info_index
+
+def parse_var_list(config, time_info=None, data_type=None, met_tool=None):
+    """ read conf items and populate list of dictionaries containing
+    information about each variable to be compared
+        Args:
+            @param config: METplusConfig object
+            @param time_info: time object for string sub, optional
+            @param data_type: data type to find. Can be FCST, OBS, or ENS. If not set, get FCST/OBS/BOTH
+            @param met_tool: optional name of MET tool to look for wrapper specific var items
+        Returns:
+            list of dictionaries with variable information
+    """
+    if data_type == 'BOTH':
+        config.logger.error("Cannot request BOTH explicitly in parse_var_list")
+        return []
+
+    # get the field information that was already read from the config
+    field_info_index = get_field_info_index(config, data_type, met_tool)
+    if field_info_index is None:
+        return []
+
+    # if time_info is not passed in, set 'now' to CLOCK_TIME
+    # NOTE: any attempt to use string template substitution with an item other than
+    #  'now' will fail if time_info is not passed into parse_var_list
+    if time_info is None:
+        time_info = { 'now' : datetime.datetime.strptime(config.getstr('config', 'CLOCK_TIME'),
+                                                         '%Y%m%d%H%M%S') }
+
+    # var_list is a list containing an list of dictionaries
+    var_list = []
+
     # loop over all possible variables and add them to list
-    for index, data_type_list in data_types_and_indices.items():
+    for index, var_item_templates in field_info_index:
 
         # if specific data type is requested, only get that type
         if data_type:
             data_type_lower = data_type.lower()
-            name, levels, thresh, extra = get_var_items(config, data_type, index, time_info,
-                                                        met_tool=use_met_tool)
+            name, levels, thresh, extra = (
+                sub_var_item_templates(var_item_templates[data_type],
+                                       time_info)
+            )
 
             if not name:
                 continue
@@ -2515,12 +3248,12 @@ def parse_var_list(config, time_info=None, data_type=None, met_tool=None):
 
         # if FCST and OBS or BOTH are used, get and set both of them
         else:
-            f_name, f_levels, f_thresh, f_extra = get_var_items(config, 'FCST', index,
-                                                                time_info,
-                                                                met_tool=use_met_tool)
-            o_name, o_levels, o_thresh, o_extra = get_var_items(config, 'OBS', index,
-                                                                time_info,
-                                                                met_tool=use_met_tool)
+            f_name, f_levels, f_thresh, f_extra = (
+                sub_var_item_templates(var_item_templates['FCST'], time_info)
+            )
+            o_name, o_levels, o_thresh, o_extra = (
+                sub_var_item_templates(var_item_templates['OBS'], time_info)
+            )
 
             # if number of levels are not equal, return an empty list
             if len(f_levels) != len(o_levels):
@@ -2737,6 +3470,139 @@ def get_time_from_file(filepath, template, logger=None):
 
     return None
 
+# index of the files under an input directory and the valid time of each
+# file parsed using a filename template. Keyed by (input dir, template).
+# Used to find files within a time window without walking the directory
+# and parsing every filename for each run time
+_file_time_index = {}
+_file_time_index_lock = threading.Lock()
+
+# number of seconds that a directory modification time must be older than the
+# time it was scanned to trust that no files were added in the same second
+FILE_INDEX_MTIME_GRACE = 2
+
+def get_file_valid_seconds(valid_time):
+    """!Convert datetime object to number of seconds since epoch in UTC"""
+    return calendar.timegm(valid_time.timetuple())
+
+def _scan_index_directory(dirpath, data_dir, template, logger):
+    """!List a directory and parse the valid time of each file in it
+        Args:
+            @param dirpath directory to scan
+            @param data_dir top level input directory used to get the relative
+             path that is compared to the template
+            @param template filename template to use to extract time information
+            @param logger log object passed to the template parsing function
+            @returns tuple of list of subdirectories and list of tuples
+             containing valid time in seconds and full path of each file that
+             matches the template
+    """
+    subdirs = []
+    file_times = []
+    try:
+        entries = sorted(os.scandir(dirpath), key=lambda entry: entry.name)
+    except OSError:
+        return subdirs, file_times
+
+    for entry in entries:
+        if entry.is_dir():
+            # do not follow symbolic links to directories, like os.walk
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+            continue
+
+        # remove input data directory to get relative path
+        rel_path = entry.path.replace(f'{data_dir}/', "")
+        file_time_info = get_time_from_file(rel_path, template, logger)
+        if file_time_info is None or not file_time_info.get('valid'):
+            continue
+
+        file_times.append((get_file_valid_seconds(file_time_info['valid']),
+                           entry.path))
+
+    return subdirs, file_times
+
+def _refresh_file_time_index(index, data_dir, template, logger):
+    """!Rescan directories whose modification time changed since they were
+        last scanned and rebuild the sorted list of valid times if needed
+        Args:
+            @param index dictionary for an input dir and template combination
+            @param data_dir top level input directory
+            @param template filename template to use to extract time information
+            @param logger log object
+    """
+    dirs = index['dirs']
+    seen = set()
+    changed = False
+    scan_time = time.time()
+    stack = [data_dir]
+    while stack:
+        dirpath = stack.pop()
+        seen.add(dirpath)
+        try:
+            mtime = os.stat(dirpath).st_mtime
+        except OSError:
+            continue
+
+        cached = dirs.get(dirpath)
+        if cached and cached[0] is not None and cached[0] == mtime:
+            stack.extend(cached[1])
+            continue
+
+        subdirs, file_times = _scan_index_directory(dirpath, data_dir,
+                                                    template, logger)
+
+        # do not trust modification time if it is too close to the scan time
+        # because files could be added without changing it again
+        if scan_time - mtime < FILE_INDEX_MTIME_GRACE:
+            mtime = None
+
+        dirs[dirpath] = (mtime, subdirs, file_times)
+        changed = True
+        stack.extend(subdirs)
+
+    # remove directories that no longer exist
+    for dirpath in [dirpath for dirpath in dirs if dirpath not in seen]:
+        del dirs[dirpath]
+        changed = True
+
+    if not changed:
+        return
+
+    all_times = sorted(file_time for cached in dirs.values()
+                       for file_time in cached[2])
+    index['times'] = [file_time[0] for file_time in all_times]
+    index['paths'] = [file_time[1] for file_time in all_times]
+
+def get_files_in_time_window(data_dir, template, lower_limit, upper_limit,
+                             logger=None):
+    """!Find files under a directory with a valid time within a range. The
+        files are indexed the first time a directory/template combination is
+        searched. Subsequent calls only rescan directories that have been
+        modified since they were last scanned.
+        Args:
+            @param data_dir directory to search
+            @param template filename template relative to data_dir used to
+             extract time information
+            @param lower_limit lower bound of range in seconds since epoch
+            @param upper_limit upper bound of range in seconds since epoch
+            @param logger log object
+            @returns list of tuples containing the valid time in seconds and
+             the full path of each file in the range, sorted by path
+    """
+    with _file_time_index_lock:
+        index = _file_time_index.setdefault((data_dir, template),
+                                            {'dirs': {},
+                                             'times': [],
+                                             'paths': []})
+        _refresh_file_time_index(index, data_dir, template, logger)
+
+        start = bisect_left(index['times'], lower_limit)
+        end = bisect_right(index['times'], upper_limit)
+        files = list(zip(index['times'][start:end], index['paths'][start:end]))
+
+    return sorted(files, key=lambda file_time: file_time[1])
+
 def preprocess_file(filename, data_type, config, allow_dir=False):
     """ Decompress gzip, bzip, or zip files or convert Gempak files to NetCDF
         Args:
@@ -2802,45 +3668,333 @@ def preprocess_file(filename, data_type, config, allow_dir=False):
     if os.path.isfile(filename[:-2]+'grd'):
         return preprocess_file(filename[:-2]+'grd', data_type, config)
 
-    # if file exists in the staging area, return that path
+    # uncompress gz, bz2, or zip file into the staging area unless it was
+    # already uncompressed from the same version of the file
     outpath = stage_dir + filename
+    for ext in VALID_EXTENSIONS:
+        if os.path.isfile(filename+ext):
+            # Create staging area if it does not exist
+            os.makedirs(os.path.dirname(outpath), mode=0o0775, exist_ok=True)
+            return stage_compressed_file(filename+ext, outpath, config)
+
+    # if file exists in the staging area, return that path
     if os.path.isfile(outpath):
         return outpath
 
-    # Create staging area if it does not exist
-    outdir = os.path.dirname(outpath)
-    if not os.path.exists(outdir):
-        os.makedirs(outdir, mode=0o0775)
-
-    # uncompress gz, bz2, or zip file
-    if os.path.isfile(filename+".gz"):
-        if config.logger:
-            config.logger.debug("Uncompressing gz file to {}".format(outpath))
-        with gzip.open(filename+".gz", 'rb') as infile:
-            with open(outpath, 'wb') as outfile:
-                outfile.write(infile.read())
-                infile.close()
-                outfile.close()
-                return outpath
-    elif os.path.isfile(filename+".bz2"):
-        if config.logger:
-            config.logger.debug("Uncompressing bz2 file to {}".format(outpath))
-        with open(filename+".bz2", 'rb') as infile:
-            with open(outpath, 'wb') as outfile:
-                outfile.write(bz2.decompress(infile.read()))
-                infile.close()
-                outfile.close()
-                return outpath
-    elif os.path.isfile(filename+".zip"):
-        if config.logger:
-            config.logger.debug("Uncompressing zip file to {}".format(outpath))
-        with zipfile.ZipFile(filename+".zip") as z:
-            with open(outpath, 'wb') as f:
-                f.write(z.read(os.path.basename(filename)))
-                return outpath
-
     return None
 
+def get_staging_key(source_path):
+    """!Get the value used to check if a staged file was created from the
+        current version of a compressed file
+        Args:
+            @param source_path path to compressed file
+            @returns string containing the absolute path, size, and
+             modification time of the compressed file
+    """
+    stat_info = os.stat(source_path)
+    return (f"{os.path.abspath(source_path)} {stat_info.st_size} "
+            f"{stat_info.st_mtime_ns}")
+
+def is_staged_file_current(outpath, key):
+    """!Check if a staged file exists and was created from the compressed
+        file described by key
+        Args:
+            @param outpath path to staged file
+            @param key value returned by get_staging_key
+            @returns True if the staged file can be used, False if not
+    """
+    try:
+        with open(outpath + STAGING_KEY_EXT, 'r') as key_file:
+            if key_file.read() != key:
+                return False
+    except OSError:
+        return False
+
+    return os.path.isfile(outpath)
+
+def write_file_atomically(outpath, write_function, mode=0o664):
+    """!Write a file to a temporary file in the same directory and rename it
+        to outpath so other processes never read a partially written file
+        Args:
+            @param outpath path of file to write
+            @param write_function function that is called with the open
+             binary file handle to write the contents of the file
+            @param mode permissions to set on the file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(outpath),
+                                    prefix=f'.{os.path.basename(outpath)}.')
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            write_function(outfile)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, outpath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def decompress_file(source_path, outpath):
+    """!Decompress a gzip, bzip2, or zip file a chunk at a time so the
+        entire file is never held in memory. The zip file must contain a file
+        with the same name as outpath.
+        Args:
+            @param source_path path to compressed file
+            @param outpath path of decompressed file to write
+    """
+    def write_function(outfile):
+        if source_path.endswith('.gz'):
+            with gzip.open(source_path, 'rb') as infile:
+                shutil.copyfileobj(infile, outfile, STAGING_CHUNK_SIZE)
+        elif source_path.endswith('.bz2'):
+            with bz2.open(source_path, 'rb') as infile:
+                shutil.copyfileobj(infile, outfile, STAGING_CHUNK_SIZE)
+        else:
+            with zipfile.ZipFile(source_path) as zip_file:
+                with zip_file.open(os.path.basename(outpath)) as infile:
+                    shutil.copyfileobj(infile, outfile, STAGING_CHUNK_SIZE)
+
+    write_file_atomically(outpath, write_function)
+
+# staged files that are in use by this process keyed by path. Each item is
+# a dictionary containing the open lock file, the number of times the file
+# was returned by stage_compressed_file and not released yet, and a lock
+# that is held while a thread checks or stages the file. A shared lock is
+# held on the lock file while the staged file is in use so that it is not
+# removed by remove_least_recently_used_staged_files in any process
+_staged_files_in_use = {}
+_staged_files_lock = threading.Lock()
+
+# paths of the staged files that are in use by the current thread
+_staged_files_thread = threading.local()
+
+def _reset_staged_files_in_use():
+    """!Forget the staged files that are in use by the parent process in a
+        forked process. The locks are still held by the parent process.
+    """
+    global _staged_files_lock
+    _staged_files_in_use.clear()
+    _staged_files_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_staged_files_in_use)
+
+def lock_staging_file(lock_path, operation, lock_file=None):
+    """!Lock the lock file of a staged file with fcntl.flock. The lock file
+        is removed when a staged file is removed, so the file is opened
+        again if it was removed or replaced before the lock was acquired.
+        Args:
+            @param lock_path path of the lock file
+            @param operation flock operation, i.e. fcntl.LOCK_SH
+            @param lock_file open lock file to lock. If not set or if it is
+             not the current lock file, the lock file is opened
+            @returns open lock file that holds the lock. The lock is
+             released when the file is closed
+            @throws OSError if LOCK_NB is set and the lock is held by another
+             process
+    """
+    while True:
+        if lock_file is None:
+            lock_file = open(lock_path, 'a')
+
+        try:
+            fcntl.flock(lock_file, operation)
+        except OSError:
+            lock_file.close()
+            raise
+
+        try:
+            if os.fstat(lock_file.fileno()).st_ino == os.stat(lock_path).st_ino:
+                return lock_file
+        except FileNotFoundError:
+            pass
+
+        lock_file.close()
+        lock_file = None
+
+def release_staged_files():
+    """!Release the staged files that were returned by stage_compressed_file
+        in the current thread so they can be removed to keep the staging
+        directory under STAGING_CACHE_MAX_SIZE_MB. Called after the commands
+        that read the files have finished.
+    """
+    paths = getattr(_staged_files_thread, 'paths', [])
+    _staged_files_thread.paths = []
+    for outpath in paths:
+        _release_staged_file(outpath)
+
+def _release_staged_file(outpath):
+    with _staged_files_lock:
+        entry = _staged_files_in_use[outpath]
+        entry['count'] -= 1
+        if entry['count'] > 0:
+            return
+
+        del _staged_files_in_use[outpath]
+        if entry['lock_file'] is not None:
+            entry['lock_file'].close()
+
+def stage_compressed_file(source_path, outpath, config):
+    """!Decompress a file into the staging directory unless it has already
+        been decompressed from the same version of the file. An exclusive
+        lock is held while decompressing so that other processes wait for
+        the file to be staged instead of decompressing it again. A shared
+        lock is held after the file is staged until release_staged_files is
+        called from the same thread so the file is not removed while it is
+        in use. If STAGING_CACHE_MAX_SIZE_MB is greater than 0, the least
+        recently used staged files that are not in use are removed until the
+        staging cache is smaller than that size.
+        Args:
+            @param source_path path to compressed file
+            @param outpath path of decompressed file in the staging directory
+            @param config METplusConfig object
+            @returns outpath
+    """
+    key = get_staging_key(source_path)
+    key_path = outpath + STAGING_KEY_EXT
+    lock_path = outpath + STAGING_LOCK_EXT
+
+    with _staged_files_lock:
+        entry = _staged_files_in_use.setdefault(outpath,
+                                                {'lock_file': None,
+                                                 'count': 0,
+                                                 'mutex': threading.Lock()})
+        entry['count'] += 1
+
+    staged = False
+    try:
+        with entry['mutex']:
+            # converting between shared and exclusive locks is not atomic,
+            # so check the file again each time the shared lock is acquired
+            # in case it was removed by another process
+            while True:
+                entry['lock_file'] = lock_staging_file(lock_path,
+                                                       fcntl.LOCK_SH,
+                                                       entry['lock_file'])
+                if is_staged_file_current(outpath, key):
+                    break
+
+                entry['lock_file'] = lock_staging_file(lock_path,
+                                                       fcntl.LOCK_EX,
+                                                       entry['lock_file'])
+                try:
+                    # another process may have staged the file while waiting
+                    if not is_staged_file_current(outpath, key):
+                        staged = True
+                        if config.logger:
+                            config.logger.debug(f"Uncompressing {source_path} "
+                                                f"to {outpath}")
+                        decompress_file(source_path, outpath)
+                        write_file_atomically(key_path,
+                                              lambda key_file:
+                                              key_file.write(key.encode()))
+                except BaseException:
+                    # other threads may still be using the file
+                    fcntl.flock(entry['lock_file'], fcntl.LOCK_SH)
+                    raise
+    except BaseException:
+        _release_staged_file(outpath)
+        raise
+
+    if not staged and config.logger:
+        config.logger.debug(f"Using staged file {outpath}")
+
+    if not hasattr(_staged_files_thread, 'paths'):
+        _staged_files_thread.paths = []
+    _staged_files_thread.paths.append(outpath)
+
+    # update modification time of key file to track when it was last used
+    try:
+        os.utime(key_path)
+    except FileNotFoundError:
+        pass
+
+    max_size = config.getint('config', 'STAGING_CACHE_MAX_SIZE_MB', 0)
+    if max_size and max_size > 0:
+        remove_least_recently_used_staged_files(config.getdir('STAGING_DIR'),
+                                                max_size * 1024 * 1024,
+                                                logger=config.logger)
+
+    return outpath
+
+def remove_least_recently_used_staged_files(stage_dir, max_size, keep=None,
+                                            logger=None):
+    """!Remove decompressed files from the staging directory, starting with
+        the files that were used least recently, until the total size of the
+        decompressed files is not greater than max_size. Files that are in
+        use or being staged by any process are not removed. Lock files that
+        no longer have a staged file are also removed.
+        Args:
+            @param stage_dir staging directory
+            @param max_size maximum total size of staged files in bytes
+            @param keep path of staged file that should not be removed
+            @param logger optional logger to output files that are removed
+    """
+    staged_files = []
+    orphaned_lock_paths = []
+    for root, _, files in os.walk(stage_dir):
+        for filename in files:
+            if filename.endswith(STAGING_LOCK_EXT):
+                lock_path = os.path.join(root, filename)
+                key_path = lock_path[:-len(STAGING_LOCK_EXT)] + STAGING_KEY_EXT
+                if not os.path.exists(key_path):
+                    orphaned_lock_paths.append(lock_path)
+                continue
+
+            if not filename.endswith(STAGING_KEY_EXT):
+                continue
+
+            key_path = os.path.join(root, filename)
+            staged_path = key_path[:-len(STAGING_KEY_EXT)]
+            try:
+                staged_files.append((os.path.getmtime(key_path),
+                                     staged_path,
+                                     os.path.getsize(staged_path)))
+            except OSError:
+                continue
+
+    remove_paths = []
+    total_size = sum(size for _, _, size in staged_files)
+    for _, staged_path, size in sorted(staged_files):
+        if total_size <= max_size:
+            break
+
+        if staged_path == keep:
+            continue
+
+        remove_paths.append((staged_path, size))
+        total_size -= size
+
+    remove_paths.extend((lock_path[:-len(STAGING_LOCK_EXT)], None)
+                        for lock_path in orphaned_lock_paths)
+
+    for staged_path, size in remove_paths:
+        # skip files that are in use by this process. Files that are in use
+        # by another process hold a shared lock, so the exclusive lock fails
+        with _staged_files_lock:
+            if staged_path in _staged_files_in_use:
+                continue
+
+        lock_path = staged_path + STAGING_LOCK_EXT
+        try:
+            lock_file = lock_staging_file(lock_path,
+                                          fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            continue
+
+        with lock_file:
+            # file may have been staged again before the lock was acquired
+            if size is None and os.path.exists(staged_path + STAGING_KEY_EXT):
+                continue
+
+            for path in (staged_path + STAGING_KEY_EXT, staged_path,
+                         lock_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        if logger and size is not None:
+            logger.debug(f"Removed least recently used staged file {staged_path}")
+
 def run_stand_alone(filename, app_name):
     """ Used to allow MET tool wrappers to be run without using
     master_metplus.py
@@ -11,6 +11,7 @@ Output Files: N/A
 
 import datetime
 from dateutil.relativedelta import relativedelta
+from functools import lru_cache
 import re
 
 '''!@namespace TimeInfo
@@ -21,6 +22,25 @@ to be used in other METplus wrappers
 @endcode
 '''
 
+# number of time dictionaries computed by ti_calculate that are saved.
+# Wrappers that process the same run time and forecast lead reuse them
+TIME_INFO_CACHE_SIZE = 4096
+
+# keys of the input dictionary that are read by ti_calculate
+TIME_INFO_INPUT_KEYS = (
+    'now',
+    'custom',
+    'lead',
+    'lead_seconds',
+    'lead_minutes',
+    'lead_hours',
+    'offset_hours',
+    'offset',
+    'init',
+    'valid',
+    'da_init',
+)
+
 def get_relativedelta(value, default_unit='S'):
     """!Converts time values ending in Y, m, d, H, M, or S to relativedelta object
         Args:
@@ -183,12 +203,78 @@ def ti_get_lead_string(lead, plural=True):
     return output
 
 def ti_calculate(input_dict):
+    """!Compute time information from the init, valid, or da_init time,
+        forecast lead, and offset in the input dictionary. The results are
+        saved for recently used inputs so the values are only computed once
+        for each run time and forecast lead.
+        Args:
+            @param input_dict dictionary containing time information
+            @returns new dictionary with all of the time information that can
+             be modified by the caller
+    """
+    # if init and valid are set, check which was set first via loop_by
+    # remove the other to recalculate
+    if 'init' in input_dict.keys() and 'valid' in input_dict.keys():
+        if 'loop_by' in input_dict.keys():
+            if input_dict['loop_by'] == 'init':
+                del input_dict['valid']
+            elif input_dict['loop_by'] == 'valid':
+                del input_dict['init']
+
+    input_items = tuple((key, input_dict[key])
+                        for key in TIME_INFO_INPUT_KEYS if key in input_dict)
+    try:
+        hash(input_items)
+    except TypeError:
+        # inputs that cannot be hashed cannot be saved
+        return _ti_calculate(dict(input_items))
+
+    return dict(_ti_calculate_cached(input_items))
+
+@lru_cache(maxsize=TIME_INFO_CACHE_SIZE)
+def _ti_calculate_cached(input_items):
+    return _ti_calculate(dict(input_items))
+
+@lru_cache(maxsize=TIME_INFO_CACHE_SIZE)
+def _format_time(time_obj, time_format):
+    return time_obj.strftime(time_format)
+
+@lru_cache(maxsize=TIME_INFO_CACHE_SIZE)
+def _get_lead_string(lead):
+    return ti_get_lead_string(lead)
+
+@lru_cache(maxsize=TIME_INFO_CACHE_SIZE)
+def _get_fixed_lead(lead):
+    """!Convert relativedelta to timedelta if it only contains units with a
+        fixed length because adding a timedelta to a datetime is much faster
+        Args:
+            @param lead relativedelta object
+            @returns timedelta object or the relativedelta object if it
+             contains months, years, or absolute values
+    """
+    if (lead.years or lead.months or lead.leapdays or lead.weekday or
+            any(value is not None for value in (lead.year, lead.month,
+                                                lead.day, lead.hour,
+                                                lead.minute, lead.second,
+                                                lead.microsecond))):
+        return lead
+
+    return datetime.timedelta(days=lead.days, hours=lead.hours,
+                              minutes=lead.minutes, seconds=lead.seconds,
+                              microseconds=lead.microseconds)
+
+def _ti_calculate(input_dict):
+    """!Compute the time information for ti_calculate
+        Args:
+            @param input_dict dictionary containing time information
+            @returns new dictionary with all of the time information
+    """
     out_dict = {}
 
     # set output dictionary to input items
     if 'now' in input_dict.keys():
         out_dict['now'] = input_dict['now']
-        out_dict['today'] = out_dict['now'].strftime('%Y%m%d')
+        out_dict['today'] = _format_time(out_dict['now'], '%Y%m%d')
 
     # if custom is set in input dictionary, set it in the output dictionary
     if 'custom' in input_dict.keys():
@@ -229,15 +315,6 @@ def ti_calculate(input_dict):
         out_dict['offset'] = datetime.timedelta(seconds=0)
 
 
-    # if init and valid are set, check which was set first via loop_by
-    # remove the other to recalculate
-    if 'init' in input_dict.keys() and 'valid' in input_dict.keys():
-        if 'loop_by' in input_dict.keys():
-            if input_dict['loop_by'] == 'init':
-                del input_dict['valid']
-            elif input_dict['loop_by'] == 'valid':
-                del input_dict['init']
-
     if 'init' in input_dict.keys():
         out_dict['init'] = input_dict['init']
 
@@ -246,7 +323,7 @@ def ti_calculate(input_dict):
             exit(1)
 
         # compute valid from init and lead
-        out_dict['valid'] = out_dict['init'] + out_dict['lead']
+        out_dict['valid'] = out_dict['init'] + _get_fixed_lead(out_dict['lead'])
 
         # set loop_by to init or valid to be able to see what was set first
         out_dict['loop_by'] = 'init'
@@ -256,7 +333,7 @@ def ti_calculate(input_dict):
         out_dict['valid'] = input_dict['valid']
 
         # compute init from valid and lead
-        out_dict['init'] = out_dict['valid'] - out_dict['lead']
+        out_dict['init'] = out_dict['valid'] - _get_fixed_lead(out_dict['lead'])
 
         # set loop_by to init or valid to be able to see what was set first
         out_dict['loop_by'] = 'valid'
@@ -273,7 +350,7 @@ def ti_calculate(input_dict):
         out_dict['valid'] = out_dict['da_init'] - out_dict['offset']
 
         # compute init from valid and lead
-        out_dict['init'] = out_dict['valid'] - out_dict['lead']
+        out_dict['init'] = out_dict['valid'] - _get_fixed_lead(out_dict['lead'])
     else:
         print("ERROR: Need to specify valid, init, or da_init to time utility")
         exit(1)
@@ -282,16 +359,16 @@ def ti_calculate(input_dict):
     out_dict['da_init'] = out_dict['valid'] + out_dict['offset']
 
     # add common formatted items
-    out_dict['init_fmt'] = out_dict['init'].strftime('%Y%m%d%H%M%S')
-    out_dict['da_init_fmt'] = out_dict['da_init'].strftime('%Y%m%d%H%M%S')
-    out_dict['valid_fmt'] = out_dict['valid'].strftime('%Y%m%d%H%M%S')
+    out_dict['init_fmt'] = _format_time(out_dict['init'], '%Y%m%d%H%M%S')
+    out_dict['da_init_fmt'] = _format_time(out_dict['da_init'], '%Y%m%d%H%M%S')
+    out_dict['valid_fmt'] = _format_time(out_dict['valid'], '%Y%m%d%H%M%S')
 
     # get difference between valid and init to get total seconds since relativedelta
     # does not have a fixed number of seconds
     total_seconds = int((out_dict['valid'] - out_dict['init']).total_seconds())
 
     # get string representation of forecast lead
-    out_dict['lead_string'] = ti_get_lead_string(out_dict['lead'])
+    out_dict['lead_string'] = _get_lead_string(out_dict['lead'])
 
     # change relativedelta to integer seconds unless months or years are used
     # if they are, keep lead as a relativedelta object to be handled differently
@@ -1,9 +1,7 @@
 from os import environ
-from inspect import isclass
-from pkgutil import iter_modules
-from pathlib import Path
 from importlib import import_module
 from ..util.metplus_check import plot_wrappers_are_enabled
+from ..util.met_util import camel_to_underscore
 
 # these wrappers should not be imported if plotting is disabled
 plotting_wrappers = [
@@ -12,32 +10,55 @@ plotting_wrappers = [
     'make_plots_wrapper',
 ]
 
-# import classes that other wrappers import
+# classes that other wrappers import that do not follow the naming
+# convention of the wrapper modules
 parent_classes = {
-    'command_builder': 'CommandBuilder',
-    'reformat_gridded_wrapper': 'ReformatGriddedWrapper',
-    'compare_gridded_wrapper': 'CompareGriddedWrapper',
-    'regrid_data_plane_wrapper': 'RegridDataPlaneWrapper',
+    'CommandBuilder': 'command_builder',
 }
 
-for module_name, attribute_name in parent_classes.items():
-    module = import_module(f"{__name__}.{module_name}")
-    attribute = getattr(module, attribute_name)
-    globals()[attribute_name] = attribute
+def get_wrapper_module_name(attribute_name):
+    """!Get the name of the module in this package that defines a class.
+        Wrapper classes, i.e. GridStatWrapper, are found in the module named
+        after the class, i.e. grid_stat_wrapper.
+        Args:
+            @param attribute_name name of the class to find
+            @returns name of the module or None if the name is not a wrapper
+    """
+    if attribute_name in parent_classes:
+        return parent_classes[attribute_name]
+
+    if not attribute_name.endswith('Wrapper') or attribute_name == 'Wrapper':
+        return None
+
+    process = attribute_name[:-len('Wrapper')]
+    return f"{camel_to_underscore(process)}_wrapper"
 
-# iterate through the modules in the current package
-package_dir = Path(__file__).resolve().parent
-for (_, module_name, _) in iter_modules([package_dir]):
+def __getattr__(attribute_name):
+    """!Import wrapper classes the first time they are accessed so that
+        running a single wrapper does not import the modules (and the
+        packages they depend on) for every other wrapper.
+        Args:
+            @param attribute_name name of the class to import
+            @returns class that was imported
+    """
+    module_name = get_wrapper_module_name(attribute_name)
 
     # skip import of plot wrappers if they are not enabled
-    if not plot_wrappers_are_enabled(environ) and module_name in plotting_wrappers:
-        continue
+    if (module_name is None or (module_name in plotting_wrappers and
+                                not plot_wrappers_are_enabled(environ))):
+        raise AttributeError(f"module {__name__!r} has no attribute "
+                             f"{attribute_name!r}")
 
-    # import the module and iterate through its attributes
-    module = import_module(f"{__name__}.{module_name}")
-    for attribute_name in dir(module):
-        attribute = getattr(module, attribute_name)
+    try:
+        module = import_module(f"{__name__}.{module_name}")
+    except ModuleNotFoundError as err:
+        if err.name != f"{__name__}.{module_name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute "
+                             f"{attribute_name!r}") from None
 
-        if isclass(attribute) and attribute_name not in globals() and attribute_name.endswith("Wrapper"):
-            # Add the class to this package's variables
-            globals()[attribute_name] = attribute
+    attribute = getattr(module, attribute_name)
+
+    # add the class to this package's variables so it is only looked up once
+    globals()[attribute_name] = attribute
+    return attribute
@@ -17,6 +17,7 @@ from abc import ABCMeta
 from inspect import getframeinfo, stack
 
 from .command_runner import CommandRunner
+from .run_journal import get_run_journal, get_command_input_files
 from ..util import met_util as util
 from ..util import do_string_sub, ti_calculate, get_seconds_from_string
 
@@ -49,14 +50,30 @@ class CommandBuilder:
         self.outfile = ""
         self.param = ""
         self.all_commands = []
+
+        # time dictionary passed to run_at_time for the current run time.
+        # Set by the functions that loop over run times
+        self.current_input_dict = None
         self.env = os.environ.copy()
         if hasattr(config, 'env'):
             self.env = config.env
         self.c_dict = self.create_c_dict()
         self.check_for_externals()
 
-        self.cmdrunner = CommandRunner(self.config, logger=self.logger,
-                                       verbose=self.c_dict['VERBOSITY'])
+        self.cmdrunner = CommandRunner(
+            self.config, logger=self.logger,
+            verbose=self.c_dict['VERBOSITY'],
+            max_concurrent=self.c_dict['MAX_CONCURRENT_COMMANDS']
+        )
+
+        # journal of commands that ran successfully, used to skip commands
+        # that were already run with the same inputs
+        self.run_journal = None
+        self.journal_pending = {}
+        if (self.c_dict['USE_RUN_JOURNAL'] and
+                not self.config.getbool('config', 'DO_NOT_RUN_EXE', False)):
+            self.run_journal = get_run_journal(self.c_dict['RUN_JOURNAL_FILE'],
+                                               logger=self.logger)
 
         # if env MET_TMP_DIR was not set, set it to config TMP_DIR
         if 'MET_TMP_DIR' not in self.env:
@@ -88,6 +105,29 @@ class CommandBuilder:
                                 False)
             )
 
+        # if more than 1 command can run at once, build() submits each
+        # command to run in the background instead of waiting for it to
+        # finish. Check for wrapper-specific value before generic value
+        max_name = f'{app_name.upper()}_MAX_CONCURRENT_COMMANDS'
+        if not app_name or not self.config.has_option('config', max_name):
+            max_name = 'MAX_CONCURRENT_COMMANDS'
+        c_dict['MAX_CONCURRENT_COMMANDS'] = self.config.getint('config',
+                                                               max_name, 1)
+        if (c_dict['MAX_CONCURRENT_COMMANDS'] is None or
+                c_dict['MAX_CONCURRENT_COMMANDS'] < 1):
+            self.log_error(f"{max_name} must be an integer "
+                           "greater than or equal to 1")
+            c_dict['MAX_CONCURRENT_COMMANDS'] = 1
+
+        c_dict['USE_RUN_JOURNAL'] = self.config.getbool('config',
+                                                        'USE_RUN_JOURNAL',
+                                                        False)
+        c_dict['RUN_JOURNAL_FILE'] = self.config.getraw(
+            'config', 'RUN_JOURNAL_FILE',
+            os.path.join(self.config.getdir('OUTPUT_BASE'),
+                         'metplus_run_journal.db')
+        )
+
         return c_dict
 
     def clear(self):
@@ -560,7 +600,7 @@ class CommandBuilder:
 
         # convert valid_time to unix time
         valid_time = time_info['valid_fmt']
-        valid_seconds = int(datetime.strptime(valid_time, "%Y%m%d%H%M%S").strftime("%s"))
+        valid_seconds = util.get_file_valid_seconds(datetime.strptime(valid_time, "%Y%m%d%H%M%S"))
         # get time of each file, compare to valid time, save best within range
         closest_files = []
         closest_time = 9999999
@@ -568,10 +608,8 @@ class CommandBuilder:
         # get range of times that will be considered
         valid_range_lower = self.c_dict.get(data_type + 'FILE_WINDOW_BEGIN', 0)
         valid_range_upper = self.c_dict.get(data_type + 'FILE_WINDOW_END', 0)
-        lower_limit = int(datetime.strptime(util.shift_time_seconds(valid_time, valid_range_lower),
-                                            "%Y%m%d%H%M%S").strftime("%s"))
-        upper_limit = int(datetime.strptime(util.shift_time_seconds(valid_time, valid_range_upper),
-                                            "%Y%m%d%H%M%S").strftime("%s"))
+        lower_limit = valid_seconds + valid_range_lower
+        upper_limit = valid_seconds + valid_range_upper
 
         msg = f"Looking for {data_type}INPUT files under {data_dir} within range " +\
               f"[{valid_range_lower},{valid_range_upper}] using template {template}"
@@ -581,40 +619,25 @@ class CommandBuilder:
             self.log_error('Must set INPUT_DIR if looking for files within a time window')
             return None
 
-        # step through all files under input directory in sorted order
-        for dirpath, _, all_files in os.walk(data_dir):
-            for filename in sorted(all_files):
-                fullpath = os.path.join(dirpath, filename)
-
-                # remove input data directory to get relative path
-                rel_path = fullpath.replace(f'{data_dir}/', "")
-                # extract time information from relative path using template
-                file_time_info = util.get_time_from_file(rel_path, template, self.logger)
-                if file_time_info is None:
-                    continue
-
-                # get valid time and check if it is within the time range
-                file_valid_time = file_time_info['valid'].strftime("%Y%m%d%H%M%S")
-                # skip if could not extract valid time
-                if not file_valid_time:
-                    continue
-                file_valid_dt = datetime.strptime(file_valid_time, "%Y%m%d%H%M%S")
-                file_valid_seconds = int(file_valid_dt.strftime("%s"))
-                # skip if outside time range
-                if file_valid_seconds < lower_limit or file_valid_seconds > upper_limit:
-                    continue
-
-                # if only 1 file is allowed, check if file is
-                # closer to desired valid time than previous match
-                if not self.c_dict.get('ALLOW_MULTIPLE_FILES', False):
-                    diff = abs(valid_seconds - file_valid_seconds)
-                    if diff < closest_time:
-                        closest_time = diff
-                        del closest_files[:]
-                        closest_files.append(fullpath)
-                # if multiple files are allowed, get all files within range
-                else:
+        # get all files under input directory that are within the time range
+        # in sorted order. The directory is only walked the first time it is
+        # searched using this template and when its contents change
+        for file_valid_seconds, fullpath in util.get_files_in_time_window(data_dir,
+                                                                           template,
+                                                                           lower_limit,
+                                                                           upper_limit,
+                                                                           self.logger):
+            # if only 1 file is allowed, check if file is
+            # closer to desired valid time than previous match
+            if not self.c_dict.get('ALLOW_MULTIPLE_FILES', False):
+                diff = abs(valid_seconds - file_valid_seconds)
+                if diff < closest_time:
+                    closest_time = diff
+                    del closest_files[:]
                     closest_files.append(fullpath)
+            # if multiple files are allowed, get all files within range
+            else:
+                closest_files.append(fullpath)
 
         if not closest_files:
             msg = f"Could not find {data_type}INPUT files under {data_dir} within range " +\
@@ -647,8 +670,7 @@ class CommandBuilder:
         list_dir = os.path.join(self.config.getdir('STAGING_DIR'), 'file_lists')
         list_path = os.path.join(list_dir, filename)
 
-        if not os.path.exists(list_dir):
-            os.makedirs(list_dir, mode=0o0775)
+        os.makedirs(list_dir, mode=0o0775, exist_ok=True)
 
         self.logger.debug(f"Writing list of filenames to {list_path}")
         with open(list_path, 'w') as file_handle:
@@ -679,8 +701,7 @@ class CommandBuilder:
             return False
 
         # create full output dir if it doesn't already exist
-        if not os.path.exists(parent_dir):
-            os.makedirs(parent_dir)
+        os.makedirs(parent_dir, exist_ok=True)
 
         if not os.path.exists(output_path) or not self.c_dict['SKIP_IF_OUTPUT_EXISTS']:
             return True
@@ -993,8 +1014,7 @@ class CommandBuilder:
             self.log_error('Must specify path to output file')
             return None
 
-        if not os.path.exists(parent_dir):
-            os.makedirs(parent_dir)
+        os.makedirs(parent_dir, exist_ok=True)
 
         cmd += " " + out_path
 
@@ -1026,16 +1046,127 @@ class CommandBuilder:
         # add command to list of all commands run
         self.all_commands.append(cmd)
 
+        # skip command if it already ran with the same inputs
+        journal_entry = self.get_journal_entry(cmd)
+        if journal_entry and self.run_journal.is_complete(cmd,
+                                                          journal_entry[0]):
+            self.logger.info(f"Skipping command that already ran with the "
+                             f"same inputs: {cmd}")
+            return True
+
+        # submit command to run in the background if more than 1 command
+        # can run at once. Errors are reported by wait_for_commands
+        if self.c_dict['MAX_CONCURRENT_COMMANDS'] > 1:
+            self.cmdrunner.submit_cmd(cmd, env=self.env,
+                                      app_name=self.app_name,
+                                      copyable_env=self.get_env_copy(),
+                                      telemetry_tags=self.get_telemetry_tags())
+            if journal_entry:
+                self.journal_pending[cmd] = journal_entry
+            return True
+
         ret, out_cmd = self.cmdrunner.run_cmd(cmd, self.env, app_name=self.app_name,
-                                              copyable_env=self.get_env_copy())
+                                              copyable_env=self.get_env_copy(),
+                                              telemetry_tags=self.get_telemetry_tags())
+
+        # staged input files can be removed after the command finishes
+        util.release_staged_files()
         if ret != 0:
             self.log_error(f"MET command returned a non-zero return code: {cmd}")
             self.logger.info("Check the logfile for more information on why it failed: "
                              f"{self.config.getstr('config', 'LOG_METPLUS')}")
             return False
 
+        if journal_entry:
+            self.run_journal.record(cmd, *journal_entry)
+
         return True
 
+    def get_telemetry_tags(self):
+        """!Get the items that describe the command that is about to run to
+            add to the record written to LOG_COMMAND_TELEMETRY
+            @returns dictionary with the wrapper name, the run time, and the
+             forecast field name and level if the wrapper runs once for
+             each field
+        """
+        run_time = None
+        if self.current_input_dict:
+            run_time = self.current_input_dict.get('init',
+                                                   self.current_input_dict.get('valid'))
+            if run_time is not None:
+                run_time = run_time.strftime('%Y%m%d%H%M%S')
+
+        field = None
+        var_info = self.c_dict.get('CURRENT_VAR_INFO')
+        if var_info and self.c_dict.get('ONCE_PER_FIELD'):
+            field = ' '.join(item for item in (var_info.get('fcst_name'),
+                                               var_info.get('fcst_level'))
+                             if item)
+
+        return {
+            'wrapper': self.__class__.__name__,
+            'run_time': run_time,
+            'field': field,
+        }
+
+    def get_journal_entry(self, cmd):
+        """!Get the information needed to check if a command already ran
+            successfully or to record it in the run journal after it runs.
+            The output is read from get_output_path, so commands that do not
+            set outdir or outfile are not journaled. Commands that read input
+            that cannot be fingerprinted, such as a directory, are also not
+            journaled.
+            Args:
+                @param cmd command to run
+                @returns tuple of fingerprint and output path or None if the
+                 run journal is not used for the command
+        """
+        if self.run_journal is None or not (self.outdir or self.outfile):
+            return None
+
+        output_path = self.get_output_path()
+        env_vars = set(self.env_list)
+        if 'user_env_vars' in self.config.sections():
+            env_vars.update(self.config.keys('user_env_vars'))
+        env_items = [(name, self.env.get(name, '')) for name in env_vars]
+
+        input_files = get_command_input_files(cmd, output_path,
+                                              infiles=self.infiles,
+                                              env_items=env_items)
+        if input_files is None:
+            self.logger.debug("Not using run journal because the input files "
+                              f"could not be identified: {cmd}")
+            return None
+
+        fingerprint = self.run_journal.get_fingerprint(cmd, env_items,
+                                                       input_files)
+        return fingerprint, output_path
+
+    def wait_for_commands(self):
+        """!Wait for all commands that were submitted to run in the
+            background by build() to finish and log an error for each
+            command that failed.
+
+            @returns True if all commands succeeded, False if any failed
+        """
+        success = True
+        for ret, cmd in self.cmdrunner.wait_all():
+            if ret != 0:
+                self.log_error(f"MET command returned a non-zero return code: {cmd}")
+                self.logger.info("Check the logfile for more information on why it failed: "
+                                 f"{self.config.getstr('config', 'LOG_METPLUS')}")
+                success = False
+                self.journal_pending.pop(cmd, None)
+                continue
+
+            journal_entry = self.journal_pending.pop(cmd, None)
+            if journal_entry:
+                self.run_journal.record(cmd, *journal_entry)
+
+        self.journal_pending.clear()
+        util.release_staged_files()
+        return success
+
     # argument needed to match call
     # pylint:disable=unused-argument
     def run_at_time(self, input_dict):
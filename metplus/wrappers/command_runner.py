@@ -32,26 +32,157 @@ Output Files: N/A
 #   METplus log file, MET logs, or TTY
 # It runs the Runnable object
 #
+# Commands can also be submitted to run in the background with submit_cmd.
+# Up to max_concurrent submitted commands run at once. The output of each
+# submitted command is written to its own log file and appended to the
+# log it would normally be sent to when the command finishes so that
+# output from commands that run at the same time is not interleaved.
+# wait_all waits for all submitted commands to finish.
+#
+# If LOG_COMMAND_TELEMETRY is set, the wall time, CPU time, and maximum
+# memory used by each command that runs are written to that file as a
+# JSON object on a single line. The resource usage is read from os.wait4
+# for the processes of the command, so it is correct for commands that run
+# at the same time.
+#
 
 import os
-from produtil.run import exe, run
+import sys
+import shutil
 import shlex
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from produtil.run import exe, make_pipeline
 from datetime import datetime
 
+from ..util import met_util as util
+
 class CommandRunner(object):
     """! Class for Creating and Running External Programs
     """
-    def __init__(self, config, logger=None, verbose=2):
+    def __init__(self, config, logger=None, verbose=2, max_concurrent=1):
         """!Class for Creating and Running External Programs.
             It was intended to handle the MET executables but
-            can be used by other executables."""
+            can be used by other executables.
+            max_concurrent is the number of commands submitted with
+            submit_cmd that can run at once."""
         self.logger = logger
         self.config = config
         self.verbose = verbose
         self.log_command_to_met_log = False
+        self.max_concurrent = max(1, max_concurrent)
+        self.executor = None
+        self.futures = []
+        self.log_lock = threading.Lock()
+        self.log_counter = itertools.count()
+        self.telemetry_file = self.config.getraw('config',
+                                                 'LOG_COMMAND_TELEMETRY')
+        self.clock_time = self.config.getstr('config', 'CLOCK_TIME', '')
+
+    def submit_cmd(self, cmd, env=None, **kwargs):
+        """!Run a command in the background. Up to max_concurrent submitted
+            commands run at once and the rest wait in a queue. The output of
+            the command is written to its own log file and appended to the
+            log file it would be sent to by run_cmd when it finishes.
+
+            Args:
+                @param cmd command to run
+                @param env environment for the command. A copy is made so
+                 that the caller can change the dictionary after submitting
+                 the command. Uses os.environ if not set.
+                @param kwargs other arguments passed to run_cmd
+                @returns concurrent.futures.Future object. The result is the
+                 (return code, command) tuple returned by run_cmd
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent)
+
+        env = dict(os.environ if env is None else env)
+        future = self.executor.submit(self.run_cmd, cmd, env=env,
+                                      isolate_log=True, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def wait_all(self):
+        """!Wait for all commands submitted with submit_cmd to finish.
+
+            @returns list of (return code, command) tuples for each
+             submitted command in the order they were submitted. The
+             return code is -1 if the command could not be run.
+        """
+        results = []
+        for future in self.futures:
+            try:
+                results.append(future.result())
+            except Exception as err:
+                self.logger.error(f"Could not run command: {err}")
+                results.append((-1, None))
+
+        self.futures = []
+        return results
+
+    @staticmethod
+    def run_and_get_usage(cmd_exe, **kwargs):
+        """!Run a command the same way as produtil.run.run and get the
+            resources used by the processes that it ran from os.wait4.
+
+            Args:
+                @param cmd_exe produtil Runner object to run
+                @param kwargs logger and sleeptime options passed to produtil
+                @returns tuple of the return code and a dictionary containing
+                 the user and system CPU time in seconds and the maximum
+                 resident set size in KB used by any of the processes
+        """
+        pipeline = make_pipeline(cmd_exe, False, logger=kwargs.get('logger'))
+        pipeline.communicate(sleeptime=kwargs.get('sleeptime'))
+
+        usage = {
+            'user_cpu_seconds': 0.0,
+            'system_cpu_seconds': 0.0,
+            'max_rss_kb': 0,
+        }
+        for proc_usage in (pipeline.rusage() or {}).values():
+            usage['user_cpu_seconds'] += proc_usage.ru_utime
+            usage['system_cpu_seconds'] += proc_usage.ru_stime
+            usage['max_rss_kb'] = max(usage['max_rss_kb'],
+                                      proc_usage.ru_maxrss)
+
+        # ru_maxrss is in bytes on MacOS and KB on Linux
+        if sys.platform == 'darwin':
+            usage['max_rss_kb'] //= 1024
+
+        return pipeline.poll(), usage
+
+    def get_isolated_log(self, log_dest):
+        """!Get the path of a log file to write the output of a single
+            command that will be appended to log_dest when it finishes.
+
+            @param log_dest path of log file to append output to
+            @returns path of log file to write command output
+        """
+        return f"{log_dest}.{os.getpid()}.{next(self.log_counter)}"
+
+    def merge_isolated_log(self, isolated_log, log_dest):
+        """!Append the output of a command that was written to its own log
+            file to log_dest and remove the isolated log file.
+
+            @param isolated_log path of log file containing command output
+            @param log_dest path of log file to append output to
+        """
+        if not os.path.exists(isolated_log):
+            return
+
+        with self.log_lock:
+            with open(isolated_log, 'r') as in_handle, \
+                    open(log_dest, 'a+') as out_handle:
+                shutil.copyfileobj(in_handle, out_handle)
+
+        os.remove(isolated_log)
 
     def run_cmd(self, cmd, env=None, ismetcmd = True, app_name=None, run_inshell=False,
-                log_theoutput=False, copyable_env=None, **kwargs):
+                log_theoutput=False, copyable_env=None, isolate_log=False,
+                telemetry_tags=None, **kwargs):
         """!The command cmd is a string which is converted to a produtil
         exe Runner object and than run. Output of the command may also
         be redirected to either METplus log, MET log, or TTY.
@@ -76,12 +207,25 @@ class CommandRunner(object):
             @param log_theoutput: Used only when ismetcmd=False, will redirect
             the stderr and stdout to a the METplus log file or tty.
             DO Not set to True if the command is redirecting output to a file.
+            @param copyable_env: Environment variables to write to the MET log
+            before the command.
+            @param isolate_log: If True, write the output of the command to its
+            own log file and append it to the log file when the command
+            finishes. Used by submit_cmd so that the output of commands that run
+            at the same time is not interleaved.
+            @param telemetry_tags: Dictionary of items, such as the wrapper,
+            run time, and field, that are added to the record written to
+            LOG_COMMAND_TELEMETRY for the command.
             @param kwargs Other options sent to the produtil Run constructor
         """
 
         if cmd is None:
             return cmd
 
+        # set if output is written to an isolated log file that is
+        # appended to this file after the command runs
+        final_log_dest = None
+
         # if env not set, use os.environ
         if env is None:
             env = os.environ
@@ -104,7 +248,11 @@ class CommandRunner(object):
                                     ' contructor: %s, ' % repr(self))
 
             # Determine where to send the output from the MET command.
-            log_dest = self.cmdlog_destination(cmdlog=app_name+'.log')
+            log_dest, log_command_to_met_log = \
+                self.get_cmdlog_destination(cmdlog=app_name+'.log')
+            if isolate_log and log_dest:
+                final_log_dest = log_dest
+                log_dest = self.get_isolated_log(final_log_dest)
 
             # KEEP This comment as a reference note.
             # Run the executable in a new process instead of through a shell.
@@ -124,7 +272,7 @@ class CommandRunner(object):
 
                 with open(log_dest, 'a+') as log_file_handle:
                     # if logging MET command to its own log file, add command that was run to that log
-                    if self.log_command_to_met_log:
+                    if log_command_to_met_log:
                         # if environment variables were set and available, write them to MET tool log
                         if copyable_env:
                             log_file_handle.write("\nCOPYABLE ENVIRONMENT FOR NEXT COMMAND:\n")
@@ -158,7 +306,10 @@ class CommandRunner(object):
                 the_exe = shlex.split(cmd)[0]
 
                 if log_theoutput:
-                    log_dest = self.cmdlog_destination()
+                    log_dest, _ = self.get_cmdlog_destination()
+                    if isolate_log and log_dest:
+                        final_log_dest = log_dest
+                        log_dest = self.get_isolated_log(final_log_dest)
                     cmd_exe = exe('sh')['-c', cmd].env(**env).err2out() >> log_dest
                 else:
                     cmd_exe = exe('sh')['-c', cmd].env(**env)
@@ -167,7 +318,10 @@ class CommandRunner(object):
                 the_exe = shlex.split(cmd)[0]
                 the_args = shlex.split(cmd)[1:]
                 if log_theoutput:
-                    log_dest = self.cmdlog_destination()
+                    log_dest, _ = self.get_cmdlog_destination()
+                    if isolate_log and log_dest:
+                        final_log_dest = log_dest
+                        log_dest = self.get_isolated_log(final_log_dest)
                     cmd_exe = exe(the_exe)[the_args].env(**env).err2out() >> log_dest
                 else:
                     cmd_exe = exe(the_exe)[the_args].env(**env)
@@ -180,14 +334,44 @@ class CommandRunner(object):
 
             # run command
             try:
-                ret = run(cmd_exe, **kwargs)
+                ret, usage = self.run_and_get_usage(cmd_exe, **kwargs)
             except:
                 ret = -1
             else:
                 # calculate time to run
                 end_cmd_time = datetime.now()
                 total_cmd_time = end_cmd_time - start_cmd_time
-                self.logger.debug(f'Finished running {the_exe} in {total_cmd_time}')
+                self.logger.debug(f'Finished running {the_exe} in {total_cmd_time} '
+                                  f"(user {usage['user_cpu_seconds']:.2f}s, "
+                                  f"system {usage['system_cpu_seconds']:.2f}s, "
+                                  f"max RSS {usage['max_rss_kb']} KB)")
+
+                if self.telemetry_file:
+                    record = {
+                        'clock_time': self.clock_time,
+                        'app_name': app_name or os.path.basename(the_exe),
+                        'wrapper': None,
+                        'run_time': None,
+                        'field': None,
+                    }
+                    if telemetry_tags:
+                        record.update(telemetry_tags)
+                    record.update({
+                        'command': cmd,
+                        'return_code': ret,
+                        'start_time': start_cmd_time.isoformat(),
+                        'wall_seconds': total_cmd_time.total_seconds(),
+                    })
+                    record.update(usage)
+                    try:
+                        util.write_command_telemetry(self.telemetry_file,
+                                                     record)
+                    except OSError as err:
+                        self.logger.warning("Could not write command "
+                                            f"telemetry: {err}")
+
+        if final_log_dest:
+            self.merge_isolated_log(log_dest, final_log_dest)
 
         return (ret, cmd)
 
@@ -227,6 +411,23 @@ class CommandRunner(object):
                               output is sent to either the METplus log or TTY.
                @returns log_dest: The destination of where to send the command output.
         """
+        cmdlog_dest, self.log_command_to_met_log = (
+            self.get_cmdlog_destination(cmdlog)
+        )
+        return cmdlog_dest
+
+    def get_cmdlog_destination(self, cmdlog=None):
+        """!Get the location of where the command output will be sent
+           without changing any attributes of this object, so it can be
+           called from commands that run at the same time.
+           Args:
+               @param cmdlog: The cmdlog is a filename, any path info is removed.
+                              It is joined with LOG_DIR. If cmdlog is None,
+                              output is sent to either the METplus log or TTY.
+               @returns tuple of the destination of where to send the command
+                output and True if the output is sent to a MET log that
+                should also contain the command that was run
+        """
 
         # Check the cmdlog argument.
         # ie. if cmdlog = '', or '/', or trailing slash /path/blah.log/ etc...,
@@ -244,7 +445,7 @@ class CommandRunner(object):
         # metpluslog includes /path/filename.
         metpluslog = self.config.getstr('config', 'LOG_METPLUS', '')
 
-        self.log_command_to_met_log = False
+        log_command_to_met_log = False
 
         # This block determines where to send the command output, cmdlog_dest.
         # To the METplus log, a MET log, or tty.
@@ -256,7 +457,7 @@ class CommandRunner(object):
             if log_met_output_to_metplus or not cmdlog:
                 cmdlog_dest = metpluslog
             else:
-                self.log_command_to_met_log = True
+                log_command_to_met_log = True
                 log_timestamp = self.config.getstr('config', 'LOG_TIMESTAMP', '')
                 if log_timestamp:
                     cmdlog_dest = os.path.join(self.config.getdir('LOG_DIR'),
@@ -267,7 +468,7 @@ class CommandRunner(object):
 
         # If cmdlog_dest None we will not redirect output to a log file
         # when building the Runner object, so it will end up going to tty.
-        return cmdlog_dest
+        return cmdlog_dest, log_command_to_met_log
 
     # This method SHOULD ONLY BE USED by wrappers that build their cmd
     # outside of the command_builder.py get_command() method
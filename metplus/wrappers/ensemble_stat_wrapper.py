@@ -321,7 +321,10 @@ class EnsembleStatWrapper(CompareGriddedWrapper):
 
         # write file that contains list of ensemble files
         list_filename = time_info['init_fmt'] + '_' + \
-          str(time_info['lead_hours']) + '_ensemble.txt'
+          str(time_info['lead_hours'])
+        if time_info.get('custom'):
+            list_filename += f"_{time_info['custom']}"
+        list_filename += '_ensemble.txt'
         return self.write_list_file(list_filename, ens_members_path)
 
     def set_environment_variables(self, fcst_field, obs_field, ens_field, time_info):
@@ -83,7 +83,6 @@ class ExtractTilesWrapper(CommandBuilder):
         # Do some set up
         time_info = time_util.ti_calculate(input_dict)
         init_time = time_info['init_fmt']
-        tmp_dir = self.config.getdir('TMP_DIR')
 
         self.logger.info("Begin extract tiles")
         cur_init = init_time[0:8]+"_"+init_time[8:10]
@@ -110,28 +109,25 @@ class ExtractTilesWrapper(CommandBuilder):
                                "config file settings.s")
                 sys.exit(1)
 
-        # Now get unique storm ids from the filter file,
-        # filter_yyyymmdd_hh.tcst
-        sorted_storm_ids = util.get_storm_ids(filter_name, self.logger)
+        # Read the filter file, filter_yyyymmdd_hh.tcst, once and group
+        # the rows by storm id
+        header, storm_rows = util.get_storm_rows(filter_name)
 
-        # Useful debugging info: Check for empty sorted_storm_ids, if empty,
+        # Useful debugging info: Check for empty storm_rows, if empty,
         # continue to the next time.
-        if not sorted_storm_ids:
+        if not storm_rows:
             # No storms found for init time, cur_init
             msg = "No storms were found for {} ...continue to next in list"\
               .format(cur_init)
             self.logger.debug(msg)
             return
 
-        # Process each storm in the sorted_storm_ids list
-        # Iterate over each filter file in the output directory and
-        # search for the presence of the storm id.  Store this
-        # corresponding row of data into a temporary file in the
-        # /tmp directory where each file contains information based on storm.
-        if not self.create_results_files(sorted_storm_ids, cur_init, filter_name, tmp_dir):
+        # Process each storm found in the filter file using the rows
+        # that correspond to that storm.
+        if not self.create_results_files(header, storm_rows, cur_init):
             self.log_error("There was a problem with processing storms from the filtered result, "\
                     "please check your METplus config file settings or your write permissions for your "\
-                    "tmp directory.")
+                    "output directory.")
 
         util.prune_empty(self.filtered_out_dir, self.logger)
 
@@ -184,53 +180,51 @@ class ExtractTilesWrapper(CommandBuilder):
 
         return 0
 
-    def create_results_files(self, sorted_storm_ids, cur_init, filter_name, tmp_dir):
-        ''' Create the tmp files that contain filtered results- one tmp file per storm, then
-            invoke retrieve_and_regrid to create the final output as netCDF forecast and analysis (obs)
-            files.
+    def create_results_files(self, header, storm_rows, cur_init):
+        ''' Build the regrid_data_plane commands that create the forecast and analysis
+            (obs) tiles for each storm using the rows of the filtered results that
+            correspond to that storm, then run them. Up to
+            EXTRACT_TILES_MAX_CONCURRENT_COMMANDS commands are run at once and each
+            tile is only created once even if it is found in more than one row.
 
             Args:
-                @param sorted_storm_ids:
+                @param header: list of column names from the filter file generated by tc stat
+                @param storm_rows: dictionary where the keys are storm ids and the values
+                 are the rows from the filter file for that storm
                 @param cur_init: The current init time of interest
-                @param filter_name: The full file name of the filter file generated by tc stat
-                @param tmp_dir: The location of the tmp directory where these tmp files will be saved
-
-
 
             Return:
-             0 if successful in creating the tmp files (one per storm) in the tmp_dir
+             True if any storms were processed, False otherwise
         '''
 
         processed_file = False
-        # Process each storm in the sorted_storm_ids list
-        # Iterate over each filter file in the output directory and
-        # search for the presence of the storm id.  Store this
-        # corresponding row of data into a temporary file in the
-        # /tmp/<pid> directory.
-        for cur_storm in sorted_storm_ids:
+        commands = {}
+        tile_settings = feature_util.get_tile_grid_settings(self.config)
+
+        # Process each storm in sorted order using the rows that were
+        # grouped by the STORM_ID column when the filter file was read
+        for cur_storm in sorted(storm_rows):
             storm_output_dir = os.path.join(self.filtered_out_dir,
                                             cur_init, cur_storm)
-            header = open(filter_name, "r").readline()
             util.mkdir_p(storm_output_dir)
 
-            tmp_filename = "filter_" + cur_init + "_" + cur_storm
-            full_tmp_filename = os.path.join(tmp_dir, tmp_filename)
-
-            storm_match_list = util.grep(cur_storm, filter_name)
-
-            # open with w+ to overwrite if it exists and create it if not
-            with open(full_tmp_filename, "w") as tmp_file:
-                # copy over header information
-                tmp_file.write(header)
-                for storm_match in storm_match_list:
-                    tmp_file.write(storm_match)
-
-            feature_util.retrieve_and_regrid(full_tmp_filename, cur_init,
-                                             cur_storm, self.filtered_out_dir,
-                                             self.config)
-
-            # remove tmp file
-            os.remove(full_tmp_filename)
+            feature_util.get_tile_regrid_commands(header,
+                                                  storm_rows[cur_storm],
+                                                  cur_init, cur_storm,
+                                                  self.filtered_out_dir,
+                                                  self.config,
+                                                  self.cmdrunner,
+                                                  commands=commands,
+                                                  tile_settings=tile_settings)
             processed_file = True
 
+        self.logger.debug(f"Running {len(commands)} regrid_data_plane "
+                          f"commands to create tiles for {cur_init}")
+        telemetry_tags = self.get_telemetry_tags()
+        if not feature_util.run_tile_regrid_commands(commands,
+                                                     self.cmdrunner,
+                                                     self.logger,
+                                                     telemetry_tags):
+            self.errors += 1
+
         return processed_file
@@ -121,8 +121,7 @@ class GenVxMaskWrapper(CommandBuilder):
             return None
 
         # create full output dir if it doesn't already exist
-        if not os.path.exists(parent_dir):
-            os.makedirs(parent_dir)
+        os.makedirs(parent_dir, exist_ok=True)
 
         # add arguments
         cmd += ' ' + self.args
@@ -188,14 +187,18 @@ class GenVxMaskWrapper(CommandBuilder):
                 break
 
             # if not the last iteration, write to temporary file
-            temp_file = os.path.join(self.config.getdir('STAGING_DIR'),
-                                     'gen_vx_mask',
-                                     f'temp_{index}.nc')
+            temp_file = self.get_temp_file(time_info, index)
             self.set_output_path(temp_file)
 
             # run GenVxMask
             self.build_and_run_command()
 
+            # the next command reads the temporary file, so wait for the
+            # command to finish if it was submitted to run in the background
+            if (self.c_dict['MAX_CONCURRENT_COMMANDS'] > 1 and
+                    not self.wait_for_commands()):
+                return
+
         # use final output path for last (or only) run
         if not self.find_and_check_output_file(time_info):
             return
@@ -203,6 +206,23 @@ class GenVxMaskWrapper(CommandBuilder):
         # run GenVxMask
         self.build_and_run_command()
 
+    def get_temp_file(self, time_info, index):
+        """!Get the path of the temporary file written by an intermediate
+            step. The run time and custom loop string are included so that
+            steps for different run times can run at the same time.
+            Args:
+                @param time_info time dictionary for current runtime
+                @param index index of the mask template for the step
+                @returns path of temporary file
+        """
+        temp_name = f"temp_{time_info['init_fmt']}_{time_info['valid_fmt']}"
+        if time_info.get('custom'):
+            temp_name += f"_{time_info['custom']}"
+
+        return os.path.join(self.config.getdir('STAGING_DIR'),
+                            'gen_vx_mask',
+                            f'{temp_name}_{index}.nc')
+
     def find_input_files(self, time_info, temp_file):
         """!Handle setting of input file list.
             Args:
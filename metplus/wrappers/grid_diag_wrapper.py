@@ -278,9 +278,11 @@ class GridDiagWrapper(CommandBuilder):
             return None
 
         # create an ascii file with a list of the input files
-        list_file = self.write_list_file(f"grid_diag_data_files_idx{idx}_{time_info['valid_fmt']}.txt",
-                                         all_input_files)
-        return list_file
+        list_file = f"grid_diag_data_files_idx{idx}_{time_info['valid_fmt']}"
+        if time_info.get('custom'):
+            list_file += f"_{time_info['custom']}"
+
+        return self.write_list_file(f'{list_file}.txt', all_input_files)
 
     def set_command_line_arguments(self, time_info):
 
@@ -12,11 +12,16 @@ Condition codes: 0 for success, 1 for failure
 
 import logging
 import os
+import sys
 import copy
 import re
+import runpy
 import subprocess
 import datetime
 import itertools
+import traceback
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 from ..util import met_util as util
 from . import CommandBuilder
@@ -29,6 +34,92 @@ except:
     wrapper_cannot_run = True
 
 
+def init_plot_worker(scripts_base_dir):
+    """! Import the modules used by the plotting scripts once when a
+         plotting worker process starts so that each script run in
+         the worker does not pay for the imports. The plotting utilities
+         are shared by all scripts run in the worker, including the
+         .stat file data that has already been read.
+
+             Args:
+                 scripts_base_dir - directory containing the plotting
+                                    scripts and plot_util.py
+    """
+    if scripts_base_dir not in sys.path:
+        sys.path.insert(0, scripts_base_dir)
+
+    # errors are reported by the scripts that need the modules
+    try:
+        import numpy
+        import pandas
+        import matplotlib
+        matplotlib.use('agg')
+        import matplotlib.pyplot
+        import plot_util
+    except ImportError:
+        pass
+
+def run_plot_script(script, env):
+    """! Run a plotting script in the current process with the
+         environment variables that it reads set to the values for one
+         group of settings. The environment, search path, logging
+         handlers, and plot settings that the script changes are
+         restored when it finishes so the next script starts clean.
+
+             Args:
+                 script - path to the plotting script
+                 env    - dictionary of environment variables to set
+                          while the script runs
+
+             Returns:
+                 return_code - 0 if the script ran successfully,
+                               non-zero if not
+                 error       - string describing the failure or None
+    """
+    saved_environ = dict(os.environ)
+    saved_path = list(sys.path)
+    saved_argv = sys.argv
+    script_logger = logging.getLogger(env.get('LOG_METPLUS'))
+    saved_handlers = list(script_logger.handlers)
+
+    os.environ.clear()
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(script))
+    sys.argv = [script]
+    return_code = 0
+    error = None
+    try:
+        with warnings.catch_warnings():
+            runpy.run_path(script, run_name='__main__')
+    except SystemExit as err:
+        if err.code is None or err.code == 0:
+            return_code = 0
+        elif isinstance(err.code, int):
+            return_code = err.code
+        else:
+            return_code = 1
+            error = str(err.code)
+    except Exception:
+        return_code = 1
+        error = traceback.format_exc()
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        for handler in script_logger.handlers:
+            if handler not in saved_handlers:
+                script_logger.removeHandler(handler)
+                handler.close()
+
+        # reset figures and plot settings if the script used matplotlib
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].close('all')
+            sys.modules['matplotlib'].rcdefaults()
+
+    return return_code, error
+
+
 class MakePlotsWrapper(CommandBuilder):
     """! Wrapper to used to filter make plots from MET data
     """
@@ -64,7 +155,7 @@ class MakePlotsWrapper(CommandBuilder):
         'VERIF_CASE', 'VERIF_TYPE', 'INPUT_BASE_DIR', 'OUTPUT_BASE_DIR',
         'SCRIPTS_BASE_DIR', 'DATE_TYPE', 'VALID_BEG', 'VALID_END',
         'INIT_BEG', 'INIT_END', 'AVERAGE_METHOD', 'CI_METHOD',
-        'VERIF_GRID', 'EVENT_EQUALIZATION', 'LOG_METPLUS', 'LOG_LEVEL'
+        'CI_RANDOM_SEED', 'VERIF_GRID', 'EVENT_EQUALIZATION', 'LOG_METPLUS', 'LOG_LEVEL'
     ]
 
     def __init__(self, config, logger):
@@ -205,6 +296,9 @@ class MakePlotsWrapper(CommandBuilder):
         c_dict['CI_METHOD'] = self.config.getstr('config',
                                                  'MAKE_PLOTS_CI_METHOD',
                                                  'NONE')
+        c_dict['CI_RANDOM_SEED'] = self.config.getstr(
+            'config', 'MAKE_PLOTS_CI_RANDOM_SEED', ''
+        )
         c_dict['VERIF_GRID'] = self.config.getstr('config',
                                                   'MAKE_PLOTS_VERIF_GRID')
         c_dict['EVENT_EQUALIZATION'] = (
@@ -212,6 +306,12 @@ class MakePlotsWrapper(CommandBuilder):
         )
         c_dict['LOG_METPLUS'] = self.config.getstr('config', 'LOG_METPLUS')
         c_dict['LOG_LEVEL'] = self.config.getstr('config', 'LOG_LEVEL')
+        c_dict['NUM_WORKERS'] = self.config.getint('config',
+                                                   'MAKE_PLOTS_NUM_WORKERS', 1)
+        if c_dict['NUM_WORKERS'] is None or c_dict['NUM_WORKERS'] < 1:
+            self.log_error('MAKE_PLOTS_NUM_WORKERS must be an integer '
+                           'greater than or equal to 1')
+            c_dict['NUM_WORKERS'] = 1
 
         # Get MET version used to run stat_analysis
         c_dict['MET_VERSION'] = str(self.get_met_version())
@@ -276,6 +376,7 @@ class MakePlotsWrapper(CommandBuilder):
                 .get(self.c_dict['VERIF_TYPE'])
 
         # Loop over run settings.
+        plot_jobs = []
         for runtime_settings_dict in runtime_settings_dict_list:
             # set environment variables
             for name, value in runtime_settings_dict.items():
@@ -297,10 +398,54 @@ class MakePlotsWrapper(CommandBuilder):
             self.set_environment_variables()
 
             for script in scripts_to_run:
-                self.plotting_script = (
+                plotting_script = (
                     os.path.join(self.c_dict['SCRIPTS_BASE_DIR'],
                                  script)
                 )
+                plot_jobs.append((plotting_script, self.env.copy()))
+
+            self.clear()
+
+        self.run_plot_scripts(plot_jobs)
+
+    def run_plot_scripts(self, plot_jobs):
+        """! Run plotting scripts in worker processes that each run
+             many scripts so that the plotting modules are only imported
+             once per worker instead of once per script. The number of
+             workers is set by MAKE_PLOTS_NUM_WORKERS.
+
+             Args:
+                 plot_jobs - list of tuples containing the path to a
+                             plotting script and the environment
+                             variables to set when running it
+        """
+        if not plot_jobs:
+            return
+
+        num_workers = min(self.c_dict['NUM_WORKERS'], len(plot_jobs))
+        self.logger.info(f"Running {len(plot_jobs)} plotting scripts "
+                         f"using {num_workers} worker process(es)")
+        with ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=init_plot_worker,
+                initargs=(self.c_dict['SCRIPTS_BASE_DIR'],)
+        ) as executor:
+            futures = []
+            for plotting_script, env in plot_jobs:
+                self.logger.info(f"Running plotting script {plotting_script}")
+                futures.append(
+                    executor.submit(run_plot_script, plotting_script, env)
+                )
 
-                self.build_and_run_command()
-                self.clear()
+            for (plotting_script, _), future in zip(plot_jobs, futures):
+                try:
+                    return_code, error = future.result()
+                except Exception as err:
+                    return_code, error = 1, str(err)
+
+                if return_code:
+                    msg = (f"Plotting script {plotting_script} failed "
+                           f"with return code {return_code}")
+                    if error:
+                        msg += f": {error}"
+                    self.log_error(msg)
@@ -216,8 +216,10 @@ class MTDWrapper(MODEWrapper):
             if not fcst_file_ext or not obs_file_ext:
                 return
 
-            model_outfile = time_info['valid_fmt'] + '_mtd_fcst_' + fcst_file_ext + '.txt'
-            obs_outfile = time_info['valid_fmt'] + '_mtd_obs_' + obs_file_ext + '.txt'
+            model_outfile = self.get_list_file_name(time_info, 'fcst',
+                                                    fcst_file_ext, var_info)
+            obs_outfile = self.get_list_file_name(time_info, 'obs',
+                                                  obs_file_ext, var_info)
             model_list_path = self.write_list_file(model_outfile, model_list)
             obs_list_path = self.write_list_file(obs_outfile, obs_list)
 
@@ -257,7 +259,8 @@ class MTDWrapper(MODEWrapper):
         if not file_ext:
             return
 
-        single_outfile = time_info['valid_fmt'] + '_mtd_single_' + file_ext + '.txt'
+        single_outfile = self.get_list_file_name(time_info, 'single',
+                                                 file_ext, var_info)
         single_list_path = self.write_list_file(single_outfile, single_list)
 
         arg_dict = {}
@@ -271,6 +274,25 @@ class MTDWrapper(MODEWrapper):
         self.process_fields_one_thresh(current_task, var_info, **arg_dict)
 
 
+    def get_list_file_name(self, time_info, list_type, file_ext, var_info):
+        """! Get the name of the file that lists the input files for a field.
+              The field index and custom loop string are included so that a
+              list file is not rewritten while a command that was submitted
+              earlier is still reading it
+              Args:
+                @param time_info dictionary containing timing information
+                @param list_type type of list: fcst, obs, or single
+                @param file_ext name of the field or python embedding type
+                @param var_info object containing variable information
+                @returns name of list file
+        """
+        list_file = (f"{time_info['valid_fmt']}_mtd_{list_type}_{file_ext}"
+                     f"_idx{var_info['index']}")
+        if time_info.get('custom'):
+            list_file += f"_{time_info['custom']}"
+
+        return f'{list_file}.txt'
+
     def process_fields_one_thresh(self, time_info, var_info, model_path, obs_path):
         """! For each threshold, set up environment variables and run mode
               Args:
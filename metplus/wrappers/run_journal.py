@@ -0,0 +1,320 @@
+"""
+File Name: run_journal.py
+Contact(s): George McCabe
+Abstract: Keeps a record of the commands that ran successfully so that
+ commands that would produce the same output can be skipped when the
+ wrappers are run again, i.e. to resume a run that was interrupted
+History Log:  Initial version
+Usage: Used by CommandBuilder if USE_RUN_JOURNAL is True
+Parameters: None
+Input Files: N/A
+Output Files: SQLite database set by RUN_JOURNAL_FILE
+"""
+
+##@namespace run_journal
+# Each command that runs successfully is stored in an SQLite database with a
+# fingerprint computed from the command, the environment variables that were
+# set for it, and the size and modification time of each input file. Small
+# input files, such as file lists and MET config files that are written again
+# for each run, are identified by their contents instead. The files named in
+# file lists are also input files. Commands that read input that cannot be
+# fingerprinted, such as a directory, are not journaled.
+#
+# A command is skipped if its fingerprint matches the one that was stored and
+# its output has not changed since it was created. The output is checked with
+# its size and modification time, then with a checksum if they differ.
+#
+# Commands are only stored after they finish, so a command that was running
+# when a run was interrupted will run again.
+#
+
+import os
+import re
+import shlex
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+# input files smaller than this number of bytes are identified by their
+# contents instead of their size and modification time
+SMALL_FILE_SIZE = 65536
+
+# number of bytes to read at a time when computing checksums
+CHECKSUM_BLOCK_SIZE = 1048576
+
+# python embedding data types. The files read by the python script cannot be
+# identified, so commands that use them are not journaled
+PYTHON_EMBEDDING_REGEX = re.compile(r'PYTHON_(NUMPY|XARRAY|PANDAS)')
+
+# journals opened in this process keyed by path
+_journals = {}
+_journals_lock = threading.Lock()
+
+def get_run_journal(path, logger=None):
+    """!Get the journal for a path, opening it if it was not already opened
+        in this process, so wrappers that use the same file share it
+        Args:
+            @param path location of the SQLite database file
+            @param logger log object to write messages
+            @returns RunJournal object
+    """
+    path = os.path.abspath(path)
+    with _journals_lock:
+        if path not in _journals:
+            _journals[path] = RunJournal(path, logger)
+        return _journals[path]
+
+def get_file_checksum(path):
+    """!Compute the sha256 checksum of a file
+        Args:
+            @param path file to read
+            @returns hexadecimal checksum string
+    """
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as file_handle:
+        for block in iter(lambda: file_handle.read(CHECKSUM_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+def read_list_file(path):
+    """!Read the paths listed in a file list written by
+        CommandBuilder.write_list_file. The first line of the file is
+        file_list.
+        Args:
+            @param path file to read
+            @returns list of paths in the file or None if the file is not a
+             file list
+    """
+    try:
+        with open(path, 'r') as file_handle:
+            if file_handle.readline().strip() != 'file_list':
+                return None
+            return [line.strip() for line in file_handle if line.strip()]
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def get_command_input_files(cmd, output_path=None, infiles=None,
+                            env_items=None):
+    """!Get the files that are read by a command. Any argument of the
+        command, item in infiles, or path in the value of an environment
+        variable that is an existing file is considered an input, including
+        the executable, except the output path. The files listed in file
+        lists are also inputs. Directories, such as -lookin directories,
+        python embedding input, and files in file lists that do not exist
+        cannot be fingerprinted, so the inputs of the command cannot be
+        identified.
+        Args:
+            @param cmd command to run
+            @param output_path path of the output of the command
+            @param infiles list of input files set by the wrapper
+            @param env_items list of (name, value) tuples of environment
+             variables that are set for the command
+            @returns sorted list of file paths or None if the command reads
+             input that cannot be identified
+    """
+    try:
+        args = shlex.split(cmd)
+    except ValueError:
+        args = cmd.split()
+
+    for infile in infiles or []:
+        try:
+            args.extend(shlex.split(str(infile)))
+        except ValueError:
+            args.extend(str(infile).split())
+
+    # paths in environment variables may be inside of MET config strings
+    # or lists, i.e. [ "/path/to/file" ]. The temporary directory is not
+    # read as input
+    env_paths = []
+    for name, value in env_items or []:
+        if name == 'MET_TMP_DIR':
+            continue
+        if PYTHON_EMBEDDING_REGEX.search(str(value)):
+            return None
+        env_paths.extend(re.findall(r'/[^\s"\',\[\]{};]+', str(value)))
+
+    output_paths = set()
+    if output_path:
+        output_path = os.path.abspath(output_path)
+        output_paths = {output_path, os.path.dirname(output_path)}
+
+    input_files = set()
+    for arg in args + env_paths:
+        if PYTHON_EMBEDDING_REGEX.fullmatch(arg):
+            return None
+
+        if os.path.abspath(arg) in output_paths:
+            continue
+
+        if os.path.isdir(arg):
+            return None
+
+        if not os.path.isfile(arg):
+            continue
+
+        input_files.add(arg)
+        list_paths = read_list_file(arg)
+        if list_paths is None:
+            continue
+
+        for list_path in list_paths:
+            if not os.path.isfile(list_path):
+                return None
+            input_files.add(list_path)
+
+    return sorted(input_files)
+
+class RunJournal:
+    """!SQLite database containing the commands that ran successfully
+    """
+    def __init__(self, path, logger=None):
+        """!Create the database and table if they do not exist
+            Args:
+                @param path location of the SQLite database file
+                @param logger log object to write messages
+        """
+        self.path = path
+        self.logger = logger
+        self.lock = threading.Lock()
+
+        # connections cannot be shared with a forked process, so the
+        # process ID is stored to open a new connection if it changes
+        self._connection = None
+        self._connection_pid = None
+
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir and not os.path.exists(parent_dir):
+            os.makedirs(parent_dir, exist_ok=True)
+
+        with self.lock:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS commands ('
+                'command_hash TEXT PRIMARY KEY, '
+                'command TEXT, '
+                'fingerprint TEXT, '
+                'output_path TEXT, '
+                'output_size INTEGER, '
+                'output_mtime_ns INTEGER, '
+                'output_checksum TEXT, '
+                'finished TEXT)'
+            )
+            self.connection.commit()
+
+    @property
+    def connection(self):
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=60,
+                                               check_same_thread=False)
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def get_command_hash(cmd):
+        return hashlib.sha256(cmd.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_fingerprint(cmd, env_items, input_files):
+        """!Compute a fingerprint for a command that changes if the command,
+            the environment variables, or any of the input files change
+            Args:
+                @param cmd command to run
+                @param env_items list of (name, value) tuples of environment
+                 variables that are set for the command
+                @param input_files list of files read by the command
+                @returns hexadecimal fingerprint string
+        """
+        fingerprint = hashlib.sha256()
+        fingerprint.update(cmd.encode('utf-8'))
+        for name, value in sorted(env_items):
+            fingerprint.update(f'\0{name}={value}'.encode('utf-8'))
+
+        for input_file in input_files:
+            try:
+                file_stat = os.stat(input_file)
+            except OSError:
+                fingerprint.update(f'\0{input_file}:missing'.encode('utf-8'))
+                continue
+
+            if file_stat.st_size < SMALL_FILE_SIZE:
+                file_id = get_file_checksum(input_file)
+            else:
+                file_id = f'{file_stat.st_size}:{file_stat.st_mtime_ns}'
+            fingerprint.update(f'\0{input_file}:{file_id}'.encode('utf-8'))
+
+        return fingerprint.hexdigest()
+
+    def is_complete(self, cmd, fingerprint):
+        """!Check if a command already ran successfully with the same
+            fingerprint and its output has not changed since then
+            Args:
+                @param cmd command to run
+                @param fingerprint value returned by get_fingerprint
+                @returns True if the command can be skipped, False if not
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT fingerprint, output_path, output_size, '
+                'output_mtime_ns, output_checksum FROM commands '
+                'WHERE command_hash = ?', (self.get_command_hash(cmd),)
+            ).fetchone()
+
+        if row is None:
+            return False
+
+        (saved_fingerprint, output_path, output_size, output_mtime_ns,
+         output_checksum) = row
+        if saved_fingerprint != fingerprint:
+            return False
+
+        if not output_path:
+            return True
+
+        # output is a directory that may contain output from other commands
+        if output_checksum is None:
+            return os.path.isdir(output_path)
+
+        try:
+            file_stat = os.stat(output_path)
+        except OSError:
+            return False
+
+        if (file_stat.st_size == output_size and
+                file_stat.st_mtime_ns == output_mtime_ns):
+            return True
+
+        # file was modified or copied, so compare the contents
+        if get_file_checksum(output_path) != output_checksum:
+            return False
+
+        self.record(cmd, fingerprint, output_path, output_checksum)
+        return True
+
+    def record(self, cmd, fingerprint, output_path, output_checksum=None):
+        """!Store a command that ran successfully
+            Args:
+                @param cmd command that ran
+                @param fingerprint value returned by get_fingerprint
+                @param output_path file or directory written by the command
+                @param output_checksum checksum of the output file if it is
+                 already known
+        """
+        output_size = output_mtime_ns = None
+        if output_path and os.path.isfile(output_path):
+            file_stat = os.stat(output_path)
+            output_size = file_stat.st_size
+            output_mtime_ns = file_stat.st_mtime_ns
+            if output_checksum is None:
+                output_checksum = get_file_checksum(output_path)
+        else:
+            output_checksum = None
+
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO commands VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.get_command_hash(cmd), cmd, fingerprint, output_path,
+                 output_size, output_mtime_ns, output_checksum,
+                 datetime.now().isoformat())
+            )
+            self.connection.commit()
@@ -282,8 +282,14 @@ class SeriesAnalysisWrapper(CompareGriddedWrapper):
         if not file_ext:
             return False
 
-        list_file = time_info['valid_fmt'] + f'_SA_{data_type.lower()}_' + file_ext + '.txt'
-        list_path = self.write_list_file(list_file, found_files)
+        # include field index and custom string so a list file is not
+        # rewritten while a command submitted earlier is still reading it
+        list_file = (f"{time_info['valid_fmt']}_SA_{data_type.lower()}_"
+                     f"{file_ext}_idx{var_info['index']}")
+        if time_info.get('custom'):
+            list_file += f"_{time_info['custom']}"
+
+        list_path = self.write_list_file(f'{list_file}.txt', found_files)
         self.c_dict[f'{data_type}_LIST_PATH'] = list_path
         return True
 
@@ -15,6 +15,7 @@ import errno
 import os
 import re
 import sys
+from functools import partial
 
 from ..util import met_util as util
 from .tc_stat_wrapper import TCStatWrapper
@@ -63,6 +64,9 @@ class SeriesByInitWrapper(CommandBuilder):
         c_dict = super().create_c_dict()
         c_dict['MODEL'] = self.config.getstr('config', 'MODEL', 'FCST')
         c_dict['REGRID_TO_GRID'] = self.config.getstr('config', 'SERIES_ANALYSIS_REGRID_TO_GRID', '')
+        c_dict['PLOT_NUM_WORKERS'] = (
+            self.config.getint('config', 'SERIES_ANALYSIS_PLOT_NUM_WORKERS', 1)
+        )
         return c_dict
 
     def run_all_times(self):
@@ -665,6 +669,10 @@ class SeriesByInitWrapper(CommandBuilder):
         plot_data_plane_exe = os.path.join(self.config.getdir('MET_BIN_DIR', ''),
                                            'plot_data_plane')
 
+        # plots are created by jobs that run after all of the commands have
+        # been built so that up to SERIES_ANALYSIS_PLOT_NUM_WORKERS plots
+        # can be created at once
+        jobs = []
         full_vars_list = feature_util.retrieve_var_name_levels(self.config)
         for cur_var in full_vars_list:
             name, level = cur_var
@@ -708,9 +716,13 @@ class SeriesByInitWrapper(CommandBuilder):
                                                   cur_stat, '.ps']
                         plot_data_plane_output_fname = ''.join(
                             plot_data_plane_output)
-                        os.environ['CUR_STAT'] = cur_stat
                         self.add_env_var('CUR_STAT', cur_stat)
 
+                        # each job gets its own copy of the environment so
+                        # jobs that run at the same time do not share
+                        # CUR_STAT
+                        job_env = dict(os.environ, CUR_STAT=cur_stat)
+
                         # Create versions of the arg based on
                         # whether the background map is requested
                         # in param file.
@@ -753,12 +765,6 @@ class SeriesByInitWrapper(CommandBuilder):
                         # the command.
                         data_plane_command = self.cmdrunner.insert_metverbosity_opt\
                             (data_plane_command)
-                        (ret, cmd) = self.cmdrunner.run_cmd\
-                            (data_plane_command, env=None, app_name=self.app_name)
-
-                        if ret != 0:
-                            self.log_error(f"MET command returned a non-zero return code: {cmd}")
-                            self.logger.info("Check the logfile for more information on why it failed")
 
                         # Now assemble the command to convert the
                         # postscript file to png
@@ -770,10 +776,44 @@ class SeriesByInitWrapper(CommandBuilder):
                                          ' ', png_fname]
                         convert_command = ''.join(convert_parts)
 
-                        (ret, cmd) = self.cmdrunner.run_cmd(convert_command, ismetcmd=False)
-                        if ret != 0:
-                            self.log_error(f"MET command returned a non-zero return code: {cmd}")
-                            self.logger.info("Check the logfile for more information on why it failed")
+                        # convert reads the output of plot_data_plane, so
+                        # both commands run in order in the same job
+                        jobs.append((os.path.basename(png_fname),
+                                     partial(self.run_plot_commands,
+                                             data_plane_command,
+                                             convert_command,
+                                             job_env),
+                                     []))
+
+        results = util.run_jobs(jobs,
+                                self.c_dict['PLOT_NUM_WORKERS'],
+                                self.logger)
+        for (name, _, _), result in zip(jobs, results):
+            if result is None:
+                self.log_error(f"Could not run job {name}")
+                continue
+
+            for ret, cmd in result:
+                if ret != 0:
+                    self.log_error(f"MET command returned a non-zero return code: {cmd}")
+                    self.logger.info("Check the logfile for more information on why it failed")
+
+    def run_plot_commands(self, data_plane_command, convert_command, env):
+        """! Run plot_data_plane and convert the postscript file it creates
+             to png. Plots are created concurrently, so the log output of
+             each command is isolated until the command finishes.
+           Args:
+               @param data_plane_command: plot_data_plane command to run
+               @param convert_command: convert command to run
+               @param env: dictionary of environment variables to set
+           Returns:
+               list of (return code, command) for each command
+        """
+        return [self.cmdrunner.run_cmd(data_plane_command, env=env,
+                                       app_name=self.app_name,
+                                       isolate_log=True),
+                self.cmdrunner.run_cmd(convert_command, env=env,
+                                       ismetcmd=False, isolate_log=True)]
 
     def get_storms_for_init(self, cur_init, out_dir_base):
         """! Retrieve all the filter files which have the .tcst
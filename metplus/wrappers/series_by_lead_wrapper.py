@@ -3,6 +3,7 @@ import os
 import sys
 import errno
 import glob
+from functools import partial
 
 from ..util import met_util as util
 from ..util import time_util
@@ -46,12 +47,27 @@ class SeriesByLeadWrapper(CommandBuilder):
             'plot_data_plane')
 
         self.convert_exe = self.config.getexe('CONVERT')
-        self.ncap2_exe = self.config.getexe('NCAP2')
-        self.ncdump_exe = self.config.getexe('NCDUMP')
-        self.rm_exe = self.config.getexe("RM")
-        if not self.convert_exe or not self.ncap2_exe or not self.ncdump_exe or not self.rm_exe:
+
+        # NCO tools are only needed to get the plotting range if the
+        # series_analysis output cannot be read in process
+        if feature_util.can_read_netcdf():
+            self.ncap2_exe = None
+            self.ncdump_exe = None
+            self.rm_exe = None
+        else:
+            self.ncap2_exe = self.config.getexe('NCAP2')
+            self.ncdump_exe = self.config.getexe('NCDUMP')
+            self.rm_exe = self.config.getexe("RM")
+            if not self.ncap2_exe or not self.ncdump_exe or not self.rm_exe:
+                self.isOK = False
+
+        if not self.convert_exe:
             self.isOK = False
 
+        # min and max values of series_cnt_<STAT> variables read from
+        # series_analysis output. Key is the NetCDF file path
+        self.nc_min_max = {}
+
         met_bin_dir = self.config.getdir('MET_BIN_DIR', '')
         self.series_analysis_exe = os.path.join(met_bin_dir,
                                                 'series_analysis')
@@ -83,6 +99,9 @@ class SeriesByLeadWrapper(CommandBuilder):
         c_dict = super().create_c_dict()
         c_dict['MODEL'] = self.config.getstr('config', 'MODEL', 'FCST')
         c_dict['REGRID_TO_GRID'] = self.config.getstr('config', 'SERIES_ANALYSIS_REGRID_TO_GRID', '')
+        c_dict['PLOT_NUM_WORKERS'] = (
+            self.config.getint('config', 'SERIES_ANALYSIS_PLOT_NUM_WORKERS', 1)
+        )
         return c_dict
 
     def get_lead_sequences(self):
@@ -198,11 +217,9 @@ class SeriesByLeadWrapper(CommandBuilder):
                               " forecast hours...")
             self.perform_series_for_fhr_groups(tile_dir)
 
-        # Generate plots in NetCDF, png, and Postscript.
-        self.generate_plots(do_fhr_by_range)
-
-        # Create animated gif
-        self.create_animated_gifs(do_fhr_by_range)
+        # Generate plots in NetCDF, png, and Postscript and create the
+        # animated gifs from the png files
+        self.generate_plots_and_gifs(do_fhr_by_range)
 
         self.logger.info("Finished with series analysis by lead")
 
@@ -582,11 +599,71 @@ class SeriesByLeadWrapper(CommandBuilder):
                 # files or directories that still persist.
         util.prune_empty(self.series_lead_out_dir, self.logger)
 
+    def get_series_cnt_min_max(self, nc_var_files):
+        """! Read the min and max of the series_cnt_<STAT> variables for
+           each statistic and series_cnt_TOTAL from the netCDF files. All of
+           the variables are read from a file in one pass and the values are
+           stored so each file is only read once.
+
+           Args:
+              @param nc_var_files:  A list of the netCDF files generated
+                                    by the MET series analysis tool.
+
+           Returns:
+                 dictionary where the key is the netCDF file and the value is
+                 a dictionary of (min, max) for each series_cnt variable
+        """
+        var_names = []
+        for cur_stat in self.stat_list + ['TOTAL']:
+            var_name = f'series_cnt_{cur_stat}'
+            if var_name not in var_names:
+                var_names.append(var_name)
+
+        files_to_read = [nc_file for nc_file in nc_var_files
+                         if nc_file not in self.nc_min_max]
+        if files_to_read:
+            self.logger.debug(f"Reading min/max of {', '.join(var_names)} "
+                              f"from {len(files_to_read)} netCDF files")
+            self.nc_min_max.update(
+                feature_util.get_netcdf_min_max_for_files(
+                    files_to_read,
+                    var_names,
+                    self.c_dict['PLOT_NUM_WORKERS'])
+            )
+
+        return {nc_file: self.nc_min_max[nc_file]
+                for nc_file in nc_var_files}
+
     def get_nseries(self, do_fhr_by_range, nc_var_file):
         """! Determine the number of series for this lead time and
            its associated variable via calculating the max series_cnt_TOTAL
            value, maximum.
 
+           Args:
+              @param do_fhr_by_range:  Boolean value indicating whether series
+                                analysis was performed on a range of forecast
+                                hours (True) or on a "bucket" of forecast hours
+                                (False).
+              @param nc_var_file:  The netCDF file for a particular variable.
+
+           Returns:
+                 maximum (string): The maximum value of series_cnt_TOTAL of all
+                                  the netCDF files for the variable cur_var.
+                 None:          If no max value is found.
+        """
+        if not feature_util.can_read_netcdf():
+            return self.get_nseries_nco(do_fhr_by_range, nc_var_file)
+
+        min_max = self.get_series_cnt_min_max([nc_var_file])[nc_var_file]
+        return feature_util.format_netcdf_value(
+            min_max['series_cnt_TOTAL'][1]
+        )
+
+    def get_nseries_nco(self, do_fhr_by_range, nc_var_file):
+        """! Determine the number of series for this lead time and
+           its associated variable via calculating the max series_cnt_TOTAL
+           value, maximum. Uses the NCO tools ncap2 and ncdump.
+
            Args:
               @param do_fhr_by_range:  Boolean value indicating whether series
                                 analysis was performed on a range of forecast
@@ -704,6 +781,47 @@ class SeriesByLeadWrapper(CommandBuilder):
                    vmin:  The minimum
                    vmax:  The maximum
 
+        """
+        if not feature_util.can_read_netcdf():
+            return self.get_netcdf_min_max_nco(do_fhr_by_range,
+                                               nc_var_files,
+                                               cur_stat)
+
+        # Initialize the threshold values for min and max.
+        vmin = 999999.
+        vmax = -999999.
+
+        var_name = f'series_cnt_{cur_stat}'
+        for min_max in self.get_series_cnt_min_max(nc_var_files).values():
+            cur_min, cur_max = min_max[var_name]
+            if cur_min is not None and cur_min < vmin:
+                vmin = cur_min
+            if cur_max is not None and cur_max > vmax:
+                vmax = cur_max
+
+        return vmin, vmax
+
+    def get_netcdf_min_max_nco(self, do_fhr_by_range, nc_var_files, cur_stat):
+        """! Determine the min and max for all lead times for each
+           statistic and variable pairing. Uses the NCO tools ncap2
+           and ncdump.
+
+           Args:
+               @param do_fhr_by_range:  Boolean value indicating whether series
+                                     analysis was performed on a range of
+                                     forecast hours (True) or on a grouping
+                                     of forecast hours (False).
+               @param nc_var_files:  A list of the netCDF files generated
+                                     by the MET series analysis tool that
+                                     correspond to the variable of interest.
+               @param cur_stat:      The current statistic of interest: ie.
+                                     RMSE, MAE, ODEV, FDEV, ME, or TOTAL.
+
+           Returns:
+               tuple (vmin, vmax)
+                   vmin:  The minimum
+                   vmax:  The maximum
+
         """
         max_temporary_files = []
         min_temporary_files = []
@@ -1044,8 +1162,25 @@ class SeriesByLeadWrapper(CommandBuilder):
 
 
     def generate_plots(self, do_fhr_by_range):
+        """! Generate the plots for the series analysis results. Up to
+             SERIES_ANALYSIS_PLOT_NUM_WORKERS plots are created at once.
+
+             Args:
+                 @param do_fhr_by_range   The boolean flag which indicates
+                                       whether series analysis is to be
+                                       performed for the entire range of fhrs,
+                                       (True), or by groups of fhrs (False).
+
+             Returns: None
+
+        """
+        plot_jobs, _ = self.get_plot_jobs(do_fhr_by_range)
+        self.run_plot_jobs(plot_jobs)
+
+    def generate_plots_and_gifs(self, do_fhr_by_range):
         """! Generate the plots and animation GIFs for the series analysis
-             results.
+             results. Each animated GIF is created as soon as the plots it
+             reads have been created instead of waiting for all of the plots.
 
              Args:
                  @param do_fhr_by_range   The boolean flag which indicates
@@ -1056,12 +1191,72 @@ class SeriesByLeadWrapper(CommandBuilder):
              Returns: None
 
         """
+        plot_jobs, plot_job_indices = self.get_plot_jobs(do_fhr_by_range)
+        gif_jobs = self.get_animated_gif_jobs(do_fhr_by_range,
+                                              plot_job_indices)
+        self.run_plot_jobs(plot_jobs + gif_jobs)
 
-        # pylint:disable=protected-access
-        # Need to call sys.__getframe() to get the filename and method/func
-        # for logging information.
-        cur_filename = sys._getframe().f_code.co_filename
-        cur_function = sys._getframe().f_code.co_name
+    def run_plot_jobs(self, jobs):
+        """! Run plot and animation jobs using up to
+             SERIES_ANALYSIS_PLOT_NUM_WORKERS at once and log an error for
+             each command that failed in the same order that the jobs were
+             created.
+
+             Args:
+                 @param jobs list of (name, function, dependencies) tuples
+                  where function returns a list of (return code, command)
+
+             Returns: None
+        """
+        results = util.run_jobs(jobs,
+                                self.c_dict['PLOT_NUM_WORKERS'],
+                                self.logger)
+        for (name, _, _), result in zip(jobs, results):
+            if result is None:
+                self.log_error(f"Could not run job {name}")
+                continue
+
+            for ret, cmd in result:
+                if ret != 0:
+                    self.log_error(f"Command returned a non-zero return code: {cmd}")
+                    self.logger.info("Check the logfile for more information on why it failed")
+
+    def run_plot_job_commands(self, commands, env):
+        """! Run a list of commands for a single plot or animation job in
+             order. The output of each command is written to its own log
+             file first so it is not interleaved with the output of the
+             jobs that run at the same time.
+
+             Args:
+                 @param commands list of (command, run_cmd keyword args)
+                 @param env dictionary of environment variables to set
+                  when running the commands
+
+             Returns: list of (return code, command) for each command
+        """
+        return [self.cmdrunner.run_cmd(cmd, env=env, isolate_log=True,
+                                       **kwargs)
+                for cmd, kwargs in commands]
+
+    def get_plot_jobs(self, do_fhr_by_range):
+        """! Build the jobs that generate a PostScript and PNG plot for
+             each variable, statistic, and lead time. The plotting range and
+             number of series are read before any jobs run.
+
+             Args:
+                 @param do_fhr_by_range   The boolean flag which indicates
+                                       whether series analysis is to be
+                                       performed for the entire range of fhrs,
+                                       (True), or by groups of fhrs (False).
+
+             Returns: tuple of the list of (name, function, dependencies)
+              jobs and a dictionary with (name, level, stat) as keys and
+              a list of the indices of the jobs that create those plots as
+              values
+
+        """
+        jobs = []
+        job_indices = {}
 
         # Generate a plot for each variable, statistic, and lead time.
         # First, retrieve all the netCDF files that were generated
@@ -1083,6 +1278,15 @@ class SeriesByLeadWrapper(CommandBuilder):
                    str(len(nc_list)))
             self.logger.debug(msg)
 
+        # Create the plot data plane command based on whether
+        # the background map was requested in the
+        # param/config file.
+        if self.background_map:
+            # Flag set to True, print background map.
+            map_data = ''
+        else:
+            map_data = "map_data={source=[];}  "
+
         # Get the name and level to set the NAME and LEVEL
         # environment variables that
         # are needed by the MET series analysis binary.
@@ -1113,6 +1317,15 @@ class SeriesByLeadWrapper(CommandBuilder):
                        cur_stat + ":  " + str(vmin) + " to " + str(vmax))
                 self.logger.debug(msg)
 
+                super().set_environment_variables()
+
+                # each job gets its own copy of the environment so
+                # jobs that run at the same time do not share NAME,
+                # LEVEL, and CUR_STAT
+                job_env = self.env.copy()
+                stat_job_indices = job_indices.setdefault((name, level,
+                                                           cur_stat), [])
+
                 # Plot the output for each time
                 # DEBUG
                 self.logger.info("Create PS and PNG")
@@ -1158,17 +1371,6 @@ class SeriesByLeadWrapper(CommandBuilder):
                     # Get the max series_cnt_TOTAL value (i.e. nseries)
                     nseries = self.get_nseries(do_fhr_by_range, cur_nc)
 
-                    # Create the plot data plane command based on whether
-                    # the background map was requested in the
-                    # param/config file.
-                    if self.background_map:
-                        # Flag set to True, print background map.
-                        map_data = ''
-                    else:
-                        map_data = "map_data={source=[];}  "
-
-                    super().set_environment_variables()
-
                     plot_data_plane_parts = [self.plot_data_plane_exe, ' ',
                                              cur_nc, ' ', ps_file, ' ',
                                              "'", 'name = ', '"',
@@ -1192,25 +1394,25 @@ class SeriesByLeadWrapper(CommandBuilder):
                     plot_data_plane_cmd =\
                         self.cmdrunner.insert_metverbosity_opt\
                         (plot_data_plane_cmd)
-                    (ret, plot_data_plane_cmd) = self.cmdrunner.run_cmd\
-                        (plot_data_plane_cmd, env=self.env, app_name='plot_data_plane')
 
-                    if ret != 0:
-                        self.log_error(f"MET Command returned a non-zero return code: {plot_data_plane_cmd}")
-                        self.logger.info("Check the logfile for more information on why it failed")
-
-                    # Create the convert command.
+                    # Create the convert command. It reads the output
+                    # of plot_data_plane, so both run in the same job
                     convert_parts = [self.convert_exe, ' -rotate 90 ',
                                      ' -background white -flatten ',
                                      ps_file, ' ', png_file]
                     convert_cmd = ''.join(convert_parts)
-                    (ret, convert_cmd) = self.cmdrunner.run_cmd(convert_cmd, env=self.env,
-                                                                ismetcmd=False)
 
-                    if ret != 0:
-                        self.log_error(f"Command returned a non-zero return code: {convert_cmd}")
-                        self.logger.info("Check the logfile for more information on why it failed")
+                    commands = [
+                        (plot_data_plane_cmd, {'app_name': 'plot_data_plane'}),
+                        (convert_cmd, {'ismetcmd': False}),
+                    ]
+                    stat_job_indices.append(len(jobs))
+                    jobs.append((os.path.basename(png_file),
+                                 partial(self.run_plot_job_commands,
+                                         commands, job_env),
+                                 []))
 
+        return jobs, job_indices
 
     def create_animated_gifs(self, do_fhr_by_range):
         """! Creates the animated GIF files from the .png files created in
@@ -1224,12 +1426,29 @@ class SeriesByLeadWrapper(CommandBuilder):
             Returns:
 
         """
+        self.run_plot_jobs(self.get_animated_gif_jobs(do_fhr_by_range))
 
-        # pylint:disable=protected-access
-        # Need to call sys.__getframe() to get the filename and method/func
-        # for logging information.
-        cur_filename = sys._getframe().f_code.co_filename
-        cur_function = sys._getframe().f_code.co_name
+    def get_animated_gif_jobs(self, do_fhr_by_range, plot_job_indices=None):
+        """! Build the jobs that create an animated GIF file for each
+             variable and statistic from the .png files created by the
+             plot jobs.
+
+             Args:
+                  @param do_fhr_by_range:  The boolean flag indicating whether
+                                        series analysis was performed on the
+                                        entire range (True) or on groups of
+                                        forecast hours (False).
+                  @param plot_job_indices: optional dictionary returned by
+                                        get_plot_jobs. If set, each GIF job
+                                        depends on the jobs that create the
+                                        .png files it reads
+            Returns: list of (name, function, dependencies) jobs that must
+             be added after the plot jobs in the list of jobs to run
+        """
+        if plot_job_indices is None:
+            plot_job_indices = {}
+
+        jobs = []
 
         animate_dir = os.path.join(self.series_lead_out_dir, 'series_animate')
         msg = ('Creating Animation Plots, create directory:' +
@@ -1247,6 +1466,7 @@ class SeriesByLeadWrapper(CommandBuilder):
             self.add_env_var('NAME', name)
 
             super().set_environment_variables()
+            job_env = self.env.copy()
 
             self.logger.info("Creating animated gifs")
             for cur_stat in self.stat_list:
@@ -1263,14 +1483,6 @@ class SeriesByLeadWrapper(CommandBuilder):
                     animate_cmd = ''.join(gif_parts)
                     self.logger.debug("animate cmd: {}".format(animate_cmd))
 
-                    (ret, animate_cmd) = self.cmdrunner.run_cmd\
-                        (animate_cmd, env=self.env, ismetcmd=False,
-                         run_inshell=True, log_theoutput=True)
-
-                    if ret != 0:
-                        self.log_error(f"Command returned a non-zero return code: {animate_cmd}")
-                        self.logger.info("Check the logfile for more information on why it failed")
-
                 else:
                     # For series analysis by forecast hour groups, create a
                     # list of the series analysis output for all the forecast
@@ -1295,13 +1507,17 @@ class SeriesByLeadWrapper(CommandBuilder):
                                  cur_stat, '.gif']
 
                     animate_cmd = ''.join(gif_parts)
-                    (ret, animate_cmd) = self.cmdrunner.run_cmd \
-                        (animate_cmd, env=self.env, ismetcmd=False,
-                         run_inshell=True, log_theoutput=True)
 
-                    if ret != 0:
-                        self.log_error(f"Command returned a non-zero return code: {animate_cmd}")
-                        self.logger.info("Check the logfile for more information on why it failed")
+                commands = [(animate_cmd, {'ismetcmd': False,
+                                           'run_inshell': True,
+                                           'log_theoutput': True})]
+                jobs.append((f'series_animate_{name}_{level}_{cur_stat}.gif',
+                             partial(self.run_plot_job_commands,
+                                     commands, job_env),
+                             plot_job_indices.get((name, level, cur_stat),
+                                                  [])))
+
+        return jobs
 
     def apply_series_filters(self, tile_dir, init_times, series_output_dir,
                              filter_opts, staging_dir):
@@ -17,11 +17,17 @@ import re
 import glob
 import datetime
 import itertools
+from collections import namedtuple
 
 from ..util import met_util as util
-from ..util import do_string_sub
+from ..util import do_string_sub, get_tags
 from . import CommandBuilder
 
+# command and environment needed to run one stat_analysis job. The values
+# are copied when the job is created so that jobs can run in any order
+StatAnalysisJob = namedtuple('StatAnalysisJob',
+                             ['cmd', 'env', 'copyable_env', 'output_files'])
+
 class StatAnalysisWrapper(CommandBuilder):
     """! Wrapper to the MET tool stat_analysis which is used to filter 
          and summarize data from MET's point_stat, grid_stat, 
@@ -67,6 +73,41 @@ class StatAnalysisWrapper(CommandBuilder):
                                         'OBS_UNITS_LIST',
                                        ]
 
+    # environment variables that set the common filters in the StatAnalysis
+    # config file and the job command line options that set the same filter
+    job_filter_options = {'MODEL': '-model',
+                          'DESC': '-desc',
+                          'FCST_LEAD': '-fcst_lead',
+                          'OBS_LEAD': '-obs_lead',
+                          'FCST_VALID_BEG': '-fcst_valid_beg',
+                          'FCST_VALID_END': '-fcst_valid_end',
+                          'FCST_VALID_HOUR': '-fcst_valid_hour',
+                          'OBS_VALID_BEG': '-obs_valid_beg',
+                          'OBS_VALID_END': '-obs_valid_end',
+                          'OBS_VALID_HOUR': '-obs_valid_hour',
+                          'FCST_INIT_BEG': '-fcst_init_beg',
+                          'FCST_INIT_END': '-fcst_init_end',
+                          'FCST_INIT_HOUR': '-fcst_init_hour',
+                          'OBS_INIT_BEG': '-obs_init_beg',
+                          'OBS_INIT_END': '-obs_init_end',
+                          'OBS_INIT_HOUR': '-obs_init_hour',
+                          'FCST_VAR': '-fcst_var',
+                          'OBS_VAR': '-obs_var',
+                          'FCST_UNITS': '-fcst_units',
+                          'OBS_UNITS': '-obs_units',
+                          'FCST_LEVEL': '-fcst_lev',
+                          'OBS_LEVEL': '-obs_lev',
+                          'OBTYPE': '-obtype',
+                          'VX_MASK': '-vx_mask',
+                          'INTERP_MTHD': '-interp_mthd',
+                          'INTERP_PNTS': '-interp_pnts',
+                          'FCST_THRESH': '-fcst_thresh',
+                          'OBS_THRESH': '-obs_thresh',
+                          'COV_THRESH': '-cov_thresh',
+                          'ALPHA': '-alpha',
+                          'LINE_TYPE': '-line_type',
+                          }
+
     list_categories = ['GROUP_LIST_ITEMS', 'LOOP_LIST_ITEMS']
     list_categories_make_plots = ['GROUP_LIST_ITEMS_MAKE_PLOTS', 'LOOP_LIST_ITEMS_MAKE_PLOTS']
     # what is the used for? these are not formatted later
@@ -81,6 +122,12 @@ class StatAnalysisWrapper(CommandBuilder):
         self.app_name = os.path.basename(self.app_path)
         super().__init__(config, logger)
 
+        # filled lookin directories keyed by the template and the values
+        # used to fill it in, and the paths found for each wildcard path.
+        # Cleared each time run_stat_analysis is called
+        self.lookin_dir_cache = {}
+        self.lookin_glob_cache = {}
+
     def get_command(self):
 
         cmd = self.app_path
@@ -141,6 +188,10 @@ class StatAnalysisWrapper(CommandBuilder):
                                                    f'STAT_ANALYSIS_{job_conf}',
                                                    '')
 
+        c_dict['BATCH_JOBS'] = self.config.getbool('config',
+                                                   'STAT_ANALYSIS_BATCH_JOBS',
+                                                   False)
+
         # read in all lists except field lists, which will be read in afterwards and checked
         all_lists_to_read = self.expected_config_lists + self.list_categories
         non_field_lists = [conf_list for
@@ -1012,6 +1063,8 @@ class StatAnalysisWrapper(CommandBuilder):
     def get_lookin_dir(self, dir_path, lists_to_loop, lists_to_group, config_dict):
         """!Fill in necessary information to get the path to
             the lookin directory to pass to stat_analysis.
+            Filled directories are reused for other runs that have
+            the same values for the settings used in the template.
              
              Args:
                  dir_path          - string of the user provided
@@ -1027,6 +1080,11 @@ class StatAnalysisWrapper(CommandBuilder):
                  lookin_dir        - string of the filled directory
                                      from dir_path
         """
+        cache_key = self.get_lookin_dir_cache_key(dir_path, lists_to_loop,
+                                                  lists_to_group, config_dict)
+        if cache_key in self.lookin_dir_cache:
+            return self.lookin_dir_cache[cache_key]
+
         if '?fmt=' in dir_path:
             stringsub_dict = self.build_stringsub_dict(lists_to_loop,
                                                        lists_to_group, 
@@ -1037,13 +1095,85 @@ class StatAnalysisWrapper(CommandBuilder):
             dir_path_filled = dir_path
         if '*' in dir_path_filled:
             self.logger.debug(f"Expanding wildcard path: {dir_path_filled}")
-            dir_path_filled_all = ' '.join(sorted(glob.glob(dir_path_filled)))
-            self.logger.warning(f"Wildcard expansion found no matches")
+            if dir_path_filled not in self.lookin_glob_cache:
+                self.lookin_glob_cache[dir_path_filled] = (
+                    sorted(glob.glob(dir_path_filled))
+                )
+            dir_path_filled_all = (
+                ' '.join(self.lookin_glob_cache[dir_path_filled])
+            )
+            if not dir_path_filled_all:
+                self.logger.warning(f"Wildcard expansion found no matches")
         else:
             dir_path_filled_all = dir_path_filled
         lookin_dir = dir_path_filled_all
+        self.lookin_dir_cache[cache_key] = lookin_dir
         return lookin_dir
 
+    def get_lookin_dir_cache_key(self, dir_path, lists_to_loop,
+                                 lists_to_group, config_dict):
+        """!Get the values that are used to fill in a lookin directory
+            template. Only the lists that are referenced by name in the
+            template are included if all of the tags in the template
+            are list names. Otherwise all of the values that are read to
+            build the string substitution dictionary are included.
+
+             Args:
+                 dir_path          - string of the user provided
+                                     directory path
+                 lists_to_loop     - list of all the list names whose
+                                     items are being grouped together
+                 lists_to group    - list of all the list names whose
+                                     items are being looped over
+                 config_dict       - dictionary containing the
+                                     configuration information
+
+             Returns:
+                 cache_key         - tuple of the values
+        """
+        date_type = self.c_dict['DATE_TYPE']
+        list_names = [list_name.replace('_LIST', '')
+                      for list_name in lists_to_loop + lists_to_group]
+
+        # lists that are substituted directly into the template by name
+        # time and lead values are combined with other settings
+        tag_list_names = {list_name.lower(): list_name
+                          for list_name in list_names
+                          if 'HOUR' not in list_name
+                          and 'LEAD' not in list_name}
+
+        config_keys = set()
+        if '?fmt=' in dir_path:
+            for tag in get_tags(dir_path):
+                if tag in ('*', '?'):
+                    continue
+
+                if tag == 'obtype':
+                    config_keys.update(['MODEL', 'OBTYPE'])
+                    continue
+
+                list_name = tag_list_names.get(tag)
+                if list_name is None:
+                    config_keys.update(list_names)
+                    config_keys.update(['OBTYPE',
+                                        f'FCST_{date_type}_HOUR',
+                                        f'OBS_{date_type}_HOUR'])
+                    break
+
+                config_keys.add(list_name)
+
+            # FCST and OBS values may be used to fill in each other
+            for config_key in list(config_keys):
+                config_keys.add(config_key.replace('FCST', 'OBS'))
+                config_keys.add(config_key.replace('OBS', 'FCST'))
+
+        config_values = tuple((config_key, config_dict.get(config_key))
+                              for config_key in sorted(config_keys))
+
+        return (dir_path, tuple(lists_to_loop), tuple(lists_to_group),
+                self.c_dict['DATE_BEG'], self.c_dict['DATE_END'],
+                date_type, self.forMakePlots, config_values)
+
     def format_valid_init(self, config_dict):
         """! Format the valid and initialization dates and
              hours for the MET stat_analysis config file.
@@ -1689,6 +1819,11 @@ class StatAnalysisWrapper(CommandBuilder):
         """
         self.forMakePlots = False
 
+        # directories may have been created since the last run time, so
+        # fill in and search for the lookin directories again
+        self.lookin_dir_cache.clear()
+        self.lookin_glob_cache.clear()
+
         runtime_settings_dict_list = self.get_runtime_settings_dict_list()
         if not runtime_settings_dict_list:
             return False
@@ -1720,6 +1855,32 @@ class StatAnalysisWrapper(CommandBuilder):
                  @param runtime_settings_dict_list list of dictionaries
                   containing information needed to run a StatAnalysis job
         """
+        num_lookin_dirs = len(set(runtime_settings_dict['LOOKIN_DIR']
+                                  for runtime_settings_dict
+                                  in runtime_settings_dict_list))
+        self.logger.info(f"Found {num_lookin_dirs} distinct lookin "
+                         f"directory sets for "
+                         f"{len(runtime_settings_dict_list)} StatAnalysis "
+                         "jobs")
+
+        if self.c_dict['BATCH_JOBS']:
+            jobs = self.get_batched_stat_analysis_jobs(runtime_settings_dict_list)
+        else:
+            jobs = self.get_stat_analysis_jobs(runtime_settings_dict_list)
+
+        return self.run_stat_analysis_jobs(jobs)
+
+    def get_stat_analysis_jobs(self, runtime_settings_dict_list):
+        """! Create the command and environment for each StatAnalysis
+             job. The environment is copied for each job so the jobs
+             do not depend on the state of the wrapper when they run.
+
+             Args:
+                 @param runtime_settings_dict_list list of dictionaries
+                  containing information needed to run a StatAnalysis job
+                 @returns list of StatAnalysisJob
+        """
+        jobs = []
         for runtime_settings_dict in runtime_settings_dict_list:
 
             # Set environment variables and run stat_analysis.
@@ -1733,10 +1894,140 @@ class StatAnalysisWrapper(CommandBuilder):
             self.logger.debug(f"Setting -lookindir to {runtime_settings_dict['LOOKIN_DIR']}")
             self.lookindir = runtime_settings_dict['LOOKIN_DIR']
 
-            self.build_and_run_command()
+            cmd = self.get_command()
+            if cmd is None:
+                self.log_error("Could not generate command")
+            else:
+                output_files = tuple(
+                    runtime_settings_dict[f'{job_type}_FILENAME']
+                    for job_type in ['DUMP_ROW', 'OUT_STAT']
+                    if f'{job_type}_FILENAME' in runtime_settings_dict
+                )
+                jobs.append(StatAnalysisJob(cmd,
+                                            self.env.copy(),
+                                            self.get_env_copy(),
+                                            output_files))
 
             self.clear()
 
+        return jobs
+
+    def get_job_filter_args(self, runtime_settings_dict):
+        """! Get the job command line options that filter the same data
+             as the common filters that are set in the StatAnalysis
+             config file from the runtime settings.
+
+             Args:
+                 @param runtime_settings_dict dictionary containing all
+                  settings used in a run
+                 @returns string of job command line options, i.e.
+                  -model GFS -fcst_lead 240000
+        """
+        filter_args = []
+        for name, option in self.job_filter_options.items():
+            value = runtime_settings_dict.get(name, '')
+            for item in value.split(','):
+                item = util.remove_quotes(item.strip())
+                if item:
+                    filter_args.append(f'{option} {item}')
+
+        return ' '.join(filter_args)
+
+    def get_batched_stat_analysis_jobs(self, runtime_settings_dict_list):
+        """! Create StatAnalysis jobs that each run all of the jobs that
+             read the same -lookin directories so that the data is only
+             read once. The common filters for each job are moved to the
+             job command line and the jobs are combined into the jobs list
+             of the config file. Each job still writes its own dump_row
+             and out_stat files.
+
+             Args:
+                 @param runtime_settings_dict_list list of dictionaries
+                  containing information needed to run a StatAnalysis job
+                 @returns list of StatAnalysisJob
+        """
+        batches = {}
+        for runtime_settings_dict in runtime_settings_dict_list:
+            batch = batches.setdefault(runtime_settings_dict['LOOKIN_DIR'], [])
+            batch.append(runtime_settings_dict)
+
+        self.logger.info(f"Running {len(runtime_settings_dict_list)} "
+                         f"StatAnalysis jobs in {len(batches)} batches")
+
+        jobs = []
+        for batch in batches.values():
+            batch_settings_dict = dict(batch[0])
+            for name in self.job_filter_options:
+                if name in batch_settings_dict:
+                    batch_settings_dict[name] = ''
+
+            # the config file puts the job in quotes inside the jobs list,
+            # so separate the jobs with quotes to add them all to the list
+            batch_settings_dict['JOB'] = '", "'.join(
+                f"{runtime_settings_dict['JOB']} "
+                f"{self.get_job_filter_args(runtime_settings_dict)}".strip()
+                for runtime_settings_dict in batch
+            )
+
+            output_files = tuple(
+                runtime_settings_dict[f'{job_type}_FILENAME']
+                for runtime_settings_dict in batch
+                for job_type in ['DUMP_ROW', 'OUT_STAT']
+                if f'{job_type}_FILENAME' in runtime_settings_dict
+            )
+            for job in self.get_stat_analysis_jobs([batch_settings_dict]):
+                jobs.append(job._replace(output_files=output_files))
+
+        return jobs
+
+    def run_stat_analysis_jobs(self, jobs):
+        """! Run StatAnalysis jobs. Up to
+             STAT_ANALYSIS_MAX_CONCURRENT_COMMANDS jobs run at once.
+             Jobs are run one at a time if more than one job writes to
+             the same output file so the last job still wins.
+
+             Args:
+                 @param jobs list of StatAnalysisJob to run
+                 @returns True if all jobs succeeded, False if not
+        """
+        run_concurrently = self.c_dict['MAX_CONCURRENT_COMMANDS'] > 1
+        if run_concurrently:
+            output_files = [output_file for job in jobs
+                            for output_file in job.output_files]
+            if len(output_files) != len(set(output_files)):
+                self.logger.warning("Running StatAnalysis jobs one at a "
+                                    "time because more than one job "
+                                    "writes to the same output file")
+                run_concurrently = False
+
+        success = True
+        telemetry_tags = self.get_telemetry_tags()
+        for job in jobs:
+            self.all_commands.append(job.cmd)
+            if run_concurrently:
+                self.cmdrunner.submit_cmd(job.cmd, env=job.env,
+                                          app_name=self.app_name,
+                                          copyable_env=job.copyable_env,
+                                          telemetry_tags=telemetry_tags)
+                continue
+
+            ret, _ = self.cmdrunner.run_cmd(job.cmd, job.env,
+                                            app_name=self.app_name,
+                                            copyable_env=job.copyable_env,
+                                            telemetry_tags=telemetry_tags)
+            if ret != 0:
+                self.log_error("MET command returned a non-zero return "
+                               f"code: {job.cmd}")
+                self.logger.info("Check the logfile for more information on "
+                                 "why it failed: "
+                                 f"{self.config.getstr('config', 'LOG_METPLUS')}")
+                success = False
+
+        if run_concurrently:
+            success = self.wait_for_commands()
+
+        return success
+
     def run_all_times(self):
         date_type = self.c_dict['DATE_TYPE']
         self.c_dict['DATE_BEG'] = self.c_dict[date_type+'_BEG']
@@ -311,7 +311,13 @@ class TCGenWrapper(CommandBuilder):
         if not track_files:
             return False
 
-        list_filename = time_info['init_fmt'] + '_tc_gen_track.txt'
+        # include custom string so a list file is not rewritten while a
+        # command submitted earlier is still reading it
+        list_prefix = time_info['init_fmt']
+        if time_info.get('custom'):
+            list_prefix += f"_{time_info['custom']}"
+
+        list_filename = list_prefix + '_tc_gen_track.txt'
         self.c_dict['TRACK_FILE'] = self.write_list_file(list_filename, track_files)
 
         # get genesis file(s) or directory
@@ -323,7 +329,7 @@ class TCGenWrapper(CommandBuilder):
         if not genesis_files:
             return False
 
-        list_filename = time_info['init_fmt'] + '_tc_gen_genesis.txt'
+        list_filename = list_prefix + '_tc_gen_genesis.txt'
         self.c_dict['GENESIS_FILE'] = self.write_list_file(list_filename, genesis_files)
 
         # set LEAD_LIST to list of forecast leads used
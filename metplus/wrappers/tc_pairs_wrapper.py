@@ -17,8 +17,13 @@ Condition codes: 0 for success, 1 for failure
 import os
 import re
 import csv
+import io
+import json
+import hashlib
+import fcntl
 import datetime
-import glob
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
 from ..util import time_util
 from ..util import met_util as util
@@ -35,6 +40,175 @@ tc_pairs_wrapper.py [-c /path/to/user.template.conf]
 @endcode
 '''
 
+# number of rows to read and write at a time when reformatting deck files
+REFORMAT_CHUNK_SIZE = 10000
+
+# name of file in TC_PAIRS_REFORMAT_DIR that contains information about the
+# input files that were used to create each reformatted file
+REFORMAT_MANIFEST = '.tc_pairs_reformat_manifest.json'
+
+def get_file_hash(filename):
+    """!Get the SHA-256 hash of the contents of a file
+        Args:
+            @param filename path to file
+            @returns hexadecimal string of the hash
+    """
+    file_hash = hashlib.sha256()
+    with open(filename, 'rb') as file_handle:
+        for chunk in iter(lambda: file_handle.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+def deck_glob_to_regex(expression):
+    """!Convert a wildcard expression relative to a deck directory to a
+        regular expression that matches the same relative paths as glob.
+        Supports *, ?, and character classes, i.e. [ab], [a-z], or [!a]
+        Args:
+            @param expression wildcard expression, i.e. 2014/b??.dat
+            @returns compiled regular expression
+    """
+    regex = ''
+    index = 0
+    while index < len(expression):
+        char = expression[index]
+        index += 1
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[':
+            # a ] right after [ or [! is part of the class, not the end of it
+            end = index
+            if end < len(expression) and expression[end] == '!':
+                end += 1
+            if end < len(expression) and expression[end] == ']':
+                end += 1
+            end = expression.find(']', end)
+
+            # treat [ as a literal character if the class is not closed
+            if end == -1:
+                regex += re.escape(char)
+                continue
+
+            chars = expression[index:end].replace('\\', r'\\')
+            chars = re.sub(r'([&~|\[\]])', r'\\\1', chars)
+            index = end + 1
+            if chars.startswith('!'):
+                regex += f'[^/{chars[1:]}]'
+            elif chars.startswith('^'):
+                regex += f'[\\{chars}]'
+            else:
+                regex += f'[{chars}]'
+        else:
+            regex += re.escape(char)
+
+    return re.compile(regex)
+
+def match_deck_files(dir_files, expression):
+    """!Find the relative paths that match a wildcard expression from the
+        files found in each sub-directory of a deck directory. If the
+        directory part of the expression has no wildcards, only the files
+        in that directory are checked.
+        Args:
+            @param dir_files dictionary with the relative path of each
+             sub-directory as keys and a list of the names of the files in
+             that directory as values. The top directory is an empty string
+            @param expression wildcard expression relative to deck dir
+            @returns sorted list of relative paths that match
+    """
+    dir_part, file_part = os.path.split(expression)
+    if any(char in dir_part for char in '*?['):
+        dir_regex = deck_glob_to_regex(dir_part)
+        rel_dirs = [rel_dir for rel_dir in dir_files
+                    if rel_dir and dir_regex.fullmatch(rel_dir)]
+    else:
+        rel_dirs = [dir_part] if dir_part in dir_files else []
+
+    file_regex = deck_glob_to_regex(file_part)
+    return sorted(os.path.join(rel_dir, filename)
+                  for rel_dir in rel_dirs
+                  for filename in dir_files[rel_dir]
+                  if file_regex.fullmatch(filename))
+
+def reformat_deck_rows(rows, storm_month, missing_values):
+    """!Reformat rows of a deck file to match the expected ATCF format.
+        The storm month is added to the beginning of the storm number in the
+        second column, the third column is removed, and missing values are
+        replaced.
+        Args:
+            @param rows iterable of rows where each row is a list of columns
+            @param storm_month the storm month
+            @param missing_values a tuple where (MISSING_VAL_TO_REPLACE,
+             MISSING_VAL)
+            @returns generator of reformatted rows
+    """
+    value_to_replace = missing_values[0]
+    replacement = " " + missing_values[1]
+    for row in rows:
+        # leave lines without enough columns, i.e. blank lines, as is
+        if len(row) < 3:
+            yield row
+            continue
+
+        # Replace the second column (storm number) with
+        # the month followed by the storm number
+        # e.g. Replace 0006 with 010006
+        # this is done because this data has many storms per month
+        # and we need to know which storm we are processing if running
+        # over multiple months
+        row[1] = " " + storm_month + row[1].strip()
+
+        # Delete the third column
+        del row[2]
+
+        # Replace MISSING_VAL_TO_REPLACE=missing_values[0] with
+        # MISSING_VAL=missing_values[1]
+        yield [replacement if item.strip() == value_to_replace else item
+               for item in row]
+
+def reformat_deck_file(in_csvfile, storm_month, missing_values,
+                       out_csvfile, manifest_entry=None):
+    """!Read a deck file, reformat it, and write it to a temporary file that
+        is renamed to the output file when it is complete. The input file is
+        read and written REFORMAT_CHUNK_SIZE rows at a time. If manifest_entry
+        is set and the hash of the input file matches the hash in the entry,
+        the output file is not written again.
+        Args:
+            @param in_csvfile input csv file that is being parsed
+            @param storm_month The storm month
+            @param missing_values a tuple where (MISSING_VAL_TO_REPLACE,
+             MISSING_VAL)
+            @param out_csvfile the output csv file
+            @param manifest_entry optional dictionary with information about
+             the input file used to create the existing output file
+            @returns tuple of the hash of the input file and True if the file
+             was reformatted or False if it was unchanged
+    """
+    input_hash = get_file_hash(in_csvfile)
+    if (manifest_entry and manifest_entry.get('hash') == input_hash and
+            os.path.isfile(out_csvfile)):
+        return input_hash, False
+
+    # create output directory if it does not exist
+    os.makedirs(os.path.dirname(out_csvfile), exist_ok=True)
+
+    def write_function(out_file):
+        # Tell the write to use the line separator
+        # "\n" instead of the DOS "\r\n"
+        with io.TextIOWrapper(out_file, newline='') as text_file:
+            writer = csv.writer(text_file, lineterminator="\n")
+            with open(in_csvfile, newline='') as csvfile:
+                rows = reformat_deck_rows(csv.reader(csvfile), storm_month,
+                                          missing_values)
+                while True:
+                    chunk = list(islice(rows, REFORMAT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
+
+    util.write_file_atomically(out_csvfile, write_function)
+    return input_hash, True
+
 class TCPairsWrapper(CommandBuilder):
     """!Wraps the MET tool, tc_pairs to parse and match ATCF_by_pairs adeck and
        bdeck files.  Pre-processes extra tropical cyclone data.
@@ -49,6 +223,14 @@ class TCPairsWrapper(CommandBuilder):
         self.bdeck = []
         self.edeck = []
 
+        # name of every file in each sub-directory of each deck directory,
+        # read once
+        self.deck_dir_files = {}
+
+        # deck files that match each deck template, keyed by deck type and
+        # template filled with basin, cyclone, model, and time info
+        self.deck_catalog = {}
+
     def create_c_dict(self):
         """! Create a dictionary containing all the values set in the config file.
              This will make it easier for unit testing.
@@ -147,6 +329,13 @@ class TCPairsWrapper(CommandBuilder):
         c_dict['REFORMAT_DIR'] = \
                 self.config.getdir('TC_PAIRS_REFORMAT_DIR',
                                    os.path.join(c_dict['OUTPUT_BASE'], 'track_data_atcf'))
+        c_dict['REFORMAT_NUM_WORKERS'] = \
+                self.config.getint('config', 'TC_PAIRS_REFORMAT_NUM_WORKERS', 1)
+        if c_dict['REFORMAT_NUM_WORKERS'] is None or \
+           c_dict['REFORMAT_NUM_WORKERS'] < 1:
+            self.log_error('TC_PAIRS_REFORMAT_NUM_WORKERS must be an '
+                           'integer greater than or equal to 1')
+            c_dict['REFORMAT_NUM_WORKERS'] = 1
 
         c_dict['GET_ADECK'] = True if c_dict['ADECK_TEMPLATE'] else False
         c_dict['GET_EDECK'] = True if c_dict['EDECK_TEMPLATE'] else False
@@ -481,7 +670,7 @@ class TCPairsWrapper(CommandBuilder):
         self.logger.debug('Looking for BDECK: {}'.format(bdeck_glob))
 
         # get all files that match expression
-        bdeck_files = sorted(glob.glob(bdeck_glob))
+        bdeck_files = self.glob_deck_files('B', string_sub)
 
         # if no bdeck_files found
         if len(bdeck_files) == 0:
@@ -558,9 +747,11 @@ class TCPairsWrapper(CommandBuilder):
 
             # reformat extra tropical cyclone files if necessary
             if self.c_dict['REFORMAT_DECK']:
-                adeck_list = self.reformat_files(adeck_list, 'A', time_info)
-                bdeck_list = self.reformat_files(bdeck_list, 'B', time_info)
-                edeck_list = self.reformat_files(edeck_list, 'E', time_info)
+                adeck_list, bdeck_list, edeck_list = \
+                    self.reformat_deck_lists([(adeck_list, 'A'),
+                                              (bdeck_list, 'B'),
+                                              (edeck_list, 'E')],
+                                             time_info)
 
             self.adeck = adeck_list
             self.bdeck = bdeck_list
@@ -602,33 +793,92 @@ class TCPairsWrapper(CommandBuilder):
         """
         deck_list = []
         template = self.c_dict[deck+'DECK_TEMPLATE']
-        # get matching adeck wildcard expression for first model
-        string_sub = do_string_sub(template,
-                                   basin=basin,
-                                   cyclone=cyclone,
-                                   model=model_list[0],
-                                   **time_info)
-        deck_expr = os.path.join(self.c_dict[deck+'DECK_DIR'],
-                                 string_sub)
 
         # add adeck files if they exist
         for model in model_list:
-            deck_glob = deck_expr.replace(model_list[0], model)
-            self.logger.debug(f'Looking for {deck}DECK file: {deck_glob} using template {template}')
-            deck_files = glob.glob(deck_glob)
+            self.logger.debug(f'Looking for {deck}DECK file for model {model} '
+                              f'using template {template}')
+            deck_files = self.get_catalog_deck_files(deck, basin, cyclone,
+                                                     model, time_info)
             if not deck_files:
                 continue
 
             # there should only be 1 file that matches
             deck_file = deck_files[0]
-
-            # if deck exists, add to list
-            if os.path.isfile(deck_file):
-                self.logger.debug('Adding {}DECK: {}'.format(deck, deck_file))
-                deck_list.append(deck_file)
+            self.logger.debug('Adding {}DECK: {}'.format(deck, deck_file))
+            deck_list.append(deck_file)
 
         return deck_list
 
+    def get_deck_dir_files(self, deck):
+        """!Get the name of every file in each sub-directory of a deck
+            directory. The directory is only read the first time it is
+            requested, even if it is used for more than one type of deck.
+            Hidden files and directories are skipped like they are by glob.
+            Args:
+                @param deck type of deck (A, B, or E)
+                @returns dictionary with the relative path of each
+                 sub-directory as keys and a list of file names as values
+        """
+        deck_dir = self.c_dict[deck+'DECK_DIR']
+        if deck_dir in self.deck_dir_files:
+            return self.deck_dir_files[deck_dir]
+
+        dir_files = {}
+        num_files = 0
+        for dirpath, dirnames, filenames in os.walk(deck_dir,
+                                                    followlinks=True):
+            dirnames[:] = sorted(dirname for dirname in dirnames
+                                 if not dirname.startswith('.'))
+            rel_dir = os.path.relpath(dirpath, deck_dir)
+            if rel_dir == os.curdir:
+                rel_dir = ''
+            dir_files[rel_dir] = sorted(filename for filename in filenames
+                                        if not filename.startswith('.'))
+            num_files += len(dir_files[rel_dir])
+
+        self.logger.debug(f'Found {num_files} files in {deck}DECK '
+                          f'directory {deck_dir}')
+        self.deck_dir_files[deck_dir] = dir_files
+        return dir_files
+
+    def glob_deck_files(self, deck, expression):
+        """!Find files under a deck directory that match a wildcard expression
+            using the list of files that was read from the directory
+            Args:
+                @param deck type of deck (A, B, or E)
+                @param expression wildcard expression relative to deck dir
+                @returns sorted list of full paths to files that match
+        """
+        deck_dir = self.c_dict[deck+'DECK_DIR']
+        rel_paths = match_deck_files(self.get_deck_dir_files(deck),
+                                     os.path.normpath(expression))
+        return [os.path.join(deck_dir, rel_path) for rel_path in rel_paths]
+
+    def get_catalog_deck_files(self, deck, basin, cyclone, model, time_info):
+        """!Get the deck files that match the template for a deck type
+            filled in with a basin, cyclone, model, and time information.
+            The result is stored in the deck catalog so the files in the
+            deck directory are only compared to each expression once.
+            Args:
+                @param deck type of deck (A or E)
+                @param basin region of storm
+                @param cyclone ID number of cyclone
+                @param model name of model or wildcard expression
+                @param time_info object containing timing information
+                @returns sorted list of full paths to files that match
+        """
+        string_sub = do_string_sub(self.c_dict[deck+'DECK_TEMPLATE'],
+                                   basin=basin,
+                                   cyclone=cyclone,
+                                   model=model,
+                                   **time_info)
+        key = (deck, string_sub)
+        if key not in self.deck_catalog:
+            self.deck_catalog[key] = self.glob_deck_files(deck, string_sub)
+
+        return self.deck_catalog[key]
+
     def reformat_files(self, file_list, deck_type, time_info):
         """!Reformat track data to match expected ATCF format
             Args:
@@ -637,30 +887,152 @@ class TCPairsWrapper(CommandBuilder):
                 @param time_info object with timing information to get storm month
             Returns: list of output files that are in ATCF format
         """
+        return self.reformat_deck_lists([(file_list, deck_type)],
+                                        time_info)[0]
+
+    def reformat_deck_lists(self, deck_lists, time_info):
+        """!Reformat track data of one or more types of decks to match
+            expected ATCF format. Up to TC_PAIRS_REFORMAT_NUM_WORKERS files
+            are reformatted at once. Files are skipped if the reformatted file
+            exists and TC_PAIRS_SKIP_IF_REFORMAT_EXISTS is True or if the
+            reformatted file was created from the same input file contents
+            and settings according to the reformat manifest file.
+            Args:
+                @param deck_lists list of tuples containing a list of files to
+                 reformat and the type of deck (A, B, or E)
+                @param time_info object with timing information to get storm month
+            Returns: list containing a list of output files that are in ATCF
+             format for each item in deck_lists
+        """
         storm_month = time_info['init'].strftime('%m')
         missing_values = \
             (self.c_dict['MISSING_VAL_TO_REPLACE'],
              self.c_dict['MISSING_VAL'])
-        deck_dir = self.c_dict[deck_type+'DECK_DIR']
         reformat_dir = self.c_dict['REFORMAT_DIR']
+        manifest = self.read_reformat_manifest()
+
+        all_outfiles = []
+        jobs = []
+        for file_list, deck_type in deck_lists:
+            deck_dir = self.c_dict[deck_type+'DECK_DIR']
+            outfiles = []
+            for deck in file_list:
+                outfile = deck.replace(deck_dir,
+                                       reformat_dir)
+                outfiles.append(outfile)
+                if os.path.isfile(outfile) and self.c_dict['SKIP_REFORMAT'] is True:
+                    self.logger.debug('Skip processing {} because '.format(deck) +\
+                                      'reformatted file already exists. Change '+\
+                                      'TC_PAIRS_SKIP_IF_REFORMAT_EXISTS to False to '+\
+                                      'overwrite file')
+                    continue
+
+                # skip without reading the input file if its size and
+                # modification time have not changed
+                entry = self.get_reformat_manifest_entry(manifest, outfile,
+                                                         deck, storm_month,
+                                                         missing_values)
+                deck_stat = os.stat(deck)
+                if (entry and os.path.isfile(outfile) and
+                        entry['size'] == deck_stat.st_size and
+                        entry['mtime_ns'] == deck_stat.st_mtime_ns):
+                    self.logger.debug(f'Skip processing {deck} because it has '
+                                      'not changed since it was reformatted')
+                    continue
 
-        outfiles = []
-        for deck in file_list:
-            outfile = deck.replace(deck_dir,
-                                   reformat_dir)
-            if os.path.isfile(outfile) and self.c_dict['SKIP_REFORMAT'] is True:
-                self.logger.debug('Skip processing {} because '.format(deck) +\
-                                  'reformatted file already exists. Change '+\
-                                  'TC_PAIRS_SKIP_IF_REFORMAT_EXISTS to False to '+\
-                                  'overwrite file')
-            else:
                 self.logger.debug('Reformatting {} to {}'.format(deck, outfile))
-                self.read_modify_write_file(deck, storm_month,
-                                            missing_values, outfile)
+                jobs.append((deck, outfile, entry, deck_stat))
+
+            all_outfiles.append(outfiles)
 
-            outfiles.append(outfile)
+        if not jobs:
+            return all_outfiles
 
-        return outfiles
+        manifest_updates = {}
+        args = [(deck, storm_month, missing_values, outfile, entry)
+                for deck, outfile, entry, _ in jobs]
+        num_workers = min(self.c_dict['REFORMAT_NUM_WORKERS'], len(jobs))
+        if num_workers == 1:
+            results = [reformat_deck_file(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                results = list(executor.map(reformat_deck_file, *zip(*args)))
+
+        for (deck, outfile, _, deck_stat), (input_hash, changed) in zip(jobs,
+                                                                        results):
+            if not changed:
+                self.logger.debug(f'Reformatted file {outfile} is already '
+                                  f'up to date with {deck}')
+
+            manifest_updates[outfile] = {'input': deck,
+                                         'size': deck_stat.st_size,
+                                         'mtime_ns': deck_stat.st_mtime_ns,
+                                         'hash': input_hash,
+                                         'storm_month': storm_month,
+                                         'missing_values': list(missing_values),
+                                         }
+
+        self.write_reformat_manifest(manifest_updates)
+        return all_outfiles
+
+    @staticmethod
+    def get_reformat_manifest_entry(manifest, outfile, deck, storm_month,
+                                    missing_values):
+        """!Get the information about the input file that was used to create
+            a reformatted file if it was created from the same input file
+            using the same settings.
+            Args:
+                @param manifest dictionary read from the reformat manifest file
+                @param outfile path to reformatted file
+                @param deck path to input deck file
+                @param storm_month the storm month
+                @param missing_values a tuple where (MISSING_VAL_TO_REPLACE,
+                 MISSING_VAL)
+            Returns: dictionary of information or None if the reformatted file
+             cannot be reused
+        """
+        entry = manifest.get(outfile)
+        if (not entry or entry.get('input') != deck or
+                entry.get('storm_month') != storm_month or
+                entry.get('missing_values') != list(missing_values)):
+            return None
+        return entry
+
+    def get_reformat_manifest_path(self):
+        return os.path.join(self.c_dict['REFORMAT_DIR'], REFORMAT_MANIFEST)
+
+    def read_reformat_manifest(self):
+        """!Read the reformat manifest file from the reformat directory.
+            Returns: dictionary with reformatted file paths as keys and
+             information about the input files as values or an empty
+             dictionary if the file does not exist or cannot be read
+        """
+        try:
+            with open(self.get_reformat_manifest_path(), 'r') as file_handle:
+                return json.load(file_handle)
+        except (OSError, ValueError):
+            return {}
+
+    def write_reformat_manifest(self, manifest_updates):
+        """!Add or replace entries in the reformat manifest file in the
+            reformat directory. The file is read again and updated while
+            holding a lock on a lock file next to it so that entries written
+            by other run times that are processed at the same time are kept.
+            Args:
+                @param manifest_updates dictionary of entries to write
+        """
+        manifest_path = self.get_reformat_manifest_path()
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(f'{manifest_path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            manifest = self.read_reformat_manifest()
+            manifest.update(manifest_updates)
+            util.write_file_atomically(
+                manifest_path,
+                lambda file_handle: file_handle.write(
+                    json.dumps(manifest, indent=1, sort_keys=True).encode()
+                )
+            )
 
     def get_command(self):
         """! Over-ride CommandBuilder's get_command because unlike other MET
@@ -717,49 +1089,6 @@ class TCPairsWrapper(CommandBuilder):
                 @param missing_values a tuple where (MISSING_VAL_TO_REPLACE,
                                                      MISSING_VAL)
                 @param out_csvfile the output csv file
-                @param logger the log where logging is directed
         """
-        # create output directory if it does not exist
-        if not os.path.exists(os.path.dirname(out_csvfile)):
-            os.makedirs(os.path.dirname(out_csvfile))
-
-        # Open the output csv file
-        out_file = open(out_csvfile, "w", newline='')
-
-        # Tell the write to use the line separator
-        # "\n" instead of the DOS "\r\n"
-        writer = csv.writer(out_file, lineterminator="\n")
-
-        with open(in_csvfile, newline='') as csvfile:
-
-            in_file_reader = csv.reader(csvfile)
-
-            for row in in_file_reader:
-                # Create a list for the modified lines
-                row_list = []
-
-                # Replace the second column (storm number) with
-                # the month followed by the storm number
-                # e.g. Replace 0006 with 010006
-                # this is done because this data has many storms per month
-                # and we need to know which storm we are processing if running
-                # over multiple months
-                row[1] = " " + storm_month + (row[1]).strip()
-
-                # Iterate over the items, deleting or modifying the columns
-                for item in row:
-                    # Delete the third column
-                    if item == row[2]:
-                        continue
-                    # Replace MISSING_VAL_TO_REPLACE=missing_values[0] with
-                    # MISSING_VAL=missing_values[1]
-                    elif item.strip() == missing_values[0]:
-                        item = " " + missing_values[1]
-                    # Create a new row to write
-                    row_list.append(item)
-
-                # Write the modified file
-                writer.writerow(row_list)
-
-        csvfile.close()
-        out_file.close()
+        reformat_deck_file(in_csvfile, storm_month, missing_values,
+                           out_csvfile)
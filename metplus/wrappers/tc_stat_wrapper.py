@@ -303,7 +303,8 @@ class TCStatWrapper(CommandBuilder):
         # Run tc_stat
         try:
             (ret, cmd) = \
-                self.cmdrunner.run_cmd(tc_cmd_str, self.env, app_name=self.app_name)
+                self.cmdrunner.run_cmd(tc_cmd_str, self.env, app_name=self.app_name,
+                                       telemetry_tags=self.get_telemetry_tags())
             if not ret == 0:
                 raise ExitStatusException(
                     '%s: non-zero exit status' % (repr(cmd),), ret)
@@ -823,7 +824,8 @@ class TCStatWrapper(CommandBuilder):
             # tc_cmd = batchexe('sh')['-c', tc_cmd_str].err2out()
             # checkrun(tc_cmd)
             (ret, cmd) = \
-                self.cmdrunner.run_cmd(tc_cmd_str, self.env, app_name=self.app_name)
+                self.cmdrunner.run_cmd(tc_cmd_str, self.env, app_name=self.app_name,
+                                       telemetry_tags=self.get_telemetry_tags())
             if not ret == 0:
                 raise ExitStatusException(
                     '%s: non-zero exit status' % (repr(cmd),), ret)
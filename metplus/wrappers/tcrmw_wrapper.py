@@ -408,8 +408,15 @@ class TCRMWWrapper(CommandBuilder):
             return None
 
         if use_file_list:
-            # create an ascii file with a list of the input files
-            list_file = self.write_list_file(f"{os.path.basename(adeck_file)}_data_files.txt",
+            # create an ascii file with a list of the input files. The run
+            # time and custom string are included because the same ADECK
+            # file can be used for more than one run time
+            list_file = (f"{os.path.basename(adeck_file)}_"
+                         f"{time_info['init_fmt']}")
+            if time_info.get('custom'):
+                list_file += f"_{time_info['custom']}"
+
+            list_file = self.write_list_file(f"{list_file}_data_files.txt",
                                              all_input_files)
             self.infiles.append(list_file)
         else:
@@ -45,6 +45,16 @@ plock=threading.Lock()
 # Set of pipes that must be closed after forking to avoid deadlocks.
 pipes_to_close=set()
 
+def _reset_plock():
+    """!Replaces plock in a newly forked child process.  Another
+    thread may have held plock when the parent forked, in which case
+    the child's copy would stay locked and the child would hang in
+    pclose_all before it could exec."""
+    global plock
+    plock=threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_plock)
+
 ##@var PIPE
 # Indicates that stdout, stdin or stderr should be a pipe.
 PIPE=Constant('PIPE')
@@ -698,6 +708,14 @@ class Pipeline(object):
         else:
             return -128
 
+    def rusage(self):
+        """!Returns a dict mapping from process id to the resource
+        usage returned by os.wait4 for each process in the pipeline,
+        or None if the pipeline has not completed."""
+        m=self.__managed
+        if not m: return None
+        return dict([(pid,r[2]) for (pid,r) in m.items()])
+
     def to_string(self):
         """!Calls self.communicate(), and returns the stdout from the
         pipeline (self.outbytes).  The return value will be Null if
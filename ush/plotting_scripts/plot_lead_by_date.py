@@ -214,10 +214,6 @@ if cov_thresh != '':
     extra_plot_title+=', Cov. Thresh:'+cov_thresh
 if alpha != '':
     extra_plot_title+=', Alpha: '+alpha
-# MET .stat file formatting
-stat_file_base_columns = plot_util.get_stat_file_base_columns(met_version)
-nbase_columns = len(stat_file_base_columns)
-
 # Start looping to make plots
 for plot_info in plot_info_list:
     fcst_leads = plot_info[0]
@@ -402,29 +398,9 @@ for plot_info in plot_info_list:
                     logger.debug("Model "+str(model_num)+" "+model_name+" "
                                  +"with plot name "+model_plot_name+" "
                                  +"file: "+model_stat_file+" exists")
-                    model_lead_now_stat_file_data = pd.read_csv(
-                        model_stat_file, sep=" ", skiprows=1,
-                        skipinitialspace=True, header=None
-                    )
-                    model_lead_now_stat_file_data.rename(
-                        columns=dict(zip(
-                            model_lead_now_stat_file_data.columns \
-                            [:len(stat_file_base_columns)],
-                            stat_file_base_columns
-                        )), inplace=True
-                    )
-                    line_type = model_lead_now_stat_file_data['LINE_TYPE'][0]
-                    stat_file_line_type_columns = (
-                        plot_util.get_stat_file_line_type_columns(logger,
-                                                                  met_version,
-                                                                  line_type)
-                    )
-                    model_lead_now_stat_file_data.rename(
-                        columns=dict(zip(
-                            model_lead_now_stat_file_data.columns \
-                            [len(stat_file_base_columns):],
-                            stat_file_line_type_columns
-                        )), inplace=True
+                    model_lead_now_stat_file_data, stat_file_line_type_columns = (
+                        plot_util.read_stat_file(logger, model_stat_file,
+                                                 met_version)
                     )
                     model_lead_now_stat_file_data_fcstvaliddates = (
                         model_lead_now_stat_file_data.loc[:] \
@@ -74,6 +74,7 @@ model_reference_name_list = os.environ['MODEL_REFERENCE_NAME'].split(', ')
 dump_row_filename_template = os.environ['DUMP_ROW_FILENAME']
 average_method = os.environ['AVERAGE_METHOD']
 ci_method = os.environ['CI_METHOD']
+ci_random_seed = os.environ.get('CI_RANDOM_SEED', '')
 verif_grid = os.environ['VERIF_GRID']
 event_equalization = os.environ['EVENT_EQUALIZATION']
 met_version = os.environ['MET_VERSION']
@@ -215,9 +216,6 @@ if cov_thresh != '':
     extra_plot_title+=', Cov. Thresh:'+cov_thresh
 if alpha != '':
     extra_plot_title+=', Alpha: '+alpha
-# MET .stat file formatting
-stat_file_base_columns = plot_util.get_stat_file_base_columns(met_version)
-nbase_columns = len(stat_file_base_columns)
 # Significance testing info
 # need to set up random number array [nmodels, ntests, ndays]
 # for EMC Monte Carlo testing. Each model has its own 
@@ -231,7 +229,10 @@ mc_dates, mc_expected_stat_file_dates = plot_util.get_date_arrays(
 )
 ndays = len(mc_expected_stat_file_dates)
 ntests = 10000
-randx = np.random.rand(nmodels,ntests,ndays)
+if ci_random_seed:
+    randx = np.random.RandomState(int(ci_random_seed)).rand(nmodels,ntests,ndays)
+else:
+    randx = np.random.rand(nmodels,ntests,ndays)
 
 # Start looping to make plots
 for plot_info in plot_info_list:
@@ -432,27 +433,9 @@ for plot_info in plot_info_list:
                 logger.debug("Model "+str(model_num)+" "+model_name+" "
                              +"with plot name "+model_plot_name+" "
                              +"file: "+model_stat_file+" exists")
-                model_now_stat_file_data = pd.read_csv(
-                    model_stat_file, sep=" ", skiprows=1,
-                    skipinitialspace=True, header=None
-                )
-                model_now_stat_file_data.rename(
-                    columns=dict(zip(
-                        model_now_stat_file_data.columns[:nbase_columns],
-                        stat_file_base_columns
-                    )), inplace=True
-                )
-                line_type = model_now_stat_file_data['LINE_TYPE'][0]
-                stat_file_line_type_columns = (
-                    plot_util.get_stat_file_line_type_columns(logger,
-                                                              met_version,
-                                                              line_type)
-                )
-                model_now_stat_file_data.rename(
-                    columns=dict(zip(
-                        model_now_stat_file_data.columns[nbase_columns:],
-                        stat_file_line_type_columns
-                    )), inplace=True
+                model_now_stat_file_data, stat_file_line_type_columns = (
+                    plot_util.read_stat_file(logger, model_stat_file,
+                                             met_version)
                 )
                 model_now_stat_file_data_fcst_valid_dates = (
                     model_now_stat_file_data.loc[:]['FCST_VALID_BEG'].values
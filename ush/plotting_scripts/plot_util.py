@@ -1,6 +1,9 @@
 import os
 import datetime as datetime
 import time
+import tempfile
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 
@@ -9,6 +12,26 @@ import pandas as pd
  @brief Provides utility functions for METplus plotting use case.
 """
 
+# number of Monte Carlo tests to resample at once in calculate_ci
+MC_CHUNK_SIZE = 1000
+
+# extension added to a .stat file path to get its parsed column cache file
+STAT_FILE_CACHE_EXT = '.cols.npz'
+
+# version of the column cache layout. Increment to ignore old cache files
+STAT_FILE_CACHE_VERSION = 1
+
+# maximum number of .stat files to keep in memory in each process. The
+# least recently used file is dropped first and is read from its cache
+# file if it is needed again
+STAT_FILE_DATA_MAX_FILES = 16
+
+# .stat file data that has already been read by this process, keyed by
+# path, MET version, size, and modification time of the file, in order
+# from least to most recently used
+_stat_file_data = OrderedDict()
+_stat_file_data_lock = threading.Lock()
+
 def get_date_arrays(date_type, date_beg, date_end,
                     fcst_valid_hour, fcst_init_hour, 
                     obs_valid_hour, obs_init_hour,
@@ -339,6 +362,191 @@ def get_stat_file_line_type_columns(logger, met_version, line_type):
             ]
     return stat_file_line_type_columns
 
+def get_stat_file_signature(stat_file):
+    """! Get values that change when a .stat file is modified
+
+             Args:
+                 stat_file - string of the path to the .stat file
+
+             Returns:
+                 signature - tuple of the size and modification
+                             time in nanoseconds of the file
+    """
+    file_stat = os.stat(stat_file)
+    return (file_stat.st_size, file_stat.st_mtime_ns)
+
+def encode_stat_file_columns(stat_file_data):
+    """! Convert the columns of a .stat file DataFrame to arrays
+         that can be saved without pickling. Text columns are
+         stored as integer codes and the list of unique values.
+
+             Args:
+                 stat_file_data - DataFrame of .stat file data
+
+             Returns:
+                 arrays         - dictionary of numpy arrays
+    """
+    arrays = {'columns': np.array(stat_file_data.columns, dtype=str)}
+    for col_idx, col in enumerate(stat_file_data.columns):
+        values = stat_file_data[col]
+        if values.dtype == object or isinstance(values.dtype,
+                                                pd.StringDtype):
+            codes, uniques = pd.factorize(values)
+            arrays['codes'+str(col_idx)] = codes.astype(np.int32)
+            arrays['uniques'+str(col_idx)] = np.array(uniques, dtype=str)
+        else:
+            arrays['values'+str(col_idx)] = values.to_numpy()
+    return arrays
+
+def decode_stat_file_columns(arrays):
+    """! Convert arrays created by encode_stat_file_columns
+         back to a DataFrame
+
+             Args:
+                 arrays         - dictionary-like object of numpy arrays
+
+             Returns:
+                 stat_file_data - DataFrame of .stat file data
+    """
+    columns = arrays['columns'].tolist()
+    data = {}
+    for col_idx, col in enumerate(columns):
+        if 'codes'+str(col_idx) in arrays:
+            codes = arrays['codes'+str(col_idx)]
+            uniques = arrays['uniques'+str(col_idx)].astype(object)
+            values = np.full(len(codes), np.nan, dtype=object)
+            values[codes >= 0] = uniques[codes[codes >= 0]]
+        else:
+            values = arrays['values'+str(col_idx)]
+        data[col] = values
+    return pd.DataFrame(data, columns=columns)
+
+def read_stat_file_cache(stat_file, met_version, signature):
+    """! Read the parsed columns of a .stat file from the cache
+         file next to it if it was created from the same version
+         of the file
+
+             Args:
+                 stat_file      - string of the path to the .stat file
+                 met_version    - string of MET version number
+                 signature      - tuple from get_stat_file_signature
+
+             Returns:
+                 stat_file_data - DataFrame of .stat file data or
+                                  None if the cache cannot be used
+    """
+    cache_file = stat_file+STAT_FILE_CACHE_EXT
+    try:
+        with np.load(cache_file, allow_pickle=False) as arrays:
+            if (arrays['cache_version'] != STAT_FILE_CACHE_VERSION
+                    or str(arrays['met_version']) != str(met_version)
+                    or tuple(arrays['signature'].tolist()) != signature):
+                return None
+            return decode_stat_file_columns(arrays)
+    except (OSError, KeyError, ValueError):
+        return None
+
+def write_stat_file_cache(logger, stat_file, met_version, signature,
+                          stat_file_data):
+    """! Write the parsed columns of a .stat file to a cache
+         file next to it. The file is written to a temporary
+         file that is renamed when complete so other processes
+         never read a partial cache file.
+
+             Args:
+                 stat_file      - string of the path to the .stat file
+                 met_version    - string of MET version number
+                 signature      - tuple from get_stat_file_signature
+                 stat_file_data - DataFrame of .stat file data
+    """
+    cache_file = stat_file+STAT_FILE_CACHE_EXT
+    arrays = encode_stat_file_columns(stat_file_data)
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file),
+                                        suffix='.tmp')
+    except OSError as err:
+        logger.debug("Could not write cache for "+stat_file+": "+str(err))
+        return
+    try:
+        with os.fdopen(fd, 'wb') as file_handle:
+            np.savez(file_handle,
+                     cache_version=STAT_FILE_CACHE_VERSION,
+                     met_version=str(met_version),
+                     signature=np.array(signature, dtype=np.int64),
+                     **arrays)
+        os.replace(tmp_file, cache_file)
+    except OSError as err:
+        logger.debug("Could not write cache for "+stat_file+": "+str(err))
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def read_stat_file(logger, stat_file, met_version):
+    """! Read a MET .stat file and name the columns using the
+         standard columns for the MET version and the line type
+         columns for the line type of the first line. The file
+         is only parsed once. The columns of the most recently used
+         files are kept in memory and all files are cached in a file
+         next to the .stat file so later reads in this process or
+         other processes skip parsing the text until the .stat file
+         is modified.
+
+             Args:
+                 stat_file      - string of the path to the .stat file
+                 met_version    - string of MET version number
+                                  being used to run stat_analysis
+
+             Returns:
+                 stat_file_data - DataFrame of .stat file data
+                 stat_file_line_type_columns - list of the line
+                                               type columns
+    """
+    signature = get_stat_file_signature(stat_file)
+    key = (os.path.abspath(stat_file), str(met_version), signature)
+    with _stat_file_data_lock:
+        stat_file_data = _stat_file_data.get(key)
+        if stat_file_data is not None:
+            _stat_file_data.move_to_end(key)
+
+    if stat_file_data is None:
+        stat_file_data = read_stat_file_cache(stat_file, met_version,
+                                              signature)
+        if stat_file_data is None:
+            stat_file_data = pd.read_csv(
+                stat_file, sep=" ", skiprows=1,
+                skipinitialspace=True, header=None
+            )
+            stat_file_base_columns = get_stat_file_base_columns(met_version)
+            nbase_columns = len(stat_file_base_columns)
+            stat_file_data.rename(
+                columns=dict(zip(
+                    stat_file_data.columns[:nbase_columns],
+                    stat_file_base_columns
+                )), inplace=True
+            )
+            line_type = stat_file_data['LINE_TYPE'][0]
+            stat_file_line_type_columns = (
+                get_stat_file_line_type_columns(logger, met_version,
+                                                line_type)
+            )
+            stat_file_data.rename(
+                columns=dict(zip(
+                    stat_file_data.columns[nbase_columns:],
+                    stat_file_line_type_columns
+                )), inplace=True
+            )
+            write_stat_file_cache(logger, stat_file, met_version, signature,
+                                  stat_file_data)
+        with _stat_file_data_lock:
+            _stat_file_data[key] = stat_file_data
+            while len(_stat_file_data) > STAT_FILE_DATA_MAX_FILES:
+                _stat_file_data.popitem(last=False)
+
+    stat_file_line_type_columns = (
+        get_stat_file_line_type_columns(logger, met_version,
+                                        stat_file_data['LINE_TYPE'][0])
+    )
+    return stat_file_data.copy(), stat_file_line_type_columns
+
 def get_clevels(data):
     """! Get contour levels for plotting
   
@@ -408,8 +616,84 @@ def calculate_average(logger, average_method, stat, model_dataframe,
         exit(1)
     return average_array
 
+def get_monte_carlo_data(modelB_values, modelA_values, total_days, randx):
+    """! Build the resampled datasets for a set of Monte Carlo tests.
+         For each test and day, the values from the two models are
+         swapped if the random number is less than 0.5
+ 
+             Args:
+                 modelB_values - dataframe of model B .stat columns
+                 modelA_values - dataframe of model A .stat columns
+                 total_days    - integer of total number of days
+                                 being resampled
+                 randx         - 2D array of random numbers [0,1),
+                                 [ntests, ndays]
+
+             Returns:
+                 rand1_data    - array of resampled model values,
+                                 [ntests, nrows, ncolumns]
+                 rand2_data    - array of resampled model values
+                                 with the models swapped,
+                                 [ntests, nrows, ncolumns]
+    """
+    ntests = randx.shape[0]
+    nrows, ncolumns = modelB_values.shape
+    modelB_array = modelB_values.values[:total_days,:].astype(float)
+    modelA_array = modelA_values.values[:total_days,:].astype(float)
+    use_modelA = (randx[:,:total_days] - 0.5 >= 0)[:,:,np.newaxis]
+    rand1_data = np.full((ntests, nrows, ncolumns), np.nan)
+    rand2_data = np.full((ntests, nrows, ncolumns), np.nan)
+    rand1_data[:,:total_days,:] = np.where(use_modelA, modelA_array,
+                                           modelB_array)
+    rand2_data[:,:total_days,:] = np.where(use_modelA, modelB_array,
+                                           modelA_array)
+    return rand1_data, rand2_data
+
+def calculate_monte_carlo_average(logger, average_method, stat, rand_data,
+                                  columns):
+    """! Calculate the average of the statistic for each Monte Carlo
+         test. Equivalent to calling calculate_stat and calculate_average
+         for each test separately
+ 
+             Args:
+                 logger         - logging file
+                 average_method - string of the method to 
+                                  use to calculate the
+                                  average
+                 stat           - string of the statistic the
+                                  average is being taken for
+                 rand_data      - array of resampled model values,
+                                  [ntests, nrows, ncolumns]
+                 columns        - list of the .stat column names
+
+             Returns:
+                 average_array  - array of average values, [ntests]
+    """
+    ntests, nrows, ncolumns = rand_data.shape
+    if average_method == 'AGGREGATION':
+        rand_dataframe = pd.DataFrame(
+            np.nansum(rand_data, axis=1)/nrows, columns=columns
+        )
+        stat_values, stat_values_array, stat_plot_name = (
+            calculate_stat(logger, rand_dataframe, stat)
+        )
+        return np.ma.filled(stat_values_array[0,:], np.nan)
+    rand_dataframe = pd.DataFrame(
+        rand_data.reshape(ntests*nrows, ncolumns),
+        index=pd.MultiIndex.from_product([range(ntests), range(nrows)]),
+        columns=columns
+    )
+    stat_values, stat_values_array, stat_plot_name = (
+        calculate_stat(logger, rand_dataframe, stat)
+    )
+    if average_method == 'MEAN':
+        average_array = np.ma.mean(stat_values_array[0,:,:], axis=1)
+    elif average_method == 'MEDIAN':
+        average_array = np.ma.median(stat_values_array[0,:,:], axis=1)
+    return np.ma.filled(average_array, np.nan)
+
 def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
-                 stat, average_method, randx):
+                 stat, average_method, randx, chunk_size=MC_CHUNK_SIZE):
     """! Calculate confidence intervals between two sets of data
  
              Args:
@@ -427,6 +711,9 @@ def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
                                   use to calculate the
                                   average
                  randx          - 2D array of random numbers [0,1)
+                 chunk_size     - integer of the number of Monte
+                                  Carlo tests to process at once,
+                                  limits memory usage
 
              Returns:
                  intvl          - float of the confidence interval
@@ -447,50 +734,27 @@ def calculate_ci(logger, ci_method, modelB_values, modelA_values, total_days,
         elif ndays < 20:
             intvl = 2.228*modelB_modelA_std/np.sqrt(ndays-1)
     elif ci_method == 'EMC_MONTE_CARLO':
-        ntest, ntests = 1, 10000
-        scores_rand1 = np.empty(ntests)
-        scores_rand2 = np.empty(ntests)
+        ntests = 10000
+        if average_method not in ['MEAN', 'MEDIAN', 'AGGREGATION']:
+            logger.error("Invalid entry for MEAN_METHOD, "
+                         +"use MEAN, MEDIAN, or AGGREGATION")
+            exit(1)
         scores_diff = np.empty(ntests)
-        while ntest <= ntests:
-            rand1_data = pd.DataFrame(
-                np.nan, index=modelB_values.index,
-                columns=modelB_values.columns
-            )
-            replace_level= rand1_data.index.get_level_values(0)[0]
-            rand1_data.rename(index={replace_level: 'rand1'}, inplace=True)
-            rand2_data = pd.DataFrame(
-                np.nan, index=modelB_values.index,
-                columns=modelB_values.columns
-            )
-            replace_level= rand2_data.index.get_level_values(0)[0]
-            rand2_data.rename(index={replace_level: 'rand2'}, inplace=True)
-            nday, ndays = 1, total_days
-            while nday <= ndays:
-                if randx[ntest-1,nday-1] - 0.5 >= 0:
-                    rand1_data.iloc[nday-1,:] = modelA_values.iloc[nday-1,:]
-                    rand2_data.iloc[nday-1,:] = modelB_values.iloc[nday-1,:]
-                else:
-                    rand1_data.iloc[nday-1,:] = modelB_values.iloc[nday-1,:]
-                    rand2_data.iloc[nday-1,:] = modelA_values.iloc[nday-1,:]
-                nday+=1
-            rand1_stat_values, rand1_stat_values_array, stat_plot_name = (
-                calculate_stat(logger, rand1_data, stat)
+        for chunk_start in range(0, ntests, chunk_size):
+            chunk_end = min(chunk_start+chunk_size, ntests)
+            rand1_data, rand2_data = get_monte_carlo_data(
+                modelB_values, modelA_values, total_days,
+                randx[chunk_start:chunk_end,:]
             )
-            rand2_stat_values, rand2_stat_values_array, stat_plot_name = (
-                calculate_stat(logger, rand2_data, stat)
+            scores_rand1 = calculate_monte_carlo_average(
+                logger, average_method, stat, rand1_data,
+                modelB_values.columns
             )
-            rand1_average_array = calculate_average(logger, average_method,
-                                                    stat, rand1_data,
-                                                    rand1_stat_values_array[:,0,:])
-            scores_rand1[ntest-1] = rand1_average_array[0]
-            rand2_average_array = calculate_average(logger, average_method,
-                                                    stat, rand2_data,
-                                                    rand2_stat_values_array[:,0,:])
-            scores_rand2[ntest-1] = rand2_average_array[0]
-            scores_diff[ntest-1] = (
-                rand2_average_array[0] - rand1_average_array[0]
+            scores_rand2 = calculate_monte_carlo_average(
+                logger, average_method, stat, rand2_data,
+                modelB_values.columns
             )
-            ntest+=1
+            scores_diff[chunk_start:chunk_end] = scores_rand2 - scores_rand1
         scores_diff_mean = np.sum(scores_diff)/ntests
         scores_diff_var = np.sum((scores_diff-scores_diff_mean)**2) 
         scores_diff_std = np.sqrt(scores_diff_var/(ntests-1))